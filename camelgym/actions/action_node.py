@@ -1,4 +1,6 @@
+import asyncio
 import json
+import time
 from typing import Any, Optional
 from camelgym.schema import Message
 from camelgym.logs import logger
@@ -22,6 +24,10 @@ class ActionNode:
         self.content: Optional[str] = None
         self.raw_response: Optional[str] = None
 
+        # per-candidate wall-clock latency (seconds) of the last generation
+        self.candidate_latencies: list[float] = []
+        self.generation_latency: float = 0.0
+
     # --------------------------------------------------------------
 
     def set_context(self, context):
@@ -53,18 +59,79 @@ Respond with only the action text.
 
     # --------------------------------------------------------------
 
-    async def generate_candidate(self, prompt: str) -> str:
+    async def generate_candidate(self, prompt: str, stream: bool = True) -> str:
         """
         Query the LLM for a single candidate action.
         """
-        rsp = await self.llm.aask(prompt)
+        rsp = await self.llm.aask(prompt, stream=stream)
         return rsp.strip()
 
+    async def _timed_candidate(self, prompt: str, stream: bool = True, semaphore: asyncio.Semaphore = None):
+        start = time.perf_counter()
+        if semaphore is None:
+            rsp = await self.generate_candidate(prompt, stream=stream)
+        else:
+            async with semaphore:
+                rsp = await self.generate_candidate(prompt, stream=stream)
+        return rsp, time.perf_counter() - start
+
+    async def generate_candidates(
+        self,
+        prompt: str,
+        K: int = 3,
+        concurrent: bool = True,
+        max_concurrency: Optional[int] = None,
+        use_n: bool = False,
+    ) -> list[str]:
+        """
+        Generate K candidate actions.
+
+        - serial: K requests one after another (wall-clock = sum of latencies)
+        - concurrent: K requests in flight together, optionally bounded by max_concurrency
+          (wall-clock = slowest candidate)
+        - use_n: a single request asking the provider for K choices, topped up with
+          concurrent requests if the provider returns fewer
+        """
+        start = time.perf_counter()
+        candidates: list[str] = []
+        latencies: list[float] = []
+
+        if use_n:
+            rsps = await self.llm.aask_n(prompt, n=K)
+            candidates = [rsp.strip() for rsp in rsps[:K]]
+            latencies = [time.perf_counter() - start] * len(candidates)
+
+        missing = K - len(candidates)
+        if missing > 0 and concurrent:
+            # streaming prints token by token, which would interleave between concurrent requests
+            semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+            results = await asyncio.gather(
+                *[self._timed_candidate(prompt, stream=False, semaphore=semaphore) for _ in range(missing)]
+            )
+            candidates.extend(rsp for rsp, _ in results)
+            latencies.extend(latency for _, latency in results)
+        elif missing > 0:
+            for _ in range(missing):
+                rsp, latency = await self._timed_candidate(prompt)
+                candidates.append(rsp)
+                latencies.append(latency)
+
+        self.candidate_latencies = latencies
+        self.generation_latency = time.perf_counter() - start
+        return candidates
+
     # --------------------------------------------------------------
 
-    async def simple_fill(self, memory: str = "", K: int = 3):
+    async def simple_fill(
+        self,
+        memory: str = "",
+        K: int = 3,
+        concurrent: bool = True,
+        max_concurrency: Optional[int] = None,
+        use_n: bool = False,
+    ):
         """
-        1. Generate K actions
+        1. Generate K actions (see `generate_candidates` for the generation modes)
         2. Embed them
         3. Score using RL policy
         4. Select the best
@@ -80,21 +147,30 @@ Respond with only the action text.
         prompt = self.build_prompt(memory)
 
         # === Generate Candidate Actions ===
-        candidates = []
-        for _ in range(K):
-            candidates.append(await self.generate_candidate(prompt))
+        candidates = await self.generate_candidates(
+            prompt, K=K, concurrent=concurrent, max_concurrency=max_concurrency, use_n=use_n
+        )
 
         logger.info(f"[ActionNode] Candidates for {self.key}: {candidates}")
-
-        # === Embed Candidates ===
-        embeds = self.context.embedder.embed(candidates)
-
-        import torch
-        embeds_tensor = torch.tensor(embeds, dtype=torch.float)
-
-        # === Score Candidates Using RL Policy ===
-        scores = self.context.policy(embeds_tensor).squeeze()
-        best_idx = torch.argmax(scores).item()
+        logger.debug(
+            f"[ActionNode] Generation for {self.key} took {self.generation_latency:.2f}s, "
+            f"per candidate: {[round(t, 2) for t in self.candidate_latencies]}"
+        )
+
+        # === Embed + Score Candidates Using RL Policy ===
+        batcher = self.context.scoring_batcher
+        if batcher is not None:
+            # batched with the candidates of every other in-flight ActionNode
+            embeds, scores = await batcher.score(candidates)
+            best_idx = max(range(len(scores)), key=scores.__getitem__)
+        else:
+            embeds = self.context.embedder.embed(candidates)
+
+            import torch
+            embeds_tensor = torch.tensor(embeds, dtype=torch.float)
+
+            scores = self.context.policy(embeds_tensor).squeeze()
+            best_idx = torch.argmax(scores).item()
         best_action = candidates[best_idx]
 
         # === Store RL Trajectory ===
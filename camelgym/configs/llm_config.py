@@ -19,6 +19,7 @@ class LLMType(Enum):
     camelgym = "camelgym"
     AZURE = "azure"
     OLLAMA = "ollama"
+    MOCK = "mock"  # local deterministic answers, for engine benchmarks
 
     def __missing__(self, key):
         return self.OPENAI
@@ -61,9 +62,26 @@ class LLMConfig(YamlModel):
 
     # For Network
     proxy: Optional[str] = None
+    pool_client: bool = True  # share one HTTP client per config, see camelgym.provider.client_pool
+    max_connections: int = 1000
+    max_keepalive_connections: int = 100
+    keepalive_expiry: float = 30.0  # seconds, longer than the usual gap between two turns
 
     # Cost Control
     calc_usage: bool = True
+    # ask streamed calls to report usage (stream_options), e.g. to count cached prompt tokens;
+    # off by default, servers that reject unknown body fields fail every streamed call with it
+    stream_usage: bool = False
+
+    # Response Cache, see camelgym.provider.llm_cache
+    cache_mode: Optional[str] = None  # record / replay / read_through, None to disable
+    cache_path: Optional[str] = None  # sqlite file, defaults to workspace/llm_cache.sqlite
+    cache_max_entries: int = 100_000
+
+    # Mock provider, see camelgym.provider.mock_llm
+    mock_seed: int = 0
+    mock_latency_mean: float = 0.0  # seconds
+    mock_latency_std: float = 0.0  # > 0 for lognormal latencies
 
     @field_validator("api_key")
     @classmethod
@@ -1,8 +1,9 @@
+import asyncio
 import os
 from pathlib import Path
 from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from camelgym.call_config import Config
 from camelgym.configs.llm_config import LLMConfig
@@ -12,11 +13,8 @@ from camelgym.utils.cost_manager import CostManager
 from camelgym.utils.git_repository import GitRepository
 from camelgym.utils.project_repo import ProjectRepo
 
-# RL modules
-from camelgym.rl.embedder import LocalEmbedder
-from camelgym.rl.policy import RLPolicy
-from camelgym.rl.buffer import ExperienceBuffer
-from camelgym.rl.trainer import RLTrainer
+# RL modules, shared through the registry and only imported (torch, sentence_transformers) on first use
+from camelgym.rl.registry import DEFAULT_RL_SESSION, get_rl_session, get_shared_embedder
 
 
 class AttrDict(BaseModel):
@@ -51,42 +49,111 @@ class Context(BaseModel):
 
     _llm: Optional[BaseLLM] = None
 
-    # RL components (initialized safely later)
-    embedder: Optional[LocalEmbedder] = None
-    policy: Optional[RLPolicy] = None
-    buffer: Optional[ExperienceBuffer] = None
-    trainer: Any = Field(default=None, exclude=True)
+    # LLM resources shared between contexts, e.g. by runners playing many games on one event loop
+    # (HTTP clients are shared through camelgym.provider.client_pool)
+    llm_limiter: Optional[asyncio.Semaphore] = Field(default=None, exclude=True)  # global request limit
+
+    # RL components, created lazily: the embedder is shared by the process, the policy / trainer by
+    # every context of the same `rl_session`, the buffer belongs to this context (i.e. one game)
+    rl_session: str = DEFAULT_RL_SESSION
+    _embedder: Any = PrivateAttr(default=None)
+    _policy: Any = PrivateAttr(default=None)
+    _trainer: Any = PrivateAttr(default=None)
+    _buffer: Any = PrivateAttr(default=None)
     action_history: list[str] = []
 
+    # micro-batching of candidate embedding + scoring across concurrent ActionNodes; 0 disables it
+    scoring_batch_size: int = 0
+    scoring_max_wait_ms: float = 2.0
+
+    # lay prompts out for provider-side prefix caching: static instructions first, then the transcript,
+    # then the values of the turn
+    cache_friendly_prompts: bool = False
+
     # -----------------------------------------------------------
     def new_environ(self):
         return os.environ.copy()
 
     # -----------------------------------------------------------
     def llm(self) -> BaseLLM:
-        self._llm = create_llm_instance(self.config.llm)
-        if self._llm.cost_manager is None:
-            self._llm.cost_manager = self.cost_manager
+        """The context's provider, built once per LLM config rather than on every call"""
+        if self._llm is None or getattr(self._llm, "config", None) != self.config.llm:
+            self._llm = create_llm_instance(self.config.llm)
+            if self._llm.cost_manager is None:
+                self._llm.cost_manager = self.cost_manager
+        self._bind_llm_limiter(self._llm)
         return self._llm
 
     def llm_with_cost_manager_from_llm_config(self, llm_config: LLMConfig) -> BaseLLM:
         llm = create_llm_instance(llm_config)
         if llm.cost_manager is None:
             llm.cost_manager = self.cost_manager
+        self._bind_llm_limiter(llm)
         return llm
 
+    def _bind_llm_limiter(self, llm: BaseLLM):
+        """Let the provider use the shared concurrency limit, if any"""
+        if self.llm_limiter is not None:
+            llm.concurrency_limiter = self.llm_limiter
+
     # -----------------------------------------------------------
-    def model_post_init(self, __context=None):
-        """Initialize RL modules after model creation."""
-        try:
-            self.embedder = LocalEmbedder()          # Your real embedder
-            self.policy = RLPolicy()                 # Scoring network
-            self.buffer = ExperienceBuffer()         # Stores (embeds, idx, reward)
-            self.trainer = RLTrainer(self.policy)    # Reinforce trainer
-
-        except Exception as e:
-            print("[WARNING] RL modules not initialized:", e)
-            self.embedder = None
-            self.policy = None
-            self.buffer = None
-            self.trainer = None
+    @property
+    def embedder(self):
+        """Sentence embedder, one per process"""
+        if self._embedder is None:
+            self._embedder = get_shared_embedder()
+        return self._embedder
+
+    @embedder.setter
+    def embedder(self, embedder):
+        self._embedder = embedder
+
+    @property
+    def policy(self):
+        """Scoring network of the context's RL session"""
+        if self._policy is None:
+            self._policy = get_rl_session(self.rl_session).policy
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy):
+        self._policy = policy
+
+    @property
+    def trainer(self):
+        """REINFORCE trainer of the context's RL session"""
+        if self._trainer is None:
+            self._trainer = get_rl_session(self.rl_session).trainer
+        return self._trainer
+
+    @trainer.setter
+    def trainer(self, trainer):
+        self._trainer = trainer
+
+    @property
+    def buffer(self):
+        """This context's (embeds, idx, reward) trajectories"""
+        if self._buffer is None:
+            from camelgym.rl.buffer import ExperienceBuffer
+
+            self._buffer = ExperienceBuffer()
+        return self._buffer
+
+    @buffer.setter
+    def buffer(self, buffer):
+        self._buffer = buffer
+
+    @property
+    def replay_buffer(self):
+        """Replay buffer of the context's RL session across games, None unless configured"""
+        return get_rl_session(self.rl_session).replay_buffer
+
+    @property
+    def scoring_batcher(self):
+        """Batcher shared by every context of the running event loop with the same embedder and policy,
+        None when batching is disabled"""
+        if self.scoring_batch_size <= 0:
+            return None
+        from camelgym.rl.batcher import get_scoring_batcher
+
+        return get_scoring_batcher(self.embedder, self.policy, self.scoring_batch_size, self.scoring_max_wait_ms)
@@ -3,6 +3,7 @@ from typing import Iterable
 
 from pydantic import BaseModel, Field
 
+from camelgym.environment.history_log import HistoryLog
 from camelgym.memory import Memory
 from camelgym.roles import Role
 from camelgym.schema import Message
@@ -16,7 +17,7 @@ class Environment(BaseModel):
 
     roles: dict[str, Role] = Field(default_factory=dict)
     memory: Memory = Field(default_factory=Memory)
-    history: str = Field(default='')
+    history_log: HistoryLog = Field(default_factory=HistoryLog, exclude=True)
 
     class Config:
         arbitrary_types_allowed = True
@@ -41,7 +42,11 @@ class Environment(BaseModel):
         """
         # self.message_queue.put(message)
         self.memory.add(message)
-        self.history += f"\n{message}"
+        self.history_log.append(str(message))
+
+    @property
+    def history(self) -> str:
+        return self.history_log.text()
 
     async def run(self, k=1):
         """
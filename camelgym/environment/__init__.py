@@ -2,8 +2,9 @@
 # -*- coding: utf-8 -*-
 # @Desc   :
 
+from camelgym.environment.history_log import HistoryLog
 from camelgym.environment.base_env import Environment
 from camelgym.environment.werewolf_env.werewolf_env import WerewolfEnv
 
 
-__all__ = ["WerewolfEnv", "Environment"]
+__all__ = ["WerewolfEnv", "Environment", "HistoryLog"]
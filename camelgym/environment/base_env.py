@@ -6,9 +6,11 @@ import asyncio
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set, Union
 
-from pydantic import BaseModel, ConfigDict, Field, SerializeAsAny, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, SerializeAsAny, model_validator
 
+from camelgym.const import MESSAGE_ROUTE_TO_ALL
 from camelgym.context import Context
+from camelgym.environment.history_log import HistoryLog
 from camelgym.environment.api.env_api import (
     EnvAPIAbstract,
     ReadAPIRegistry,
@@ -16,7 +18,7 @@ from camelgym.environment.api.env_api import (
 )
 from camelgym.logs import logger
 from camelgym.schema import Message
-from camelgym.utils.common import get_function_schema, is_coroutine_func, is_send_to
+from camelgym.utils.common import get_function_schema, is_coroutine_func
 
 if TYPE_CHECKING:
     from camelgym.roles.role import Role  # noqa: F401
@@ -105,8 +107,14 @@ class Environment(ExtEnv):
     desc: str = Field(default="")  # 环境描述
     roles: dict[str, SerializeAsAny["Role"]] = Field(default_factory=dict, validate_default=True)
     member_addrs: Dict["Role", Set] = Field(default_factory=dict, exclude=True)
-    history: str = ""  # For debug
+    history_log: HistoryLog = Field(default_factory=HistoryLog, exclude=True)  # For debug
     context: Context = Field(default_factory=Context, exclude=True)
+    # roles that received a message since they were last stepped, for event-driven schedulers
+    _woken: set = PrivateAttr(default_factory=set)
+    # reverse of member_addrs: address -> roles subscribed to it (a dict used as an ordered set),
+    # and the addresses each role was indexed under, both kept in step by set_addresses
+    _subscribers: dict = PrivateAttr(default_factory=dict)
+    _indexed_addrs: dict = PrivateAttr(default_factory=dict)
 
     @model_validator(mode="after")
     def init_roles(self):
@@ -134,15 +142,20 @@ class Environment(ExtEnv):
 
     def publish_message(self, message: Message, peekable: bool = True) -> bool:
         logger.debug(f"publish_message: {message.dump()}")
-        found = False
-        # According to the routing feature plan in Chapter 2.2.3.2 of RFC 113
-        for role, addrs in self.member_addrs.items():
-            if is_send_to(message, addrs):
-                role.put_message(message)
-                found = True
-        if not found:
+        # According to the routing feature plan in Chapter 2.2.3.2 of RFC 113, by address lookup
+        if MESSAGE_ROUTE_TO_ALL in message.send_to:
+            recipients = self.member_addrs.keys()
+        else:
+            subscribers = self._subscribers
+            recipients = {}
+            for addr in message.send_to:
+                recipients.update(subscribers.get(addr, {}))
+        for role in recipients:
+            role.put_message(message)
+        self._woken.update(recipients)
+        if not recipients:
             logger.warning(f"Message no recipients: {message.dump()}")
-        self.history += f"\n{message}"  # For debug
+        self.history_log.append(str(message))  # For debug
 
         return True
 
@@ -156,6 +169,11 @@ class Environment(ExtEnv):
         await asyncio.gather(*futures)
 
 
+    @property
+    def history(self) -> str:
+        """Published messages, one per line (the tail kept by history_log if it is bounded)"""
+        return self.history_log.text()
+
     def get_roles(self) -> dict[str, "Role"]:
         """
         Process all Role runs at once
@@ -171,6 +189,11 @@ class Environment(ExtEnv):
     def role_names(self) -> list[str]:
         return [i.name for i in self.roles.values()]
 
+    @property
+    def is_terminal(self) -> bool:
+        """If true, the episode is over and running the env further does nothing useful"""
+        return False
+
     @property
     def is_idle(self):
         """If true, all actions have been executed."""
@@ -186,8 +209,17 @@ class Environment(ExtEnv):
     def set_addresses(self, obj, addresses):
         """Set the addresses of the object"""
         self.member_addrs[obj] = addresses
+        for addr in self._indexed_addrs.pop(obj, ()):
+            subscribers = self._subscribers[addr]
+            subscribers.pop(obj, None)
+            if not subscribers:
+                del self._subscribers[addr]
+        self._indexed_addrs[obj] = frozenset(addresses)
+        for addr in self._indexed_addrs[obj]:
+            self._subscribers.setdefault(addr, {})[obj] = None
 
     def archive(self, auto_archive=True):
+        self.history_log.flush()
         if auto_archive and self.context.git_repo:
             self.context.git_repo.archive()
 
@@ -0,0 +1,68 @@
+from collections import deque
+from pathlib import Path
+from typing import Union
+
+
+class HistoryLog:
+    """
+    Append-only text log of the messages published in an environment, replacing `history += f"\n{message}"`
+    (which copies the whole history on every message).
+
+    Entries are collected in chunks of `chunk_size` joined lines. With `max_lines`, only the most recent
+    lines are kept in RAM (at least max_lines, fewer than max_lines + 2 * chunk_size), older chunks are
+    dropped; with `sink`, every line is also streamed to that file, which then holds the full history.
+    `text()` joins what is kept, on demand.
+    """
+
+    def __init__(self, max_lines: int = 0, sink: Union[str, Path, None] = None, chunk_size: int = 256):
+        self.max_lines = max_lines
+        self.chunk_size = chunk_size
+        self.sink = Path(sink) if sink else None
+        self._chunks: deque[tuple[int, str]] = deque()  # (lines, text)
+        self._pending: list[str] = []
+        self._kept_lines = 0
+        self._file = None
+
+        self.lines = 0
+        self.dropped_lines = 0
+
+    def append(self, entry: str):
+        line = f"\n{entry}"
+        self._pending.append(line)
+        self._kept_lines += 1
+        self.lines += 1
+        if self.sink is not None:
+            if self._file is None:
+                self.sink.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.sink, "a", encoding="utf-8")
+            self._file.write(line)
+
+        if len(self._pending) >= self.chunk_size:
+            self._chunks.append((len(self._pending), "".join(self._pending)))
+            self._pending = []
+            self._trim()
+
+    def _trim(self):
+        while self.max_lines and self._chunks and self._kept_lines - self._chunks[0][0] >= self.max_lines:
+            lines, _ = self._chunks.popleft()
+            self._kept_lines -= lines
+            self.dropped_lines += lines
+
+    def text(self) -> str:
+        """The lines kept in RAM, as one string (all of them unless max_lines is set)"""
+        return "".join(text for _, text in self._chunks) + "".join(self._pending)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __str__(self) -> str:
+        return self.text()
+
+    def __len__(self) -> int:
+        return self.lines
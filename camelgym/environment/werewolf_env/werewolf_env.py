@@ -2,15 +2,20 @@
 # -*- coding: utf-8 -*-
 # @Desc   : MG Werewolf Env
 
-from typing import List, Optional
+import asyncio
+import heapq
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from camelgym.environment.base_env import Environment
 from camelgym.environment.werewolf_env.werewolf_ext_env import WerewolfExtEnv
 from camelgym.logs import logger
 from camelgym.schema import Message
 
+if TYPE_CHECKING:
+    from camelgym.roles.role import Role  # noqa: F401
+
 
 class WerewolfEnv(Environment, WerewolfExtEnv):
     # timestamp used to prefix messages so that identical content is not deduplicated
@@ -21,6 +26,48 @@ class WerewolfEnv(Environment, WerewolfExtEnv):
 
     # winner can be set by Moderator when the game finishes
     winner: Optional[str] = Field(default=None)
+    # the Moderator's announcement of the result, the last message of a game
+    game_result: Optional[str] = Field(default=None)
+
+    # day index -> summary of that night and day, written once by the Moderator when the day ends
+    day_summaries: Dict[int, str] = Field(default_factory=dict)
+
+    # step only the roles that received messages since their last step (and the `always_ready` ones,
+    # i.e. the Moderator), instead of every role on every tick
+    event_driven: bool = Field(default=False)
+    # with event_driven: run consecutive woken players at once; they then do not see each other's
+    # messages of the same step (e.g. the speeches before theirs in a day discussion)
+    concurrent_roles: bool = Field(default=False)
+
+    # role -> position in the roster, the order in which a tick steps roles
+    _positions: dict = PrivateAttr(default_factory=dict)
+    # the roles due on every tick of the event-driven scheduler
+    _always_ready: set = PrivateAttr(default_factory=set)
+    role_steps: int = Field(default=0, exclude=True)
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.game_result is not None
+
+    @property
+    def is_idle(self) -> bool:
+        """Roles that drive the game (always_ready) step without messages, so the env is never idle with one"""
+        return not self._always_ready and super().is_idle
+
+    def add_role(self, role: "Role"):
+        self.add_roles([role])
+
+    def add_roles(self, roles: Iterable["Role"]):
+        """Players share profiles (several Villagers, Werewolves), so roles are keyed by `name(profile)`"""
+        roles = list(roles)
+        for role in roles:
+            self.roles[role._setting] = role
+        self._positions = {role: i for i, role in enumerate(self.roles.values())}
+        self._always_ready = {role for role in self._positions if getattr(role, "always_ready", False)}
+
+        for role in roles:
+            role.set_env(self)
+            role.context = self.context
 
     def pub_mes(self, message: Message, add_timestamp: bool = True):
         """Post information to the environment and also record it for analysis."""
@@ -39,6 +86,44 @@ class WerewolfEnv(Environment, WerewolfExtEnv):
     async def run(self, k: int = 1):
         """Process all roles' runs in order, for k ticks."""
         for _ in range(k):
-            for role in self.roles.values():
-                await role.run()
+            if self.event_driven:
+                await self._run_woken()
+            else:
+                for role in self.roles.values():
+                    await role.run()
+                self.role_steps += len(self.roles)
             self.timestamp += 1
+
+    async def _run_woken(self):
+        """
+        One tick over the woken roles, in roster order. As in a sequential tick, a role woken by a role
+        before it in the roster runs in the same tick, one woken by a role after it in the next tick.
+        The cost of a tick grows with the roles woken, not with the roles in the game.
+        """
+        positions = self._positions
+        due = self._woken | self._always_ready
+        self._woken = set()
+        queue = [(positions[role], role) for role in due if role in positions]
+        heapq.heapify(queue)
+
+        while queue:
+            position, role = heapq.heappop(queue)
+            batch = [role]
+            if self.concurrent_roles and not getattr(role, "always_ready", False):
+                # the woken players run together, roles that drive the game (always_ready) run alone
+                while queue and not getattr(queue[0][1], "always_ready", False):
+                    position, role = heapq.heappop(queue)
+                    batch.append(role)
+
+            if len(batch) == 1:
+                await batch[0].run()
+            else:
+                await asyncio.gather(*[role.run() for role in batch])
+            self.role_steps += len(batch)
+
+            # woken by this batch: roles later in the roster still run in this tick
+            woken_later = {role for role in self._woken if positions.get(role, -1) > position}
+            queued = {role for _, role in queue}
+            for role in woken_later - queued:
+                heapq.heappush(queue, (positions[role], role))
+            self._woken -= woken_later
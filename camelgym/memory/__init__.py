@@ -3,9 +3,11 @@
 from camelgym.memory.memory import Memory
 
 from camelgym.memory.longterm_memory import LongTermMemory
+from camelgym.memory.transcript import IncrementalTranscript
 
 
 __all__ = [
     "Memory",
     "LongTermMemory",
+    "IncrementalTranscript",
 ]
@@ -3,7 +3,7 @@ from typing import DefaultDict, Iterable, Set
 
 from camel.memories import BaseMemory
 
-from pydantic import BaseModel, Field, SerializeAsAny
+from pydantic import BaseModel, Field, PrivateAttr, SerializeAsAny
 
 from camelgym.const import IGNORED_MESSAGE_ID
 from camelgym.schema import Message
@@ -16,6 +16,26 @@ class Memory(BaseModel, BaseMemory):
     storage: list[SerializeAsAny[Message]] = []
     index: DefaultDict[str, list[SerializeAsAny[Message]]] = Field(default_factory=lambda: defaultdict(list))
     ignore_id: bool = False
+    # keys of the stored messages (see `key_of`), so that de-duplication does not scan the storage
+    _keys: Set[str] = PrivateAttr(default_factory=set)
+    # bumped whenever messages are removed, lets append-only views (IncrementalTranscript) notice it
+    _deletions: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context):
+        self._keys = {self.key_of(message) for message in self.storage}
+
+    def key_of(self, message: Message) -> str:
+        """The message id, or a hash of its content when ids are ignored"""
+        if self.ignore_id:
+            return message.content_key()
+        return message.id
+
+    def contains(self, message: Message) -> bool:
+        return self.key_of(message) in self._keys
+
+    @property
+    def deletions(self) -> int:
+        return self._deletions
 
     def get_context(self):
         pass
@@ -27,8 +47,10 @@ class Memory(BaseModel, BaseMemory):
         """Add a new message to storage, while updating the index"""
         if self.ignore_id:
             message.id = IGNORED_MESSAGE_ID
-        if message in self.storage:
+        key = self.key_of(message)
+        if key in self._keys:
             return
+        self._keys.add(key)
         self.storage.append(message)
         if message.cause_by:
             self.index[message.cause_by].append(message)
@@ -49,6 +71,8 @@ class Memory(BaseModel, BaseMemory):
         """delete the newest message from the storage"""
         if len(self.storage) > 0:
             newest_msg = self.storage.pop()
+            self._keys.discard(self.key_of(newest_msg))
+            self._deletions += 1
             if newest_msg.cause_by and newest_msg in self.index[newest_msg.cause_by]:
                 self.index[newest_msg.cause_by].remove(newest_msg)
         else:
@@ -60,6 +84,8 @@ class Memory(BaseModel, BaseMemory):
         if self.ignore_id:
             message.id = IGNORED_MESSAGE_ID
         self.storage.remove(message)
+        self._keys.discard(self.key_of(message))
+        self._deletions += 1
         if message.cause_by and message in self.index[message.cause_by]:
             self.index[message.cause_by].remove(message)
 
@@ -67,6 +93,8 @@ class Memory(BaseModel, BaseMemory):
         """Clear storage and index"""
         self.storage = []
         self.index = defaultdict(list)
+        self._keys = set()
+        self._deletions += 1
 
     def count(self) -> int:
         """Return the number of messages in storage"""
@@ -82,13 +110,11 @@ class Memory(BaseModel, BaseMemory):
 
     def find_news(self, observed: list[Message], k=0) -> list[Message]:
         """find news (previously unseen messages) from the the most recent k memories, from all memories when k=0"""
-        already_observed = self.get(k)
-        news: list[Message] = []
-        for i in observed:
-            if i in already_observed:
-                continue
-            news.append(i)
-        return news
+        if k:
+            already_observed = {self.key_of(message) for message in self.get(k)}
+        else:
+            already_observed = self._keys
+        return [i for i in observed if self.key_of(i) not in already_observed]
 
     def get_by_action(self, action) -> list[Message]:
         """Return all messages triggered by a specified Action"""
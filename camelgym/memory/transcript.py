@@ -0,0 +1,47 @@
+from typing import Callable
+
+from camelgym.memory.memory import Memory
+from camelgym.schema import Message
+
+
+class IncrementalTranscript:
+    """
+    Append-only text rendering of a Memory: every message is rendered once, when it is first seen,
+    and the joined transcript is kept between calls. Deleting messages from the memory, or syncing
+    with another Memory object, invalidates it: the next `sync` renders the memory again from scratch.
+    """
+
+    def __init__(self, render: Callable[[Message], str], separator: str = "\n"):
+        self.render = render
+        self.separator = separator
+        self.lines: list[str] = []
+        self._text = ""
+        self._deletions = 0
+        self._memory_id = None
+
+    def sync(self, memory: Memory) -> "IncrementalTranscript":
+        """Render the messages added to memory since the last sync"""
+        if (
+            id(memory) != self._memory_id
+            or memory.deletions != self._deletions
+            or memory.count() < len(self.lines)
+        ):
+            self.lines, self._text = [], ""
+            self._memory_id, self._deletions = id(memory), memory.deletions
+
+        new_lines = [self.render(message) for message in memory.storage[len(self.lines) :]]
+        if new_lines:
+            added = self.separator.join(new_lines)
+            self._text = f"{self._text}{self.separator}{added}" if self.lines else added
+            self.lines.extend(new_lines)
+        return self
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def tail(self, max_lines: int = 50, max_chars: int = 0) -> str:
+        """The last max_lines lines, cut to the last max_chars characters if given"""
+        lines = self.lines[-max_lines:] if max_lines else self.lines
+        text = self.separator.join(lines)
+        return text[-max_chars:] if max_chars else text
@@ -4,8 +4,10 @@
 
 from camelgym.provider.openai_api import OpenAILLM
 from camelgym.provider.human_provider import HumanProvider
+from camelgym.provider.mock_llm import MockLLM
 
 __all__ = [
     "OpenAILLM",
     "HumanProvider",
+    "MockLLM",
 ]
@@ -1,8 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import asyncio
 import json
 from abc import ABC, abstractmethod
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from openai import AsyncOpenAI
 
@@ -11,6 +12,9 @@ from camelgym.logs import logger
 from camelgym.schema import Message
 from camelgym.utils.cost_manager import CostManager
 
+if TYPE_CHECKING:
+    from camelgym.provider.llm_cache import LLMResponseCache
+
 
 class BaseLLM(ABC):
     """LLM API abstract class, requiring all inheritors to provide a series of standard capabilities"""
@@ -23,6 +27,10 @@ class BaseLLM(ABC):
     aclient: Optional[Union[AsyncOpenAI]] = None
     cost_manager: Optional[CostManager] = None
     model: Optional[str] = None
+    # optional limit on in-flight requests, can be shared by many providers
+    concurrency_limiter: Optional[asyncio.Semaphore] = None
+    # optional persistent record / replay cache, attached by create_llm_instance
+    response_cache: Optional["LLMResponseCache"] = None
 
     @abstractmethod
     def __init__(self, config: LLMConfig):
@@ -70,6 +78,70 @@ class BaseLLM(ABC):
         timeout=3,
         stream=True,
     ) -> str:
+        message = self._compose_messages(msg, system_msgs, format_msgs, images)
+        logger.debug(message)
+        if self.response_cache is None:
+            return await self._acompletion_text_limited(message, stream=stream, timeout=timeout)
+        return await self.response_cache.fetch(
+            self.model,
+            message,
+            self._sampling_params(message),
+            lambda: self._acompletion_text_limited(message, stream=stream, timeout=timeout),
+        )
+
+    async def aask_n(
+        self,
+        msg: str,
+        n: int,
+        system_msgs: Optional[list[str]] = None,
+        format_msgs: Optional[list[dict[str, str]]] = None,
+        timeout=3,
+    ) -> list[str]:
+        """Ask the same question for n independent answers"""
+        message = self._compose_messages(msg, system_msgs, format_msgs)
+        logger.debug(message)
+        if self.response_cache is None:
+            return await self._acompletion_texts_limited(message, n=n, timeout=timeout)
+
+        async def call() -> str:
+            return json.dumps(await self._acompletion_texts_limited(message, n=n, timeout=timeout))
+
+        params = {**self._sampling_params(message), "n": n}
+        return json.loads(await self.response_cache.fetch(self.model, message, params, call))
+
+    async def _acompletion_text_limited(self, messages: list[dict], stream=False, timeout=3) -> str:
+        if self.concurrency_limiter is None:
+            return await self.acompletion_text(messages, stream=stream, timeout=timeout)
+        async with self.concurrency_limiter:
+            return await self.acompletion_text(messages, stream=stream, timeout=timeout)
+
+    async def _acompletion_texts_limited(self, messages: list[dict], n: int, timeout=3) -> list[str]:
+        if self.concurrency_limiter is None:
+            return await self.acompletion_texts(messages, n=n, timeout=timeout)
+        async with self.concurrency_limiter:
+            return await self.acompletion_texts(messages, n=n, timeout=timeout)
+
+    def _sampling_params(self, messages: list[dict]) -> dict:
+        """Request parameters other than model and messages that shape the answer, part of the cache key"""
+        config = getattr(self, "config", None)
+        if config is None:
+            return {}
+        return {
+            "max_token": config.max_token,
+            "temperature": config.temperature,
+            "top_p": config.top_p,
+            "stop": config.stop,
+            "presence_penalty": config.presence_penalty,
+            "frequency_penalty": config.frequency_penalty,
+        }
+
+    def _compose_messages(
+        self,
+        msg: str,
+        system_msgs: Optional[list[str]] = None,
+        format_msgs: Optional[list[dict[str, str]]] = None,
+        images: Optional[Union[str, list[str]]] = None,
+    ) -> list[dict]:
         if system_msgs:
             message = self._system_msgs(system_msgs)
         else:
@@ -79,9 +151,7 @@ class BaseLLM(ABC):
         if format_msgs:
             message.extend(format_msgs)
         message.append(self._user_msg(msg, images=images))
-        logger.debug(message)
-        rsp = await self.acompletion_text(message, stream=stream, timeout=timeout)
-        return rsp
+        return message
 
     def _extract_assistant_rsp(self, context):
         return "\n".join([i["content"] for i in context if i["role"] == "assistant"])
@@ -115,6 +185,14 @@ class BaseLLM(ABC):
     async def acompletion_text(self, messages: list[dict], stream=False, timeout=3) -> str:
         """Asynchronous version of completion. Return str. Support stream-print"""
 
+    async def acompletion_texts(self, messages: list[dict], n: int, timeout=3) -> list[str]:
+        """Return n completions of the same messages. Providers able to sample several choices in one request
+        (e.g. OpenAI `n`) should override this; the default sends n concurrent requests."""
+        rsps = await asyncio.gather(
+            *[self.acompletion_text(messages, stream=False, timeout=timeout) for _ in range(n)]
+        )
+        return list(rsps)
+
     def get_choice_text(self, rsp: dict) -> str:
         """Required to provide the first text of choice"""
         return rsp.get("choices")[0]["message"]["content"]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : process-wide pool of AsyncOpenAI clients, so that providers share HTTP connections
+
+import asyncio
+import hashlib
+import weakref
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from camelgym.configs.llm_config import LLMConfig
+
+# fields that change how a client connects; sampling parameters do not matter here
+CLIENT_CONFIG_FIELDS = (
+    "api_type",
+    "api_key",
+    "base_url",
+    "api_version",
+    "proxy",
+    "max_connections",
+    "max_keepalive_connections",
+    "keepalive_expiry",
+)
+
+
+class ConnectionStats:
+    """Counts requests against new TCP connections / TLS handshakes, via httpcore's trace extension"""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+
+    async def on_request(self, request: httpx.Request):
+        self.requests += 1
+        request.extensions["trace"] = self.trace
+
+    async def trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            self.new_connections += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "tls_handshakes": self.tls_handshakes,
+            "connection_reuse_rate": 1 - self.new_connections / self.requests if self.requests else 0.0,
+        }
+
+
+class LLMClientPool:
+    """
+    AsyncOpenAI clients keyed by the connection part of an LLMConfig, one set per event loop.
+
+    An httpx connection pool is bound to the event loop it first ran on, so clients are never shared
+    between loops (e.g. the successive `asyncio.run` calls of a tournament worker); within a loop every
+    provider built from an equivalent config, for any role, action or game, reuses the same client.
+    A client requested with no running loop binds to whichever loop uses it first, so it is never shared.
+    """
+
+    def __init__(self):
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+        self.stats = ConnectionStats()
+        self.clients_created = 0
+        self.clients_reused = 0
+
+    @staticmethod
+    def config_key(config: LLMConfig) -> str:
+        payload = "|".join(f"{field}={getattr(config, field, None)}" for field in CLIENT_CONFIG_FIELDS)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _clients_of_current_loop(self) -> Optional[dict]:
+        """The clients of the running loop, None outside of one"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        clients = self._clients.get(loop)
+        if clients is None:
+            clients = self._clients[loop] = {}
+        return clients
+
+    def get_client(self, config: LLMConfig, **client_kwargs) -> AsyncOpenAI:
+        """Shared client for this config; client_kwargs (api_key, base_url, ...) are only used to build it"""
+        clients = self._clients_of_current_loop()
+        key = self.config_key(config)
+        client = clients.get(key) if clients is not None else None
+        if client is not None:
+            self.clients_reused += 1
+            return client
+
+        client = AsyncOpenAI(http_client=self._make_http_client(config), **client_kwargs)
+        if clients is not None:
+            clients[key] = client
+        self.clients_created += 1
+        return client
+
+    def _make_http_client(self, config: LLMConfig) -> httpx.AsyncClient:
+        # openai's default timeout and redirects, with our pool limits and connection stats
+        kwargs = dict(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            event_hooks={"request": [self.stats.on_request]},
+        )
+        if config.proxy:
+            kwargs["proxy"] = config.proxy
+        return DefaultAsyncHttpxClient(**kwargs)
+
+    def metrics(self) -> dict:
+        return {
+            "clients_created": self.clients_created,
+            "clients_reused": self.clients_reused,
+            **self.stats.as_dict(),
+        }
+
+    def clear(self):
+        self._clients = weakref.WeakKeyDictionary()
+
+
+_CLIENT_POOL: Optional[LLMClientPool] = None
+
+
+def get_client_pool() -> LLMClientPool:
+    global _CLIENT_POOL
+    if _CLIENT_POOL is None:
+        _CLIENT_POOL = LLMClientPool()
+    return _CLIENT_POOL
@@ -28,6 +28,7 @@ class HumanProvider(BaseLLM):
         format_msgs: Optional[list[dict[str, str]]] = None,
         generator: bool = False,
         timeout=3,
+        stream=True,
     ) -> str:
         return self.ask(msg, timeout=timeout)
 
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : persistent record / replay cache of LLM responses
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import defaultdict
+from enum import Enum
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Union
+
+from camelgym.const import DEFAULT_WORKSPACE_ROOT
+from camelgym.logs import logger
+
+DEFAULT_LLM_CACHE_PATH = DEFAULT_WORKSPACE_ROOT / "llm_cache.sqlite"
+
+
+class LLMCacheMode(str, Enum):
+    RECORD = "record"  # always call the provider, store every response
+    REPLAY = "replay"  # never call the provider, a miss is an error
+    READ_THROUGH = "read_through"  # serve hits, call the provider and store on a miss
+
+
+class LLMCacheMissError(Exception):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed LLM response cache keyed by a hash of model, messages and sampling parameters.
+
+    Sampling is not deterministic, so the same request can legitimately be made several times in a
+    run (e.g. the K candidates of an ActionNode). Each repetition gets its own slot: the n-th
+    identical request of a run maps to the n-th recorded response, which makes replays faithful.
+
+    Entries beyond `max_entries` are evicted least-recently-used first.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_LLM_CACHE_PATH,
+        mode: Union[str, LLMCacheMode] = LLMCacheMode.READ_THROUGH,
+        max_entries: int = 100_000,
+    ):
+        self.path = Path(path)
+        self.mode = LLMCacheMode(mode)
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._occurrences: dict[str, int] = defaultdict(int)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                model TEXT,
+                response TEXT NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (key, slot)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(model: Optional[str], messages: list[dict], params: dict) -> str:
+        payload = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, slot: int = 0) -> Optional[str]:
+        row = self._conn.execute("SELECT response FROM responses WHERE key = ? AND slot = ?", (key, slot)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ? AND slot = ?", (time.time(), key, slot))
+        self._conn.commit()
+        return row[0]
+
+    def put(self, key: str, slot: int, response: str, model: Optional[str] = None):
+        now = time.time()
+        cur = self._conn.execute(
+            "UPDATE responses SET model = ?, response = ?, last_access = ? WHERE key = ? AND slot = ?",
+            (model, response, now, key, slot),
+        )
+        if cur.rowcount == 0:
+            self._conn.execute(
+                "INSERT INTO responses (key, slot, model, response, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, slot, model, response, now),
+            )
+            self._size += 1
+            self._evict()
+        self._conn.commit()
+
+    def _evict(self):
+        overflow = self._size - self.max_entries
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses ORDER BY last_access LIMIT ?)",
+            (overflow,),
+        )
+        self._size -= overflow
+        self.evictions += overflow
+
+    async def fetch(
+        self, model: Optional[str], messages: list[dict], params: dict, call: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Serve a request according to the cache mode, calling the provider through `call` when needed."""
+        key = self.make_key(model, messages, params)
+        # assign the slot before awaiting so concurrent identical requests keep a stable order
+        slot = self._occurrences[key]
+        self._occurrences[key] += 1
+
+        if self.mode != LLMCacheMode.RECORD:
+            cached = self.get(key, slot)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            if self.mode == LLMCacheMode.REPLAY:
+                raise LLMCacheMissError(f"No recorded response for request {key[:12]} (slot {slot}) in {self.path}")
+
+        rsp = await call()
+        self.put(key, slot, rsp, model=model)
+        return rsp
+
+    def reset_occurrences(self):
+        """Start a new run: the next identical requests map to the first slots again."""
+        self._occurrences.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode.value,
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        self._conn.close()
+
+
+# one cache object per file, shared by every provider pointing at it
+_CACHES: dict[Path, LLMResponseCache] = {}
+_DEFAULT_CACHE: Optional[LLMResponseCache] = None
+
+
+def get_response_cache(
+    path: Union[str, Path, None] = None, mode: Union[str, LLMCacheMode] = LLMCacheMode.READ_THROUGH, max_entries=100_000
+) -> LLMResponseCache:
+    path = Path(path or DEFAULT_LLM_CACHE_PATH).resolve()
+    cache = _CACHES.get(path)
+    if cache is None:
+        cache = _CACHES[path] = LLMResponseCache(path, mode=mode, max_entries=max_entries)
+    else:
+        cache.mode = LLMCacheMode(mode)
+        cache.max_entries = max_entries
+    return cache
+
+
+def configure_response_cache(
+    mode: Union[str, LLMCacheMode, None], path: Union[str, Path, None] = None, max_entries=100_000
+) -> Optional[LLMResponseCache]:
+    """Set the process-wide cache used by providers whose config does not set `cache_mode`. None disables it."""
+    global _DEFAULT_CACHE
+    _DEFAULT_CACHE = get_response_cache(path, mode, max_entries) if mode else None
+    if _DEFAULT_CACHE:
+        logger.info(f"LLM response cache: {_DEFAULT_CACHE.mode.value} mode, {_DEFAULT_CACHE.path}")
+    return _DEFAULT_CACHE
+
+
+def get_default_response_cache() -> Optional[LLMResponseCache]:
+    return _DEFAULT_CACHE
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 from camelgym.configs.llm_config import LLMConfig, LLMType
 from camelgym.provider.base_llm import BaseLLM
+from camelgym.provider.llm_cache import get_default_response_cache, get_response_cache
 
 
 class LLMProviderRegistry:
@@ -28,7 +29,12 @@ def register_provider(key):
 
 def create_llm_instance(config: LLMConfig) -> BaseLLM:
     """get the default llm provider"""
-    return LLM_REGISTRY.get_provider(config.api_type)(config)
+    llm = LLM_REGISTRY.get_provider(config.api_type)(config)
+    if config.cache_mode:
+        llm.response_cache = get_response_cache(config.cache_path, config.cache_mode, config.cache_max_entries)
+    else:
+        llm.response_cache = get_default_response_cache()
+    return llm
 
 
 # Registry instance
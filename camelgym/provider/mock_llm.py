@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : deterministic local provider answering the werewolf prompts, no network involved
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from collections import defaultdict
+
+from camelgym.configs.llm_config import LLMConfig, LLMType
+from camelgym.provider.base_llm import BaseLLM
+from camelgym.provider.llm_provider_registry import register_provider
+
+PLAYER_PATTERN = re.compile(r"Player[0-9]+")
+PLAYER_LIST_PATTERN = re.compile(r"\[([^\[\]]*Player[0-9]+[^\[\]]*)\]")
+
+
+@register_provider(LLMType.MOCK)
+class MockLLM(BaseLLM):
+    """
+    Stand-in for a remote model when profiling the game engine.
+
+    Answers are well-formed for the werewolf prompt formats (Reflect, Speak, NighttimeWhispers and
+    the ActionNode candidate prompt) and always end with a player picked from the latest list of
+    living players found in the prompt, which is what the Moderator parses. Answers depend only on
+    `mock_seed`, the prompt and how many times that prompt was asked, so a run does not depend on
+    how concurrent requests happen to be scheduled.
+
+    Latency is `mock_latency_mean` seconds, lognormally distributed when `mock_latency_std` > 0.
+
+    config.yaml:
+        llm:
+          api_type: "mock"
+          api_key: "mock"
+          mock_seed: 0
+          mock_latency_mean: 0.5
+          mock_latency_std: 0.2
+    """
+
+    def __init__(self, config: LLMConfig):
+        self.config = config
+        self.model = config.model or "mock"
+        self.seed = config.mock_seed
+        self.latency_mean = config.mock_latency_mean
+        self.latency_std = config.mock_latency_std
+        self.cost_manager = None
+
+        self._latency_rng = random.Random(self.seed)
+        self._occurrences: dict[str, int] = defaultdict(int)
+        self.n_calls = 0
+
+    # --------------------------------------------------------------
+
+    def _rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        occurrence = self._occurrences[digest]
+        self._occurrences[digest] += 1
+        return random.Random(f"{self.seed}:{digest}:{occurrence}")
+
+    def _latency(self) -> float:
+        if self.latency_mean <= 0:
+            return 0.0
+        if self.latency_std <= 0:
+            return self.latency_mean
+        # lognormal with the configured mean and standard deviation
+        sigma2 = math.log(1 + (self.latency_std / self.latency_mean) ** 2)
+        mu = math.log(self.latency_mean) - sigma2 / 2
+        return self._latency_rng.lognormvariate(mu, math.sqrt(sigma2))
+
+    @staticmethod
+    def living_players(prompt: str) -> list[str]:
+        """Players of the last list in the prompt, i.e. the living options of the latest instruction"""
+        lists = PLAYER_LIST_PATTERN.findall(prompt)
+        if lists:
+            return PLAYER_PATTERN.findall(lists[-1])
+        return sorted(set(PLAYER_PATTERN.findall(prompt)), key=lambda p: int(p[len("Player") :]))
+
+    @staticmethod
+    def _latest_instruction_kind(prompt: str) -> str:
+        """Kind of the moderator instruction that appears last in the prompt"""
+        markers = {
+            "protect": "For example: Protect",
+            "kill": "For example: Kill",
+            "save": 'If so, say "Save"',
+            "poison": '"Poison PlayerX"',
+            "verify": "verify its identity",
+            "vote": "I vote to eliminate",
+            "speak": "freely talk about the current situation",
+        }
+        positions = {kind: prompt.rfind(marker) for kind, marker in markers.items()}
+        kind, pos = max(positions.items(), key=lambda item: item[1])
+        return kind if pos >= 0 else "speak"
+
+    # --------------------------------------------------------------
+
+    def _action_text(self, kind: str, players: list[str], rng: random.Random) -> str:
+        target = rng.choice(players) if players else "Player1"
+        if kind == "save":
+            return rng.choice(["Save", "Pass"])
+        if kind == "poison":
+            return f"Poison {target}" if rng.random() < 0.3 else "Pass"
+        if kind == "vote":
+            return f"I vote to eliminate {target}"
+        if kind == "speak":
+            return f"I have no hard evidence yet, but I find the behaviour of {target} suspicious. I suspect {target}"
+        return f"{kind.capitalize()} {target}"
+
+    def _reflect(self, players: list[str], rng: random.Random) -> str:
+        game_states = [
+            {
+                "TARGET": player,
+                "STATUS": "living",
+                "CLAIMED_ROLE": "None",
+                "SIDE_WITH": "None",
+                "ACCUSE": rng.choice(players),
+            }
+            for player in players
+        ]
+        reflection = {player: rng.choice(["werewolf", "special role", "villager"]) for player in players}
+        reflection["GAME_STATE_SUMMARIZATION"] = f"{len(players)} players are alive, no role has been confirmed."
+        return json.dumps({"GAME_STATES": game_states, "REFLECTION": reflection})
+
+    def _json_answer(self, rsp: str, players: list[str]) -> str:
+        return json.dumps(
+            {
+                "LIVING_PLAYERS": players,
+                "THOUGHTS": "My step-by-step thought process: I picked the option that fits my role best.",
+                "RESPONSE": rsp,
+            }
+        )
+
+    def answer(self, prompt: str, system: str = "") -> str:
+        """system: the system messages, which hold the output format in the cache-friendly prompt layout"""
+        rng = self._rng(prompt)
+        players = self.living_players(prompt)
+        full_prompt = f"{system}\n{prompt}" if system else prompt
+
+        if '"GAME_STATES"' in full_prompt:  # Reflect
+            return self._reflect(players, rng)
+
+        if "Return SAVE or PASS" in full_prompt:  # Save, the one NighttimeWhispers without an ACTION
+            return self._json_answer(rng.choice(["SAVE", "PASS"]), players)
+        if '"ACTION": "Choose one living player to' in full_prompt:  # other NighttimeWhispers
+            return self._json_answer(rng.choice(players) if players else "PASS", players)
+
+        kind = self._latest_instruction_kind(prompt)
+        rsp = self._action_text(kind, players, rng)
+        if '"MODERATOR_INSTRUCTION"' in full_prompt:  # Speak
+            return self._json_answer(rsp, players)
+        # ActionNode candidate and anything else: plain action text
+        return rsp
+
+    # --------------------------------------------------------------
+
+    async def acompletion(self, messages: list[dict], timeout=3) -> dict:
+        rsp = await self.acompletion_text(messages, timeout=timeout)
+        return {"choices": [{"index": 0, "message": {"role": "assistant", "content": rsp}, "finish_reason": "stop"}]}
+
+    async def acompletion_text(self, messages: list[dict], stream=False, timeout=3) -> str:
+        prompt = self._prompt_of(messages)
+        self.n_calls += 1
+        # draw the answer before sleeping so it does not depend on which concurrent request wakes up first
+        rsp = self.answer(prompt, self._system_of(messages))
+        latency = self._latency()
+        if latency:
+            await asyncio.sleep(latency)
+        return rsp
+
+    @staticmethod
+    def _prompt_of(messages: list[dict]) -> str:
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                content = message["content"]
+                if isinstance(content, list):
+                    return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+                return content
+        return ""
+
+    @staticmethod
+    def _system_of(messages: list[dict]) -> str:
+        return "\n".join(m["content"] for m in messages if m.get("role") == "system" and isinstance(m.get("content"), str))
+
+    def _sampling_params(self, messages: list[dict]) -> dict:
+        return {"mock_seed": self.seed}
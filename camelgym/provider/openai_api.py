@@ -4,8 +4,7 @@ import json
 import re
 from typing import AsyncIterator, Optional, Union
 
-from openai import APIConnectionError, AsyncOpenAI, AsyncStream
-from openai._base_client import AsyncHttpxClientWrapper
+from openai import APIConnectionError, AsyncOpenAI, AsyncStream, DefaultAsyncHttpxClient
 from openai.types import CompletionUsage
 from openai.types.chat import ChatCompletion, ChatCompletionChunk
 from tenacity import (
@@ -19,6 +18,7 @@ from tenacity import (
 from camelgym.configs.llm_config import LLMConfig, LLMType
 from camelgym.logs import log_llm_stream, logger
 from camelgym.provider.base_llm import BaseLLM
+from camelgym.provider.client_pool import get_client_pool
 from camelgym.provider.constant import GENERAL_FUNCTION_SCHEMA
 from camelgym.provider.llm_provider_registry import register_provider
 from camelgym.schema import Message
@@ -59,6 +59,12 @@ class OpenAILLM(BaseLLM):
 
     def _init_client(self):
         """https://github.com/openai/openai-python#async-usage"""
+        if self.config.pool_client:
+            # shared with every provider built from an equivalent config, see client_pool
+            self.aclient = get_client_pool().get_client(
+                self.config, api_key=self.config.api_key, base_url=self.config.base_url
+            )
+            return
         kwargs = self._make_client_kwargs()
         self.aclient = AsyncOpenAI(**kwargs)
 
@@ -67,25 +73,32 @@ class OpenAILLM(BaseLLM):
 
         # to use proxy, openai v1 needs http_client
         if proxy_params := self._get_proxy_params():
-            kwargs["http_client"] = AsyncHttpxClientWrapper(**proxy_params)
+            kwargs["http_client"] = DefaultAsyncHttpxClient(**proxy_params)
 
         return kwargs
 
     def _get_proxy_params(self) -> dict:
         params = {}
         if self.config.proxy:
-            params = {"proxies": self.config.proxy}
+            params = {"proxy": self.config.proxy}
             if self.config.base_url:
                 params["base_url"] = self.config.base_url
 
         return params
 
-    async def _achat_completion_stream(self, messages: list[dict], timeout=3) -> AsyncIterator[str]:
-        response: AsyncStream[ChatCompletionChunk] = await self.aclient.chat.completions.create(
-            **self._cons_kwargs(messages, timeout=timeout), stream=True
-        )
+    async def _achat_completion_stream(
+        self, messages: list[dict], timeout=3, usage: Optional[list] = None
+    ) -> AsyncIterator[str]:
+        """usage: receives the usage the server reports in its last chunk"""
+        kwargs = self._cons_kwargs(messages, timeout=timeout, stream=True)
+        if self.config.stream_usage:
+            kwargs["extra_body"] = {"stream_options": {"include_usage": True}}
+        response: AsyncStream[ChatCompletionChunk] = await self.aclient.chat.completions.create(**kwargs)
 
         async for chunk in response:
+            chunk_usage = getattr(chunk, "usage", None)
+            if chunk_usage and usage is not None:
+                usage.append(CompletionUsage(**chunk_usage) if isinstance(chunk_usage, dict) else chunk_usage)
             chunk_message = chunk.choices[0].delta.content or "" if chunk.choices else ""  # extract the message
             yield chunk_message
 
@@ -103,6 +116,10 @@ class OpenAILLM(BaseLLM):
             kwargs.update(extra_kwargs)
         return kwargs
 
+    def _sampling_params(self, messages: list[dict]) -> dict:
+        kwargs = self._cons_kwargs(messages)
+        return {k: v for k, v in kwargs.items() if k not in ("messages", "model", "timeout")}
+
     async def _achat_completion(self, messages: list[dict], timeout=3) -> ChatCompletion:
         kwargs = self._cons_kwargs(messages, timeout=timeout)
         rsp: ChatCompletion = await self.aclient.chat.completions.create(**kwargs)
@@ -122,7 +139,8 @@ class OpenAILLM(BaseLLM):
     async def acompletion_text(self, messages: list[dict], stream=False, timeout=3) -> str:
         """when streaming, print each token in place."""
         if stream:
-            resp = self._achat_completion_stream(messages, timeout=timeout)
+            reported = []
+            resp = self._achat_completion_stream(messages, timeout=timeout, usage=reported)
 
             collected_messages = []
             async for i in resp:
@@ -131,13 +149,27 @@ class OpenAILLM(BaseLLM):
             log_llm_stream("\n")
 
             full_reply_content = "".join(collected_messages)
-            usage = self._calc_usage(messages, full_reply_content)
+            usage = reported[-1] if reported else self._calc_usage(messages, full_reply_content)
             self._update_costs(usage)
             return full_reply_content
 
         rsp = await self._achat_completion(messages, timeout=timeout)
         return self.get_choice_text(rsp)
 
+    @retry(
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(6),
+        after=after_log(logger, logger.level("WARNING").name),
+        retry=retry_if_exception_type(APIConnectionError),
+        retry_error_callback=log_and_reraise,
+    )
+    async def acompletion_texts(self, messages: list[dict], n: int, timeout=3) -> list[str]:
+        """Sample n choices in a single request"""
+        kwargs = self._cons_kwargs(messages, timeout=timeout, n=n)
+        rsp: ChatCompletion = await self.aclient.chat.completions.create(**kwargs)
+        self._update_costs(rsp.usage)
+        return [choice.message.content or "" for choice in rsp.choices]
+
     def _func_configs(self, messages: list[dict], timeout=3, **kwargs) -> dict:
         """Note: Keep kwargs consistent with https://platform.openai.com/docs/api-reference/chat/create"""
         if "tools" not in kwargs:
@@ -268,7 +300,13 @@ class OpenAILLM(BaseLLM):
     @handle_exception
     def _update_costs(self, usage: CompletionUsage):
         if self.config.calc_usage and usage and self.cost_manager:
-            self.cost_manager.update_cost(usage.prompt_tokens, usage.completion_tokens, self.model)
+            # OpenAI, vLLM and llama.cpp servers report the prompt tokens that hit their prefix cache
+            # (a plain dict with openai versions that predate the field)
+            details = getattr(usage, "prompt_tokens_details", None) or {}
+            if not isinstance(details, dict):
+                details = details.model_dump()
+            cached_tokens = details.get("cached_tokens") or 0
+            self.cost_manager.update_cost(usage.prompt_tokens, usage.completion_tokens, self.model, cached_tokens)
 
     def get_costs(self) -> Costs:
         if not self.cost_manager:
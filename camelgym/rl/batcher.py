@@ -0,0 +1,101 @@
+"""
+Micro-batching of candidate embedding + policy scoring.
+
+Every ActionNode embeds and scores only its own K candidates, i.e. one tiny (K, 384) forward pass per
+action. When many players or games act at the same time, a ScoringBatcher collects their requests for
+up to `max_wait_ms` (or until `max_batch_size` candidates are waiting), runs one `embed` and one policy
+forward over all of them and hands every caller back its own slice.
+"""
+import asyncio
+import weakref
+from typing import Optional
+
+
+class ScoringBatcher:
+    def __init__(self, embedder, policy, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.embedder = embedder
+        self.policy = policy
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._pending: list[tuple[list[str], asyncio.Future]] = []
+        self._pending_size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.requests = 0
+        self.batches = 0
+        self.items = 0
+
+    async def score(self, texts: list[str]) -> tuple[list[list[float]], list[float]]:
+        """Embeddings and policy scores of texts, computed together with the other requests of the window"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((list(texts), future))
+        self._pending_size += len(texts)
+        self.requests += 1
+
+        if self._pending_size >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self.flush)
+        return await future
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._pending_size = self._pending, [], 0
+        if not pending:
+            return
+
+        texts = [text for request_texts, _ in pending for text in request_texts]
+        try:
+            embeds, scores = self._embed_and_score(texts)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.items += len(texts)
+        offset = 0
+        for request_texts, future in pending:
+            end = offset + len(request_texts)
+            if not future.done():  # the caller may have been cancelled meanwhile
+                future.set_result((embeds[offset:end], scores[offset:end]))
+            offset = end
+
+    def _embed_and_score(self, texts: list[str]) -> tuple[list[list[float]], list[float]]:
+        import torch
+
+        embeds = self.embedder.embed(texts)
+        with torch.no_grad():
+            scores = self.policy(torch.tensor(embeds, dtype=torch.float)).squeeze(-1)
+        return embeds, scores.tolist()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+        }
+
+
+# batchers of the current event loop, one per (embedder, policy) pair, shared by all contexts using them
+_BATCHERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+
+def get_scoring_batcher(embedder, policy, max_batch_size: int = 64, max_wait_ms: float = 2.0) -> ScoringBatcher:
+    """Must be called from a running event loop; the batch settings only apply when the batcher is created"""
+    loop = asyncio.get_running_loop()
+    batchers = _BATCHERS.get(loop)
+    if batchers is None:
+        batchers = _BATCHERS[loop] = {}
+    key = (id(embedder), id(policy))
+    batcher = batchers.get(key)
+    if batcher is None or batcher.embedder is not embedder or batcher.policy is not policy:
+        batcher = batchers[key] = ScoringBatcher(embedder, policy, max_batch_size, max_wait_ms)
+    return batcher
@@ -1,3 +1,10 @@
+import json
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+
 class ExperienceBuffer:
     """
     Stores (embeddings, chosen_index, reward) tuples.
@@ -9,11 +16,11 @@ class ExperienceBuffer:
 
     def add(self, embeds, action_index, reward=0):
         """
-        embeds: list of vectors (K x 384)
+        embeds: list of vectors (K x 384), kept as a float32 array
         action_index: chosen action index
         reward: default 0, filled later
         """
-        self.trajectories.append([embeds, action_index, reward])
+        self.trajectories.append([np.asarray(embeds, dtype=np.float32), action_index, reward])
 
     def apply_reward_to_all(self, reward):
         """Set reward for every action taken during the game."""
@@ -25,3 +32,210 @@ class ExperienceBuffer:
 
     def clear(self):
         self.trajectories = []
+
+
+def pack_trajectories(trajectories):
+    """
+    Convert (embeds, action_index, reward) tuples into flat numpy arrays that are
+    cheap to pickle between processes:
+        embeds:       float32 (total_candidates, embed_dim), candidates of all decisions stacked
+        offsets:      int64   (n + 1,), decision i owns embeds[offsets[i]:offsets[i + 1]]
+        action_index: int64   (n,)
+        reward:       float32 (n,)
+    """
+    if not trajectories:
+        return {
+            "embeds": np.zeros((0, 0), dtype=np.float32),
+            "offsets": np.zeros(1, dtype=np.int64),
+            "action_index": np.zeros(0, dtype=np.int64),
+            "reward": np.zeros(0, dtype=np.float32),
+        }
+
+    embeds = [np.asarray(e, dtype=np.float32) for e, _, _ in trajectories]
+    offsets = np.zeros(len(embeds) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in embeds])
+    return {
+        "embeds": np.concatenate(embeds, axis=0),
+        "offsets": offsets,
+        "action_index": np.array([a for _, a, _ in trajectories], dtype=np.int64),
+        "reward": np.array([r for _, _, r in trajectories], dtype=np.float32),
+    }
+
+
+def unpack_trajectories(packed):
+    """Inverse of pack_trajectories, returns a list of (embeds, action_index, reward)."""
+    embeds, offsets = packed["embeds"], packed["offsets"]
+    return [
+        (embeds[offsets[i]:offsets[i + 1]], int(packed["action_index"][i]), float(packed["reward"][i]))
+        for i in range(len(packed["action_index"]))
+    ]
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring of decisions across games, kept in preallocated arrays:
+        embeds:       (capacity, k_max, embed_dim) float16 / float32, candidate rows past n_candidates are unused
+        n_candidates, action_index, player_id: int32 (capacity,)
+        reward, priority: float32 (capacity,)
+        game_id:      int64 (capacity,)
+    Once full, new decisions overwrite the oldest ones.
+
+    With `path`, every array is an np.memmap in `<path>.<name>` (shapes in `<path>.json`), so the buffer
+    survives restarts and can be opened by other processes; a buffer has a single writer.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        k_max: int = 8,
+        embed_dim: int = 384,
+        dtype: str = "float16",
+        path: Union[str, Path, None] = None,
+    ):
+        self.capacity = capacity
+        self.k_max = k_max
+        self.embed_dim = embed_dim
+        self.dtype = np.dtype(dtype)
+        self.path = Path(path) if path else None
+
+        layout = {
+            "embeds": (self.dtype, (capacity, k_max, embed_dim)),
+            "n_candidates": (np.int32, (capacity,)),
+            "action_index": (np.int32, (capacity,)),
+            "reward": (np.float32, (capacity,)),
+            "priority": (np.float32, (capacity,)),
+            "game_id": (np.int64, (capacity,)),
+            "player_id": (np.int32, (capacity,)),
+            # next slot, number of filled slots, last game id handed out
+            "state": (np.int64, (3,)),
+        }
+        if self.path:
+            self._arrays = self._open_memmaps(layout)
+        else:
+            self._arrays = {name: np.zeros(shape, dtype=dtype_) for name, (dtype_, shape) in layout.items()}
+        self.embeds = self._arrays["embeds"]
+        self.n_candidates = self._arrays["n_candidates"]
+        self.action_index = self._arrays["action_index"]
+        self.reward = self._arrays["reward"]
+        self.priority = self._arrays["priority"]
+        self.game_id = self._arrays["game_id"]
+        self.player_id = self._arrays["player_id"]
+        self._state = self._arrays["state"]
+        self._max_priority = float(self.priority[: len(self)].max()) if len(self) else 1.0
+
+    def _open_memmaps(self, layout: dict) -> dict:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        meta_path = self.path.with_name(self.path.name + ".json")
+        meta = {"capacity": self.capacity, "k_max": self.k_max, "embed_dim": self.embed_dim, "dtype": self.dtype.name}
+        if meta_path.exists():
+            stored = json.loads(meta_path.read_text())
+            if stored != meta:
+                raise ValueError(f"Replay buffer {self.path} was created with {stored}, not {meta}")
+            mode = "r+"
+        else:
+            mode = "w+"
+
+        arrays = {
+            name: np.memmap(self.path.with_name(f"{self.path.name}.{name}"), dtype=dtype_, mode=mode, shape=shape)
+            for name, (dtype_, shape) in layout.items()
+        }
+        # the layout is written last, so a buffer whose files are incomplete is recreated
+        if mode == "w+":
+            meta_path.write_text(json.dumps(meta))
+        return arrays
+
+    def __len__(self) -> int:
+        return int(self._state[1])
+
+    def new_game_id(self) -> int:
+        self._state[2] += 1
+        return int(self._state[2])
+
+    # --------------------------------------------------------------
+
+    def add(self, embeds, action_index: int, reward: float = 0.0, game_id: int = -1, player_id: int = -1) -> int:
+        """Store one decision, returns its slot; new decisions get the current max priority"""
+        embeds = np.asarray(embeds, dtype=np.float32)
+        k = len(embeds)
+        if k > self.k_max:
+            raise ValueError(f"{k} candidates do not fit a replay buffer with k_max={self.k_max}")
+
+        slot, size = int(self._state[0]), int(self._state[1])
+        self.embeds[slot, :k] = embeds
+        self.n_candidates[slot] = k
+        self.action_index[slot] = action_index
+        self.reward[slot] = reward
+        self.priority[slot] = self._max_priority
+        self.game_id[slot] = game_id
+        self.player_id[slot] = player_id
+
+        self._state[0] = (slot + 1) % self.capacity
+        self._state[1] = min(size + 1, self.capacity)
+        return slot
+
+    def extend(self, trajectories, game_id: int = -1, player_id: int = -1) -> list[int]:
+        """Store a game's (embeds, action_index, reward) list, or the dict of pack_trajectories"""
+        if isinstance(trajectories, dict):
+            trajectories = unpack_trajectories(trajectories)
+        return [self.add(embeds, a, r, game_id, player_id) for embeds, a, r in trajectories]
+
+    # --------------------------------------------------------------
+
+    def sample(
+        self,
+        batch_size: int,
+        prioritized: bool = False,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        rng: Optional[np.random.Generator] = None,
+    ) -> dict:
+        """
+        A batch in the format of pack_trajectories (RLTrainer.train_batched takes it as is), plus
+        "slots" and, for prioritized sampling (P(i) ~ priority^alpha), importance "weights".
+        """
+        size = len(self)
+        if size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        rng = rng or np.random.default_rng()
+
+        weights = None
+        if prioritized:
+            p = self.priority[:size].astype(np.float64) ** alpha
+            p /= p.sum()
+            slots = rng.choice(size, size=batch_size, p=p)
+            weights = (size * p[slots]) ** -beta
+            weights = (weights / weights.max()).astype(np.float32)
+        else:
+            slots = rng.integers(0, size, size=batch_size)
+
+        batch = self.get(slots)
+        batch["slots"] = slots
+        if weights is not None:
+            batch["weights"] = weights
+        return batch
+
+    def get(self, slots) -> dict:
+        """The decisions in slots, packed like pack_trajectories"""
+        slots = np.asarray(slots, dtype=np.int64)
+        counts = self.n_candidates[slots].astype(np.int64)
+        offsets = np.zeros(len(slots) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        valid = np.arange(self.k_max)[None, :] < counts[:, None]
+        return {
+            "embeds": np.asarray(self.embeds[slots], dtype=np.float32)[valid],
+            "offsets": offsets,
+            "action_index": self.action_index[slots].astype(np.int64),
+            "reward": self.reward[slots].astype(np.float32),
+            "game_id": self.game_id[slots].copy(),
+            "player_id": self.player_id[slots].copy(),
+        }
+
+    def update_priorities(self, slots, priorities, eps: float = 1e-6):
+        priorities = np.abs(np.asarray(priorities, dtype=np.float32)) + eps
+        self.priority[np.asarray(slots)] = priorities
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+
+    def flush(self):
+        if self.path:
+            for array in self._arrays.values():
+                array.flush()
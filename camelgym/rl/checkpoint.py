@@ -0,0 +1,127 @@
+"""
+Versioned checkpoints of the RL policy (and its optimizer), so that long training runs can resume and a
+fixed policy can be served for evaluation:
+
+    <directory>/ckpt_v000012.pt   {"version", "policy", "optimizer", "metadata"}
+    <directory>/index.json        {"latest": 12, "best": 9, "versions": {"12": {...metadata}, ...}}
+
+Every file is written to a temporary name and moved into place, so a crash never leaves a torn checkpoint
+or index behind.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from camelgym.logs import logger
+
+
+def _atomic_write_json(path: Path, data: dict):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+class PolicyCheckpointStore:
+    """
+    directory:  where checkpoints and index.json live
+    keep_last:  number of most recent checkpoints kept on disk, the best one is always kept
+    best_metric: metadata key that decides the "best" pointer (higher is better)
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory: Union[str, Path], keep_last: int = 5, best_metric: str = "win_rate"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep_last = keep_last
+        self.best_metric = best_metric
+        self.index = self._read_index()
+
+    def _read_index(self) -> dict:
+        path = self.directory / self.INDEX_FILE
+        if path.exists():
+            return json.loads(path.read_text())
+        return {"latest": None, "best": None, "versions": {}}
+
+    def _path(self, version: int) -> Path:
+        return self.directory / f"ckpt_v{version:06d}.pt"
+
+    @property
+    def latest_version(self) -> Optional[int]:
+        return self.index["latest"]
+
+    @property
+    def best_version(self) -> Optional[int]:
+        return self.index["best"]
+
+    def metadata(self, version: int) -> dict:
+        return self.index["versions"][str(version)]
+
+    # --------------------------------------------------------------
+
+    def save(self, policy, optimizer=None, **metadata) -> int:
+        """Write a new checkpoint, e.g. save(policy, trainer.optimizer, games_played=500, win_rate=0.56)"""
+        import torch
+
+        version = 0 if self.latest_version is None else self.latest_version + 1
+        metadata = {**metadata, "version": version, "created": time.time()}
+
+        path = self._path(version)
+        tmp = path.with_suffix(".tmp")
+        torch.save(
+            {
+                "version": version,
+                "policy": policy.state_dict(),
+                "optimizer": optimizer.state_dict() if optimizer is not None else None,
+                "metadata": metadata,
+            },
+            tmp,
+        )
+        os.replace(tmp, path)
+
+        self.index["versions"][str(version)] = metadata
+        self.index["latest"] = version
+        score = metadata.get(self.best_metric)
+        best = self.best_version
+        if score is not None and (best is None or score > self.metadata(best).get(self.best_metric, float("-inf"))):
+            self.index["best"] = version
+        self._prune()
+        _atomic_write_json(self.directory / self.INDEX_FILE, self.index)
+        logger.info(f"[Checkpoint] saved policy v{version} to {path}")
+        return version
+
+    def _prune(self):
+        versions = sorted(int(v) for v in self.index["versions"])
+        for version in versions[: -self.keep_last] if self.keep_last else []:
+            if version == self.best_version:
+                continue
+            self._path(version).unlink(missing_ok=True)
+            del self.index["versions"][str(version)]
+
+    # --------------------------------------------------------------
+
+    def resolve(self, version: Union[int, str] = "latest") -> Optional[int]:
+        if version == "latest":
+            return self.latest_version
+        if version == "best":
+            return self.best_version
+        return int(version)
+
+    def load(self, version: Union[int, str] = "latest") -> dict:
+        import torch
+
+        resolved = self.resolve(version)
+        if resolved is None:
+            raise FileNotFoundError(f"No {version} checkpoint in {self.directory}")
+        return torch.load(self._path(resolved), map_location="cpu")
+
+    def load_into(self, context, version: Union[int, str] = "latest", load_optimizer: bool = True) -> dict:
+        """Load a checkpoint into the context's policy (in place, shared with its session) and trainer"""
+        checkpoint = self.load(version)
+        context.policy.load_state_dict(checkpoint["policy"])
+        if load_optimizer and checkpoint["optimizer"] is not None and context.trainer is not None:
+            context.trainer.optimizer.load_state_dict(checkpoint["optimizer"])
+        logger.info(f"[Checkpoint] loaded policy v{checkpoint['version']} from {self.directory}")
+        return checkpoint["metadata"]
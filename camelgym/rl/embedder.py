@@ -1,16 +1,33 @@
-from sentence_transformers import SentenceTransformer
-
 class LocalEmbedder:
     """
     Uses a local MiniLM model to generate 384-d embeddings.
     No OpenAI API required.
+
+    The model is loaded on the first embed call, not at construction;
+    use camelgym.rl.registry.get_shared_embedder to share one per process.
+    With a `cache` (camelgym.rl.embedding_cache.EmbeddingCache), texts seen before skip the encoder.
     """
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.encoder = SentenceTransformer(model_name)
+    def __init__(self, model_name="all-MiniLM-L6-v2", cache=None):
+        self.model_name = model_name
+        self.cache = cache
+        self._encoder = None
+
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._encoder = SentenceTransformer(self.model_name)
+        return self._encoder
+
+    def encode(self, texts):
+        return self.encoder.encode(texts, convert_to_numpy=True)
 
     def embed(self, texts):
         """
         texts: list[str]
         returns: list[np.ndarray] shape (len(texts), 384)
         """
-        return self.encoder.encode(texts, convert_to_numpy=True).tolist()
+        if self.cache is not None:
+            return self.cache.embed(texts, self.encode).tolist()
+        return self.encode(texts).tolist()
@@ -0,0 +1,182 @@
+"""
+Content-hash cache in front of the sentence encoder.
+
+Candidate actions repeat constantly ("I vote to eliminate Player3", "Pass", ...), so most of them can be
+served without running the transformer. Vectors are kept in an in-memory LRU and, optionally, written
+through to a memory-mapped float16 store on disk that later runs reopen.
+"""
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from camelgym.logs import logger
+
+
+class EmbeddingCache:
+    """
+    max_entries:   size of the in-memory LRU (float32 vectors)
+    disk_path:     optional prefix of the on-disk store: `<disk_path>.f16` holds the vectors
+                   (np.memmap, float16, disk_capacity x dim) and `<disk_path>.keys` their content hashes,
+                   row by row. A store has a single writer, processes must not share one.
+    disk_capacity: rows of a new store; an existing smaller store is grown to it, a larger one keeps its size
+    """
+
+    KEY_BYTES = 16
+
+    def __init__(
+        self,
+        dim: int = 384,
+        max_entries: int = 50_000,
+        disk_path: Union[str, Path, None] = None,
+        disk_capacity: int = 200_000,
+    ):
+        self.dim = dim
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.disk_path = Path(disk_path) if disk_path else None
+        self.disk_capacity = disk_capacity
+        self._disk: Optional[np.memmap] = None
+        self._disk_rows: dict[bytes, int] = {}
+        self._keys_file = None
+        self._disk_full_warned = False
+        if self.disk_path:
+            self._open_disk()
+
+    # --------------------------------------------------------------
+
+    @classmethod
+    def key(cls, text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=cls.KEY_BYTES).digest()
+
+    def _open_disk(self):
+        self.disk_path.parent.mkdir(parents=True, exist_ok=True)
+        vectors_path = self.disk_path.with_name(self.disk_path.name + ".f16")
+        keys_path = self.disk_path.with_name(self.disk_path.name + ".keys")
+
+        mode = "w+"
+        if vectors_path.exists():
+            mode = "r+"
+            self._fit_disk_capacity(vectors_path)
+        self._disk = np.memmap(vectors_path, dtype=np.float16, mode=mode, shape=(self.disk_capacity, self.dim))
+
+        keys = keys_path.read_bytes() if keys_path.exists() else b""
+        n_rows = len(keys) // self.KEY_BYTES  # a torn last key is ignored, its row gets rewritten
+        for row in range(n_rows):
+            self._disk_rows[keys[row * self.KEY_BYTES : (row + 1) * self.KEY_BYTES]] = row
+        # unbuffered: a key is on disk as soon as it is written, even if the process never closes the cache
+        self._keys_file = open(keys_path, "r+b" if keys_path.exists() else "wb", buffering=0)
+        self._keys_file.seek(n_rows * self.KEY_BYTES)
+        self._keys_file.truncate()
+
+    def _fit_disk_capacity(self, vectors_path: Path):
+        """The capacity of an existing store is its file size, grow the file if more rows were asked for"""
+        row_bytes = self.dim * np.dtype(np.float16).itemsize
+        size = vectors_path.stat().st_size
+        if size % row_bytes:
+            raise ValueError(f"Embedding store {vectors_path} ({size} bytes) does not hold {self.dim}-dim vectors")
+        stored = size // row_bytes
+        if stored < self.disk_capacity:
+            with open(vectors_path, "r+b") as f:
+                f.truncate(self.disk_capacity * row_bytes)  # new rows read as zeros until written
+            logger.info(f"Embedding store {self.disk_path} grown from {stored} to {self.disk_capacity} rows")
+        elif stored > self.disk_capacity:
+            self.disk_capacity = stored
+
+    def _write_disk(self, key: bytes, vector: np.ndarray):
+        if self._disk is None or key in self._disk_rows:
+            return
+        row = len(self._disk_rows)
+        if row >= self.disk_capacity:
+            if not self._disk_full_warned:
+                logger.warning(f"Embedding store {self.disk_path} is full ({self.disk_capacity} rows)")
+                self._disk_full_warned = True
+            return
+        # vector first, then its key, so a key on disk always points at a written row
+        self._disk[row] = vector
+        self._keys_file.write(key)
+        self._disk_rows[key] = row
+
+    # --------------------------------------------------------------
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return vector
+        row = self._disk_rows.get(key)
+        if row is not None:
+            vector = np.asarray(self._disk[row], dtype=np.float32)
+            self._remember(key, vector)
+            self.disk_hits += 1
+            return vector
+        self.misses += 1
+        return None
+
+    def put(self, key: bytes, vector: np.ndarray):
+        vector = np.asarray(vector, dtype=np.float32)
+        self._remember(key, vector)
+        self._write_disk(key, vector)
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def embed(self, texts: list[str], encode: Callable[[list[str]], np.ndarray]) -> np.ndarray:
+        """(len(texts), dim) vectors; texts not cached are encoded together in one `encode` call"""
+        keys = [self.key(text) for text in texts]
+        vectors: dict[bytes, np.ndarray] = {}
+        missing: dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            vector = self.get(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                vectors[key] = vector
+
+        if missing:
+            encoded = np.asarray(encode(list(missing.values())), dtype=np.float32)
+            for key, vector in zip(missing, encoded):
+                self.put(key, vector)
+                vectors[key] = vector
+
+        return np.stack([vectors[key] for key in keys]) if keys else np.zeros((0, self.dim), dtype=np.float32)
+
+    # --------------------------------------------------------------
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "disk_entries": len(self._disk_rows),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def flush(self):
+        if self._disk is not None:
+            self._disk.flush()
+            self._keys_file.flush()
+
+    def close(self):
+        if self._disk is not None:
+            self.flush()
+            self._keys_file.close()
+            self._disk = None
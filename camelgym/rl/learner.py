@@ -0,0 +1,150 @@
+"""
+Asynchronous actor-learner split.
+
+Actors play games and put their packed trajectories, tagged with the policy version they were played
+under, on a multiprocessing queue. A learner process (`learner_main`) trains on them continuously and
+publishes every new version of the weights through a PolicyPublisher directory; actors pick the latest
+one up with a PolicySubscriber between games, so they never wait for training.
+"""
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from camelgym.logs import logger
+
+LATEST_FILE = "LATEST"
+
+
+def _weights_path(directory: Path, version: int) -> Path:
+    return directory / f"policy_v{version:06d}.pt"
+
+
+class PolicyPublisher:
+    """Writes versioned policy weights: `policy_v<version>.pt`, then the version number to LATEST"""
+
+    def __init__(self, directory: Union[str, Path], keep_last: int = 3):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep_last = keep_last
+
+    def publish(self, state_dict: dict, version: int):
+        import torch
+
+        path = _weights_path(self.directory, version)
+        tmp = path.with_suffix(".tmp")
+        torch.save({"version": version, "state_dict": state_dict}, tmp)
+        os.replace(tmp, path)
+
+        # readers only ever see complete weights: LATEST is switched after the file is in place
+        latest_tmp = self.directory / f"{LATEST_FILE}.tmp"
+        latest_tmp.write_text(str(version))
+        os.replace(latest_tmp, self.directory / LATEST_FILE)
+
+        stale = version - self.keep_last
+        if stale >= 0:
+            _weights_path(self.directory, stale).unlink(missing_ok=True)
+
+
+class PolicySubscriber:
+    """Hot-reloads the latest published weights into a policy, when there is a newer version"""
+
+    def __init__(self, directory: Union[str, Path], version: int = -1):
+        self.directory = Path(directory)
+        self.version = version
+        self.reloads = 0
+
+    def latest_version(self) -> int:
+        try:
+            return int((self.directory / LATEST_FILE).read_text())
+        except (FileNotFoundError, ValueError):
+            return -1
+
+    def maybe_reload(self, policy) -> int:
+        """Load newer weights into policy in place, returns the version the policy now has"""
+        import torch
+
+        latest = self.latest_version()
+        if latest <= self.version:
+            return self.version
+        try:
+            checkpoint = torch.load(_weights_path(self.directory, latest), map_location="cpu")
+        except FileNotFoundError:  # already replaced by a newer version, picked up next time
+            return self.version
+        policy.load_state_dict(checkpoint["state_dict"])
+        self.version = checkpoint["version"]
+        self.reloads += 1
+        return self.version
+
+
+def learner_main(
+    trajectory_queue,
+    stats_queue,
+    weights_dir: str,
+    initial_state: Optional[dict] = None,
+    lr: float = 1e-4,
+    entropy_beta: float = 0.01,
+    max_staleness: int = 4,
+    min_batch_decisions: int = 64,
+    minibatch_size: Optional[int] = None,
+    epochs: int = 1,
+    torch_threads: int = 1,
+):
+    """
+    Learner process entry. Items on trajectory_queue are (policy_version, packed trajectories); a batch
+    played more than max_staleness versions ago is dropped. Decisions are accumulated up to
+    min_batch_decisions, trained on with RLTrainer.train_batched, and every update is published as
+    the next version. A None item stops it (after everything queued before it), the learner then puts
+    its stats on stats_queue.
+    """
+    import numpy as np
+    import torch
+
+    from camelgym.rl.buffer import pack_trajectories, unpack_trajectories
+    from camelgym.rl.policy import RLPolicy
+    from camelgym.rl.trainer import RLTrainer
+
+    torch.set_num_threads(torch_threads)
+    policy = RLPolicy()
+    if initial_state is not None:
+        policy.load_state_dict(initial_state)
+    trainer = RLTrainer(policy, lr=lr, entropy_beta=entropy_beta)
+    publisher = PolicyPublisher(weights_dir)
+
+    version = 0
+    publisher.publish(policy.state_dict(), version)
+    stats = {"updates": 0, "decisions_trained": 0, "batches_received": 0, "batches_dropped_stale": 0, "losses": []}
+    pending: list = []
+    staleness: list[int] = []
+
+    def train_pending():
+        nonlocal version, pending
+        loss = trainer.train_batched(pack_trajectories(pending), minibatch_size=minibatch_size, epochs=epochs)
+        stats["updates"] += 1
+        stats["decisions_trained"] += len(pending)
+        stats["losses"].append(loss)
+        pending = []
+        version += 1
+        publisher.publish(policy.state_dict(), version)
+
+    while True:
+        item = trajectory_queue.get()
+        if item is None:
+            break
+        item_version, packed = item
+
+        stats["batches_received"] += 1
+        if version - item_version > max_staleness:
+            stats["batches_dropped_stale"] += 1
+            continue
+        staleness.append(version - item_version)
+        pending.extend(unpack_trajectories(packed))
+        if len(pending) >= min_batch_decisions:
+            train_pending()
+
+    if pending:
+        train_pending()
+    stats["final_version"] = version
+    stats["mean_staleness"] = float(np.mean(staleness)) if staleness else 0.0
+    stats_queue.put(stats)
+    logger.info(f"[Learner] stopped at version {version} after {stats['updates']} updates")
+
@@ -0,0 +1,116 @@
+"""
+Process-wide registry of the RL components, so that every Context shares them instead of loading its own:
+
+- one embedder per model name for the whole process (the SentenceTransformer is loaded on first use),
+  with an embedding cache in front of it, see configure_embedding_cache
+- one policy / trainer per named training session, and optionally a replay buffer that keeps the
+  decisions of every game played in it (see configure_replay_buffer)
+"""
+import re
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    from camelgym.rl.buffer import ReplayBuffer
+    from camelgym.rl.embedder import LocalEmbedder
+    from camelgym.rl.embedding_cache import EmbeddingCache
+    from camelgym.rl.policy import RLPolicy
+    from camelgym.rl.trainer import RLTrainer
+
+DEFAULT_EMBEDDER_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_RL_SESSION = "default"
+
+_LOCK = threading.Lock()
+_EMBEDDERS: dict[str, "LocalEmbedder"] = {}
+_SESSIONS: dict[str, "RLSession"] = {}
+# settings of the embedding caches of embedders created from now on; max_entries 0 disables caching
+_EMBEDDING_CACHE_SETTINGS = {"max_entries": 50_000, "disk_dir": None}
+
+
+class RLSession:
+    """A policy and its trainer, created on first access; torch is only imported then"""
+
+    def __init__(self, name: str = DEFAULT_RL_SESSION, lr: float = 1e-4, entropy_beta: float = 0.01):
+        self.name = name
+        self.lr = lr
+        self.entropy_beta = entropy_beta
+        self._policy = None
+        self._trainer = None
+        self.replay_buffer: Optional["ReplayBuffer"] = None
+
+    @property
+    def policy(self) -> "RLPolicy":
+        if self._policy is None:
+            from camelgym.rl.policy import RLPolicy
+
+            self._policy = RLPolicy()
+        return self._policy
+
+    @property
+    def trainer(self) -> "RLTrainer":
+        if self._trainer is None:
+            from camelgym.rl.trainer import RLTrainer
+
+            self._trainer = RLTrainer(self.policy, lr=self.lr, entropy_beta=self.entropy_beta)
+        return self._trainer
+
+
+def configure_replay_buffer(
+    capacity: int = 100_000,
+    k_max: int = 8,
+    dtype: str = "float16",
+    path: Union[str, Path, None] = None,
+    session: str = DEFAULT_RL_SESSION,
+) -> "ReplayBuffer":
+    """Keep the decisions of the session's games in a replay buffer, persisted to path if given"""
+    from camelgym.rl.buffer import ReplayBuffer
+
+    buffer = ReplayBuffer(capacity=capacity, k_max=k_max, dtype=dtype, path=path)
+    get_rl_session(session).replay_buffer = buffer
+    return buffer
+
+
+def configure_embedding_cache(max_entries: int = 50_000, disk_dir: Union[str, Path, None] = None):
+    """
+    Set up the cache of the shared embedders: an in-memory LRU of max_entries vectors (0 disables it) and,
+    with disk_dir, a persistent float16 store per model. Applies to embedders not created yet.
+    """
+    _EMBEDDING_CACHE_SETTINGS.update(max_entries=max_entries, disk_dir=disk_dir)
+
+
+def _make_embedding_cache(model_name: str) -> Optional["EmbeddingCache"]:
+    from camelgym.rl.embedding_cache import EmbeddingCache
+
+    if not _EMBEDDING_CACHE_SETTINGS["max_entries"]:
+        return None
+    disk_dir = _EMBEDDING_CACHE_SETTINGS["disk_dir"]
+    disk_path = Path(disk_dir) / re.sub(r"[^\w.-]", "_", model_name) if disk_dir else None
+    return EmbeddingCache(max_entries=_EMBEDDING_CACHE_SETTINGS["max_entries"], disk_path=disk_path)
+
+
+def get_shared_embedder(model_name: str = DEFAULT_EMBEDDER_MODEL) -> "LocalEmbedder":
+    embedder = _EMBEDDERS.get(model_name)
+    if embedder is None:
+        from camelgym.rl.embedder import LocalEmbedder
+
+        with _LOCK:
+            embedder = _EMBEDDERS.get(model_name)
+            if embedder is None:
+                embedder = _EMBEDDERS[model_name] = LocalEmbedder(model_name, cache=_make_embedding_cache(model_name))
+    return embedder
+
+
+def get_rl_session(name: str = DEFAULT_RL_SESSION, **kwargs) -> RLSession:
+    """The named training session; kwargs (lr, entropy_beta) only apply when it is created"""
+    session = _SESSIONS.get(name)
+    if session is None:
+        with _LOCK:
+            session = _SESSIONS.setdefault(name, RLSession(name, **kwargs))
+    return session
+
+
+def reset_rl_session(name: str = DEFAULT_RL_SESSION):
+    """Drop a session, the next access starts from a fresh policy"""
+    with _LOCK:
+        _SESSIONS.pop(name, None)
@@ -1,8 +1,11 @@
 # trainer.py
+import numpy as np
 import torch
 import torch.optim as optim
 import torch.nn.functional as F
 
+from camelgym.rl.buffer import pack_trajectories
+
 class RLTrainer:
     """
     REINFORCE training with entropy regularization for better exploration.
@@ -45,3 +48,71 @@ class RLTrainer:
         self.optimizer.step()
 
         return total_loss.item()
+
+    def train_batched(self, trajectories, minibatch_size=None, epochs=1, shuffle=True):
+        """
+        Same loss as `train`, but every minibatch of decisions is scored in one forward pass:
+        the variable-K candidate sets are stacked (see pack_trajectories), and the per-decision
+        log-softmax / entropy are computed on a padded (decisions, K_max) score matrix with a mask.
+
+        trajectories:   list of (embeds, action_index, reward), or the dict of pack_trajectories; a "weights"
+                        entry (ReplayBuffer.sample with prioritized=True) scales each decision's loss, which
+                        corrects the bias of prioritized sampling
+        minibatch_size: decisions per optimizer step, None = all of them (one step, like `train`)
+        epochs:         passes over the trajectories
+        returns the summed loss of the last epoch
+        """
+        packed = trajectories if isinstance(trajectories, dict) else pack_trajectories(trajectories)
+        n = len(packed["action_index"])
+        if n == 0:
+            return 0.0
+
+        embeds = torch.from_numpy(np.ascontiguousarray(packed["embeds"], dtype=np.float32))
+        offsets = torch.from_numpy(np.asarray(packed["offsets"], dtype=np.int64))
+        action_index = torch.from_numpy(np.asarray(packed["action_index"], dtype=np.int64))
+        reward = torch.from_numpy(np.asarray(packed["reward"], dtype=np.float32))
+        weights = packed.get("weights")
+        if weights is not None:
+            weights = torch.from_numpy(np.asarray(weights, dtype=np.float32))
+        counts = offsets[1:] - offsets[:-1]
+
+        minibatch_size = minibatch_size or n
+        total_loss = 0.0
+        for _ in range(epochs):
+            order = torch.randperm(n) if shuffle and minibatch_size < n else torch.arange(n)
+            total_loss = 0.0
+            for start in range(0, n, minibatch_size):
+                decisions = order[start : start + minibatch_size]
+                loss = self._batched_loss(embeds, offsets, counts, action_index, reward, decisions, weights)
+
+                self.optimizer.zero_grad()
+                loss.backward()
+                self.optimizer.step()
+                total_loss += loss.item()
+
+        return total_loss
+
+    def _batched_loss(self, embeds, offsets, counts, action_index, reward, decisions, weights=None):
+        counts = counts[decisions]
+        n, k_max = len(decisions), int(counts.max())
+
+        # candidate rows of the selected decisions, and their (decision, slot) cell in the padded matrix
+        row = torch.repeat_interleave(torch.arange(n), counts)
+        slot = torch.arange(len(row)) - torch.repeat_interleave(torch.cumsum(counts, 0) - counts, counts)
+        candidates = offsets[decisions][row] + slot
+
+        scores = self.policy(embeds[candidates]).squeeze(-1)          # (total_K,)
+        padded = scores.new_full((n, k_max), float("-inf"))
+        padded = padded.index_put((row, slot), scores)                # (n, K_max)
+        mask = torch.zeros((n, k_max), dtype=torch.bool)
+        mask[row, slot] = True
+
+        log_probs = F.log_softmax(padded, dim=1).masked_fill(~mask, 0.0)
+        probs = log_probs.exp() * mask
+
+        reinforce_loss = -log_probs.gather(1, action_index[decisions].unsqueeze(1)).squeeze(1) * reward[decisions]
+        entropy = -(probs * log_probs).sum(dim=1)
+        loss = reinforce_loss - self.entropy_beta * entropy
+        if weights is not None:
+            loss = loss * weights[decisions]
+        return loss.sum()
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import itertools
 import json
 import os.path
 import uuid
@@ -172,6 +174,29 @@ class Documents(BaseModel):
         return ActionOutput(content=self.model_dump_json(), instruct_content=self)
 
 
+# ids are a per-process random prefix followed by a counter: unique like uuid4().hex (same shape), far cheaper
+_message_id_prefix = uuid.uuid4().hex[:16]
+_message_id_counter = itertools.count()
+
+
+def new_message_id() -> str:
+    return f"{_message_id_prefix}{next(_message_id_counter):016x}"
+
+
+def _renew_message_ids():
+    """A forked child must not continue its parent's id sequence"""
+    global _message_id_prefix, _message_id_counter
+    _message_id_prefix = uuid.uuid4().hex[:16]
+    _message_id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_renew_message_ids)
+
+# the default cause_by, any_to_str(UserRequirement)
+USER_REQUIREMENT = "camelgym.actions.add_requirement.UserRequirement"
+
+
 class Message(BaseModel):
     """list[<role>: <content>]"""
 
@@ -186,7 +211,7 @@ class Message(BaseModel):
     @field_validator("id", mode="before")
     @classmethod
     def check_id(cls, id: str) -> str:
-        return id if id else uuid.uuid4().hex
+        return id if id else new_message_id()
 
     @field_validator("instruct_content", mode="before")
     @classmethod
@@ -208,7 +233,7 @@ class Message(BaseModel):
     @field_validator("cause_by", mode="before")
     @classmethod
     def check_cause_by(cls, cause_by: Any) -> str:
-        return any_to_str(cause_by if cause_by else import_class("UserRequirement", "camelgym.actions.add_requirement"))
+        return any_to_str(cause_by) if cause_by else USER_REQUIREMENT
 
     @field_validator("sent_from", mode="before")
     @classmethod
@@ -242,8 +267,48 @@ class Message(BaseModel):
         data["content"] = data.get("content", content)
         super().__init__(**data)
 
+    @classmethod
+    def trusted(
+        cls,
+        content: str,
+        role: str = "user",
+        cause_by: Any = "",
+        sent_from: Any = "",
+        send_to: Any = MESSAGE_ROUTE_TO_ALL,
+        instruct_content: Optional[BaseModel] = None,
+        id: str = "",
+    ) -> "Message":
+        """
+        Build a message from values the framework produced itself, without running validation: content and role
+        must be str and instruct_content a BaseModel or None. cause_by, sent_from and send_to get the same
+        conversions as in the constructor. Use Message(...) for anything parsed or user supplied.
+        """
+        msg = cls.__new__(cls)
+        _object_setattr = object.__setattr__
+        _object_setattr(
+            msg,
+            "__dict__",
+            {
+                "id": id or new_message_id(),
+                "content": content,
+                "instruct_content": instruct_content,
+                "role": role,
+                "cause_by": cause_by if isinstance(cause_by, str) and cause_by else cls.check_cause_by(cause_by),
+                "sent_from": sent_from if isinstance(sent_from, str) else any_to_str(sent_from),
+                "send_to": {send_to} if isinstance(send_to, str) and send_to else cls.check_send_to(send_to),
+            },
+        )
+        _object_setattr(msg, "__pydantic_fields_set__", set(_MESSAGE_FIELDS))
+        _object_setattr(msg, "__pydantic_extra__", None)
+        _object_setattr(msg, "__pydantic_private__", None)
+        return msg
+
     def __setattr__(self, key, val):
         """Override `@property.setter`, convert non-string parameters into string parameters."""
+        if key in _PLAIN_MESSAGE_FIELDS:  # no conversion and no assignment validation, skip BaseModel's checks
+            self.__dict__[key] = val
+            self.__pydantic_fields_set__.add(key)
+            return
         if key == MESSAGE_ROUTE_CAUSE_BY:
             new_val = any_to_str(val)
         elif key == MESSAGE_ROUTE_FROM:
@@ -271,6 +336,12 @@ class Message(BaseModel):
         """Convert the object to json string"""
         return self.model_dump_json(exclude_none=True, warnings=False)
 
+    def content_key(self) -> str:
+        """Hash of every field but the id, identifies a message when ids are ignored"""
+        payload = self.model_dump(mode="json", exclude={"id"}, warnings=False)
+        payload["send_to"] = sorted(payload["send_to"])
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
     @staticmethod
     @handle_exception(exception_type=JSONDecodeError, default_return=None)
     def load(val):
@@ -511,6 +582,10 @@ class Plan(BaseModel):
         return [task for task in self.tasks if task.is_finished]
 
 
+_MESSAGE_FIELDS = frozenset(Message.model_fields)
+_PLAIN_MESSAGE_FIELDS = frozenset({"id", "content", "role", "instruct_content"})
+
+
 class MessageQueue(BaseModel):
     """Message queue which supports asynchronous updates."""
 
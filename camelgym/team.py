@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import time
 import warnings
 from pathlib import Path
 from typing import Any, Optional
@@ -33,6 +34,8 @@ class Team(BaseModel):
     env: Optional[Environment] = None
     investment: float = Field(default=10.0)
     idea: str = Field(default="")
+    # steps, seconds and stop reason of the last run in until_terminal mode
+    run_stats: dict = Field(default_factory=dict, exclude=True)
 
     def __init__(self, context: Context = None, **data: Any):
         super(Team, self).__init__(**data)
@@ -112,12 +115,55 @@ class Team(BaseModel):
     def _save(self):
         logger.info(self.model_dump_json())
 
+    def _stop_reason(self, steps: int, start: float, max_steps: Optional[int], max_seconds: Optional[float]):
+        if self.env.is_terminal:
+            return "terminal"
+        if self.env.is_idle:  # nothing left to run, further steps would spin
+            return "idle"
+        if max_steps is not None and steps >= max_steps:
+            return "max_steps"
+        if max_seconds is not None and time.perf_counter() - start >= max_seconds:
+            return "max_seconds"
+        if self.cost_manager.total_cost >= self.cost_manager.max_budget:
+            return "budget"
+        return None
+
+    async def _run_until_terminal(self, max_steps: Optional[int], max_seconds: Optional[float]) -> dict:
+        """Step the env until it is terminal or idle, or a step / time / budget cap is hit"""
+        steps, start = 0, time.perf_counter()
+        while (stop_reason := self._stop_reason(steps, start, max_steps, max_seconds)) is None:
+            await self.env.run()
+            steps += 1
+        self.run_stats = {"steps": steps, "seconds": time.perf_counter() - start, "stop_reason": stop_reason}
+        logger.info(f"Run stopped ({stop_reason}) after {steps} steps")
+        return self.run_stats
+
     @serialize_decorator
-    async def run(self, n_round=3, idea="", send_to="", auto_archive=True):
-        """Run company until target round or no money"""
+    async def run(
+        self,
+        n_round=3,
+        idea="",
+        send_to="",
+        auto_archive=True,
+        until_terminal: bool = False,
+        max_steps: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+    ):
+        """
+        Run company until target round or no money.
+        until_terminal: instead of n_round rounds of 25 env steps, step until the env is terminal (e.g. a
+                        game has been won and announced) or idle, max_steps env steps, max_seconds or the budget;
+                        max_steps defaults to the n_round * 25 steps of a regular run
+        """
         if idea:
             self.run_project(idea=idea, send_to=send_to)
 
+        if until_terminal:
+            max_steps = n_round * 25 if max_steps is None else max_steps
+            await self._run_until_terminal(max_steps, max_seconds)
+            self.env.archive(auto_archive)
+            return self.env.history
+
         while n_round > 0:
             # self._save()
             n_round -= 1
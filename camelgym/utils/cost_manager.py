@@ -13,6 +13,7 @@ class Costs(NamedTuple):
     total_completion_tokens: int
     total_cost: float
     total_budget: float
+    total_cached_tokens: int = 0
 
 
 class CostManager(BaseModel):
@@ -20,11 +21,12 @@ class CostManager(BaseModel):
 
     total_prompt_tokens: int = 0
     total_completion_tokens: int = 0
+    total_cached_tokens: int = 0  # prompt tokens the provider served from its prefix cache
     total_budget: float = 0
     max_budget: float = 10.0
     total_cost: float = 0
 
-    def update_cost(self, prompt_tokens, completion_tokens, model):
+    def update_cost(self, prompt_tokens, completion_tokens, model, cached_tokens=0):
         """
         Update the total cost, prompt tokens, and completion tokens.
 
@@ -32,9 +34,11 @@ class CostManager(BaseModel):
         prompt_tokens (int): The number of tokens used in the prompt.
         completion_tokens (int): The number of tokens used in the completion.
         model (str): The model used for the API call.
+        cached_tokens (int): The number of prompt tokens read from the provider's prefix cache, if reported.
         """
         self.total_prompt_tokens += prompt_tokens
         self.total_completion_tokens += completion_tokens
+        self.total_cached_tokens += cached_tokens
         if model not in TOKEN_COSTS:
             logger.warning(f"Model {model} not found in TOKEN_COSTS.")
             return
@@ -45,7 +49,8 @@ class CostManager(BaseModel):
         self.total_cost += cost
         logger.info(
             f"Total running cost: ${self.total_cost:.3f} | Max budget: ${self.max_budget:.3f} | "
-            f"Current cost: ${cost:.3f}, prompt_tokens: {prompt_tokens}, completion_tokens: {completion_tokens}"
+            f"Current cost: ${cost:.3f}, prompt_tokens: {prompt_tokens} ({cached_tokens} cached), "
+            f"completion_tokens: {completion_tokens}"
         )
 
     def get_total_prompt_tokens(self):
@@ -77,13 +82,19 @@ class CostManager(BaseModel):
 
     def get_costs(self) -> Costs:
         """Get all costs"""
-        return Costs(self.total_prompt_tokens, self.total_completion_tokens, self.total_cost, self.total_budget)
+        return Costs(
+            self.total_prompt_tokens,
+            self.total_completion_tokens,
+            self.total_cost,
+            self.total_budget,
+            self.total_cached_tokens,
+        )
 
 
 class TokenCostManager(CostManager):
     """open llm model is self-host, it's free and without cost"""
 
-    def update_cost(self, prompt_tokens, completion_tokens, model):
+    def update_cost(self, prompt_tokens, completion_tokens, model, cached_tokens=0):
         """
         Update the total cost, prompt tokens, and completion tokens.
 
@@ -91,7 +102,11 @@ class TokenCostManager(CostManager):
         prompt_tokens (int): The number of tokens used in the prompt.
         completion_tokens (int): The number of tokens used in the completion.
         model (str): The model used for the API call.
+        cached_tokens (int): The number of prompt tokens read from the provider's prefix cache, if reported.
         """
         self.total_prompt_tokens += prompt_tokens
         self.total_completion_tokens += completion_tokens
-        logger.info(f"prompt_tokens: {prompt_tokens}, completion_tokens: {completion_tokens}")
+        self.total_cached_tokens += cached_tokens
+        logger.info(
+            f"prompt_tokens: {prompt_tokens} ({cached_tokens} cached), completion_tokens: {completion_tokens}"
+        )
@@ -1,4 +1,6 @@
 
+import functools
+
 import tiktoken
 
 TOKEN_COSTS = {
@@ -91,6 +93,30 @@ def count_string_tokens(string: str, model_name: str) -> int:
     return len(encoding.encode(string))
 
 
+@functools.lru_cache(maxsize=None)
+def _encoding_or_none(model_name: str):
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:  # not an OpenAI model, its tokenizer is close enough to cl100k for budgeting
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+    except Exception:  # the encoding file cannot be downloaded, e.g. offline
+        return None
+
+
+def count_text_tokens(string: str, model_name: str = "gpt-3.5-turbo") -> int:
+    """
+    Like count_string_tokens, for any model name and without network access: the encoding is loaded once,
+    and when none is available the count is estimated at 4 characters per token.
+    """
+    encoding = _encoding_or_none(model_name)
+    if encoding is None:
+        return (len(string) + 3) // 4
+    return len(encoding.encode(string))
+
+
 def get_max_completion_tokens(messages: list[dict], model: str, default: int) -> int:
     """Calculate the maximum number of completion tokens for a given model and list of messages.
 
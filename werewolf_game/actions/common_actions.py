@@ -1,4 +1,5 @@
 from camelgym.actions import Action
+import functools
 import json
 import re
 from camelgym.const import DEFAULT_WORKSPACE_ROOT
@@ -40,6 +41,32 @@ def robust_json_loads(input_str):
     except json.JSONDecodeError as e:
         return f"Failed to decode JSON: {e}"
 
+# values that change on every turn; in the cache-friendly layout they leave the (static) template
+TURN_PLACEHOLDERS = ("__context__", "__reflection__", "__experiences__", "__latest_instruction__")
+CACHE_FRIENDLY_NOTE = """
+    The user message gives your `ROLE` and `PLAYER_NAME`, then the `HISTORY` of the conversation you have knowledge of,
+    then the `TURN` with the values of this turn, such as the `MODERATOR_INSTRUCTION` to follow now.
+    """
+
+
+@functools.lru_cache(maxsize=None)
+def static_prompt_block(template: str) -> str:
+    """A PROMPT_TEMPLATE without the lines holding per-turn values, the same for every player"""
+    lines = [line for line in template.splitlines() if not any(p in line for p in TURN_PLACEHOLDERS)]
+    return "\n".join(lines).replace("__profile__", "`ROLE`").replace("__name__", "`PLAYER_NAME`")
+
+
+def cache_friendly_user_msg(profile: str, name: str, context: str, **turn) -> str:
+    """
+    Per-player, per-turn part of a cache-friendly prompt: the player, then its append-only transcript, then
+    the values of this turn last, so consecutive prompts of a player share everything up to the TURN block
+    """
+    return (
+        f"ROLE: {profile}\nPLAYER_NAME: {name}\n\nHISTORY:\n{context}\n\n"
+        f"TURN:\n{json.dumps({k.upper(): v for k, v in turn.items()}, indent=4, ensure_ascii=False)}"
+    )
+
+
 class Speak(Action):
     """Action: Any speak action in a game"""
 
@@ -78,14 +105,21 @@ class Speak(Action):
     @retry(stop=stop_after_attempt(2), wait=wait_fixed(1))
     async def run(self, profile: str, name: str, context: str, latest_instruction: str, reflection: str = "", experiences: str = ""):
 
-        prompt = (
-            self.PROMPT_TEMPLATE.replace("__context__", context).replace("__profile__", profile)
-            .replace("__name__", name).replace("__latest_instruction__", latest_instruction)
-            .replace("__strategy__", self.STRATEGY).replace("__reflection__", reflection)
-            .replace("__experiences__", experiences)
-        )
-
-        rsp = await self._aask(prompt)
+        if self.context.cache_friendly_prompts:
+            system = static_prompt_block(self.PROMPT_TEMPLATE).replace("__strategy__", self.STRATEGY) + CACHE_FRIENDLY_NOTE
+            prompt = cache_friendly_user_msg(
+                profile, name, context,
+                reflection=reflection, past_experiences=experiences, moderator_instruction=latest_instruction,
+            )
+            rsp = await self._aask(prompt, system_msgs=[system])
+        else:
+            prompt = (
+                self.PROMPT_TEMPLATE.replace("__context__", context).replace("__profile__", profile)
+                .replace("__name__", name).replace("__latest_instruction__", latest_instruction)
+                .replace("__strategy__", self.STRATEGY).replace("__reflection__", reflection)
+                .replace("__experiences__", experiences)
+            )
+            rsp = await self._aask(prompt)
         rsp = rsp.replace("\n", " ")
         # rsp = rsp[3:-4]
         # rsp = rsp.replace("json", " ").strip()
@@ -163,8 +197,11 @@ class NighttimeWhispers(Action):
     def __init__(self, name="NightTimeWhispers", context=None, llm=None):
         super().__init__(name = name, context = context, llm = llm)
 
-    def _construct_prompt_json(self, role_profile: str, role_name: str, context: str, reflection: str, experiences: str, **kwargs):
-        prompt_template = self.PROMPT_TEMPLATE
+    def _construct_prompt_json(
+        self, role_profile: str, role_name: str, context: str, reflection: str, experiences: str, static: bool = False, **kwargs
+    ):
+        # static: without the per-turn values, the system block of the cache-friendly layout
+        prompt_template = static_prompt_block(self.PROMPT_TEMPLATE) if static else self.PROMPT_TEMPLATE
 
         def replace_string(prompt_json: dict):
             k: str
@@ -202,11 +239,17 @@ class NighttimeWhispers(Action):
     @retry(stop=stop_after_attempt(2), wait=wait_fixed(1))
     async def run(self, context: str, profile: str, name: str, reflection: str = "", experiences: str = ""):
 
-        prompt = self._construct_prompt_json(
-            role_profile=profile, role_name=name, context=context, reflection=reflection, experiences=experiences
-        )
-
-        rsp = await self._aask(prompt)
+        if self.context.cache_friendly_prompts:
+            system = self._construct_prompt_json(
+                role_profile="`ROLE`", role_name="`PLAYER_NAME`", context="", reflection="", experiences="", static=True
+            )
+            prompt = cache_friendly_user_msg(profile, name, context, reflection=reflection, past_experiences=experiences)
+            rsp = await self._aask(prompt, system_msgs=[system + CACHE_FRIENDLY_NOTE])
+        else:
+            prompt = self._construct_prompt_json(
+                role_profile=profile, role_name=name, context=context, reflection=reflection, experiences=experiences
+            )
+            rsp = await self._aask(prompt)
         rsp = rsp.replace("\n", " ")
 
         # Try to parse JSON first
@@ -298,14 +341,17 @@ class Reflect(Action):
     @retry(stop=stop_after_attempt(2), wait=wait_fixed(1))
     async def run(self, profile: str, name: str, context: str, latest_instruction: str):
 
-        prompt = (
-            self.PROMPT_TEMPLATE.replace("__context__", context)
-            .replace("__profile__", profile)
-            .replace("__name__", name)
-            .replace("__latest_instruction__", latest_instruction)
-        )
-
-        rsp = await self._aask(prompt)
+        if self.context.cache_friendly_prompts:
+            prompt = cache_friendly_user_msg(profile, name, context, moderator_instruction=latest_instruction)
+            rsp = await self._aask(prompt, system_msgs=[static_prompt_block(self.PROMPT_TEMPLATE) + CACHE_FRIENDLY_NOTE])
+        else:
+            prompt = (
+                self.PROMPT_TEMPLATE.replace("__context__", context)
+                .replace("__profile__", profile)
+                .replace("__name__", name)
+                .replace("__latest_instruction__", latest_instruction)
+            )
+            rsp = await self._aask(prompt)
         # flatten newlines so the JSON extractor has an easier time
         rsp = rsp.replace("\n", " ")
 
@@ -117,3 +117,19 @@ class AnnounceGameResult(Action):
 
     async def run(self, winner: str, win_reason: str):
         return f"Game over! {win_reason}. The winner is the {winner}"
+
+class SummarizeDay(Action):
+    PROMPT_TEMPLATE: str = """
+    It's a Werewolf game. Below is everything said in public during night and day __day__, as the moderator saw it.
+    Summarize it for the players in at most 5 short sentences: who died and how, who claimed which role,
+    who accused or defended whom, and how everyone voted. Only state what was said, do not guess roles.
+    __transcript__
+    """
+
+    def __init__(self, name="SummarizeDay", context=None, llm=None):
+        super().__init__(name=name, context=context, llm=llm)
+
+    async def run(self, day: int, transcript: str) -> str:
+        prompt = self.PROMPT_TEMPLATE.replace("__day__", str(day + 1)).replace("__transcript__", transcript)
+        rsp = await self._aask(prompt)
+        return " ".join(rsp.split())
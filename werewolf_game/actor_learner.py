@@ -0,0 +1,158 @@
+import asyncio
+import multiprocessing as mp
+import queue
+import tempfile
+import time
+
+import fire
+
+from camelgym.context import Context
+from camelgym.logs import logger
+from camelgym.rl.buffer import pack_trajectories
+from camelgym.rl.learner import PolicySubscriber, learner_main
+
+from self_play import duration_stats
+from start_game import run_one_game_async
+
+
+class ActorLearnerRunner:
+    """
+    Self-play with training moved out of the game loop: games (the actors) run concurrently on this
+    process' event loop and never train, a learner process trains on their trajectories as they arrive.
+
+    - every finished game puts (policy_version, packed trajectories) on the learner's queue
+    - before a game starts, the actors reload the newest published weights (shared policy, in place);
+      games still running switch to them on their next decision, so the version a game is tagged
+      with is the oldest one it may have played under
+    - the learner drops games played more than `max_staleness` versions behind its current one
+    """
+
+    def __init__(
+        self,
+        n_games: int = 50,
+        max_games_in_flight: int = 4,
+        max_staleness: int = 4,
+        min_batch_decisions: int = 64,
+        weights_dir: str = None,
+        context: Context = None,
+        learner_kwargs: dict = None,
+        **game_kwargs,
+    ):
+        self.n_games = n_games
+        self.max_games_in_flight = max_games_in_flight
+        self.max_staleness = max_staleness
+        self.min_batch_decisions = min_batch_decisions
+        self.weights_dir = weights_dir or tempfile.mkdtemp(prefix="werewolf_policy_")
+        self.learner_kwargs = learner_kwargs or {}
+        self.game_kwargs = game_kwargs
+
+        self.context = context or Context()
+        self.subscriber = PolicySubscriber(self.weights_dir, version=0)
+
+        self.results: list[dict] = []
+        self.durations: list[float] = []
+        self.learner_stats: dict = {}
+        self.wall_time: float = 0.0
+
+    def _new_game_context(self) -> Context:
+        ctx = Context(config=self.context.config)
+        ctx.embedder = self.context.embedder
+        ctx.policy = self.context.policy
+        ctx.scoring_batch_size = self.context.scoring_batch_size
+        ctx.scoring_max_wait_ms = self.context.scoring_max_wait_ms
+        ctx.cache_friendly_prompts = self.context.cache_friendly_prompts
+        return ctx
+
+    async def _play(self, game_id: int, slots: asyncio.Semaphore, trajectory_queue):
+        async with slots:
+            version = self.subscriber.maybe_reload(self.context.policy)
+            start = time.perf_counter()
+            result = await run_one_game_async(context=self._new_game_context(), train=False, **self.game_kwargs)
+            duration = time.perf_counter() - start
+
+        if result["trajectories"]:
+            # mp.Queue.put hands the pickling to a feeder thread, the actor does not wait for the learner
+            trajectory_queue.put((version, pack_trajectories(result["trajectories"])))
+        result.update(game_id=game_id, duration=duration, policy_version=version)
+        self.results.append(result)
+        self.durations.append(duration)
+        logger.info(f"[ActorLearner] game {game_id} finished in {duration:.1f}s under policy v{version}")
+        return result
+
+    def run(self) -> dict:
+        mp_context = mp.get_context("spawn")
+        trajectory_queue, stats_queue = mp_context.Queue(), mp_context.Queue()
+        learner = mp_context.Process(
+            target=learner_main,
+            args=(trajectory_queue, stats_queue, self.weights_dir),
+            kwargs=dict(
+                initial_state=self.context.policy.state_dict(),
+                max_staleness=self.max_staleness,
+                min_batch_decisions=self.min_batch_decisions,
+                **self.learner_kwargs,
+            ),
+            daemon=True,
+        )
+        learner.start()
+
+        start = time.perf_counter()
+        try:
+            asyncio.run(self._run_games(trajectory_queue))
+        finally:
+            self.wall_time = time.perf_counter() - start
+            trajectory_queue.put(None)  # stops the learner once it has trained on everything before it
+            try:
+                self.learner_stats = self._learner_stats(learner, stats_queue)
+            finally:
+                learner.join()
+
+        # end with the final weights
+        self.subscriber.maybe_reload(self.context.policy)
+        report = self.report()
+        logger.info(f"[ActorLearner] {report}")
+        return report
+
+    @staticmethod
+    def _learner_stats(learner, stats_queue, poll_seconds: float = 1.0) -> dict:
+        """The learner's final stats, raises instead of waiting forever if the learner died without sending them"""
+        while True:
+            try:
+                return stats_queue.get(timeout=poll_seconds)
+            except queue.Empty:
+                if learner.is_alive():
+                    continue
+            try:  # it may have exited right after putting them
+                return stats_queue.get(timeout=poll_seconds)
+            except queue.Empty:
+                raise RuntimeError(f"learner process died (exit code {learner.exitcode}) before reporting its stats")
+
+    async def _run_games(self, trajectory_queue):
+        slots = asyncio.Semaphore(self.max_games_in_flight)
+        await asyncio.gather(*[self._play(game_id, slots, trajectory_queue) for game_id in range(1, self.n_games + 1)])
+
+    def report(self) -> dict:
+        report = duration_stats(self.durations, self.wall_time)
+        report["policy_reloads"] = self.subscriber.reloads
+        report["policy_version"] = self.subscriber.version
+        report["learner"] = {k: v for k, v in self.learner_stats.items() if k != "losses"}
+        return report
+
+
+def main(n_games=16, max_games_in_flight=4, max_staleness=4, min_batch_decisions=64, use_reflection=True):
+    runner = ActorLearnerRunner(
+        n_games=n_games,
+        max_games_in_flight=max_games_in_flight,
+        max_staleness=max_staleness,
+        min_batch_decisions=min_batch_decisions,
+        investment=3.0,
+        n_round=1,
+        shuffle=True,
+        add_human=False,
+        use_reflection=use_reflection,
+        use_experience=False,
+    )
+    print(runner.run())
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,387 @@
+"""
+End-to-end engine benchmark: complete games through WerewolfEnv / Moderator / BasePlayer / Team.run,
+with the mock LLM provider standing in for the remote model, so that only the engine is measured.
+
+    cd werewolf_game
+    export PYTHONPATH=..  # the repo root, for camelgym; werewolf_game itself is the working directory
+    python -m benchmarks.engine_benchmark run --players 7,12,20 --games 3 --output before.json
+    ... change something ...
+    python -m benchmarks.engine_benchmark run --players 7,12,20 --games 3 --output after.json
+    python -m benchmarks.engine_benchmark compare before.json after.json
+"""
+import contextlib
+import hashlib
+import inspect
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+import fire
+import numpy as np
+
+from camelgym.configs.llm_config import LLMConfig
+from camelgym.const import DEFAULT_WORKSPACE_ROOT
+from camelgym.context import Context
+from camelgym.environment.base_env import Environment
+from camelgym.environment.werewolf_env.werewolf_env import WerewolfEnv
+from camelgym.logs import define_log_level
+from camelgym.memory.memory import Memory
+from camelgym.rl.policy import RLPolicy
+
+from roles import BasePlayer, Guard, Moderator, Seer, Villager, Werewolf, Witch
+from start_game import run_one_game_async, seed_everything
+
+PLAYER_CONFIGS = {
+    7: [Villager] * 2 + [Werewolf] * 2 + [Guard, Seer, Witch],
+    12: [Villager] * 6 + [Werewolf] * 3 + [Guard, Seer, Witch],
+    20: [Villager] * 12 + [Werewolf] * 5 + [Guard, Seer, Witch],
+}
+
+RESULTS_DIR = DEFAULT_WORKSPACE_ROOT / "benchmarks"
+
+
+class HashingEmbedder:
+    """Offline embedder: deterministic pseudo-random 384-d vectors, as cheap as it gets"""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def embed(self, texts):
+        embeds = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+            embeds.append(np.random.default_rng(seed).standard_normal(self.dim, dtype=np.float32).tolist())
+        return embeds
+
+
+class HotPathTimers:
+    """Wraps methods on their classes for the duration of a `with` block, accumulating calls and time"""
+
+    def __init__(self):
+        self.calls: dict[str, int] = defaultdict(int)
+        self.seconds: dict[str, float] = defaultdict(float)
+        self._patched: list[tuple[type, str, object]] = []
+
+    def track(self, owner: type, attr: str, label: str = None):
+        label = label or f"{owner.__name__}.{attr}"
+        func = getattr(owner, attr)
+        # report tracked methods even if the game never calls them
+        self.calls[label] += 0
+        self.seconds[label] += 0.0
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.seconds[label] += time.perf_counter() - start
+                    self.calls[label] += 1
+
+        else:
+
+            @wraps(func)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.seconds[label] += time.perf_counter() - start
+                    self.calls[label] += 1
+
+        self._patched.append((owner, attr, owner.__dict__.get(attr)))
+        setattr(owner, attr, timed)
+        return self
+
+    def stub(self, owner: type, attr: str, replacement):
+        self._patched.append((owner, attr, owner.__dict__.get(attr)))
+        setattr(owner, attr, replacement)
+        return self
+
+    def reset(self):
+        self.calls.clear()
+        self.seconds.clear()
+
+    def snapshot(self) -> dict:
+        return {
+            label: {
+                "calls": self.calls[label],
+                "total_ms": self.seconds[label] * 1000,
+                "mean_us": self.seconds[label] / self.calls[label] * 1e6 if self.calls[label] else 0.0,
+            }
+            for label in sorted(self.seconds)
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for owner, attr, original in reversed(self._patched):
+            if original is None:
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, original)
+        self._patched.clear()
+
+
+def offline_context(
+    seed: int = 0, llm_latency: float = 0.0, offline_embedder: bool = True, context: Context = None
+) -> Context:
+    """Context answering with the mock LLM, and embedding by hashing unless offline_embedder is False"""
+    ctx = context or Context()
+    llm_config = LLMConfig(api_type="mock", api_key="mock", mock_seed=seed, mock_latency_mean=llm_latency)
+    ctx.config = ctx.config.model_copy(update={"llm": llm_config})
+    if offline_embedder:
+        ctx.embedder = HashingEmbedder()
+    return ctx
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0}
+    return {
+        "mean": float(np.mean(values)),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+    }
+
+
+async def bench_game(
+    ctx: Context, n_players: int, n_round: int, trace_memory: bool = False, **scheduling
+) -> dict:
+    """Play one game, timing every env tick (one moderator step each) and counting published messages"""
+    timers = HotPathTimers()
+    step_seconds: list[float] = []
+    n_messages = 0
+    game = {}
+
+    def moderator_of(env):
+        return next(role for role in env.roles.values() if isinstance(role, Moderator))
+
+    def count_messages(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal n_messages
+            n_messages += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    def time_ticks(func):
+        @wraps(func)
+        async def wrapper(env, *args, **kwargs):
+            moderator = moderator_of(env)
+            if moderator.winner is not None:
+                # the game is over, Team.run is only idling through its remaining ticks
+                return await func(env, *args, **kwargs)
+            start = time.perf_counter()
+            rsp = await func(env, *args, **kwargs)
+            step_seconds.append(time.perf_counter() - start)
+            if moderator.winner is not None:
+                game["finished_after"] = time.perf_counter() - game["start"]
+            return rsp
+
+        return wrapper
+
+    with timers:
+        timers.track(Memory, "add").track(Memory, "find_news")
+        timers.track(BasePlayer, "get_all_memories")
+        timers.track(type(ctx.embedder), "embed", "embedder.embed")
+        timers.track(RLPolicy, "forward", "policy.forward")
+        # the experience store embeds through the remote API, it is not part of the engine
+        timers.stub(BasePlayer, "record_experiences", lambda self, *args, **kwargs: None)
+        timers.stub(Environment, "publish_message", count_messages(Environment.publish_message))
+        timers.stub(WerewolfEnv, "run", time_ticks(WerewolfEnv.run))
+
+        if trace_memory:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+        game["start"] = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = await run_one_game_async(
+                context=ctx,
+                train=False,
+                n_round=n_round,
+                shuffle=True,
+                add_human=False,
+                use_reflection=True,
+                use_experience=False,
+                role_classes=PLAYER_CONFIGS[n_players],
+                **scheduling,
+            )
+        wall = time.perf_counter() - game["start"]
+        if trace_memory:
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    moderator = result["players"][0]
+    game_seconds = game.get("finished_after", wall)
+    report = {
+        "players": n_players,
+        "winner": moderator.winner,
+        "moderator_steps": len(step_seconds),
+        "role_steps": moderator.rc.env.role_steps,
+        "game_seconds": game_seconds,
+        "wall_seconds": wall,
+        "step_ms": {k: v * 1000 for k, v in _percentiles(step_seconds).items()},
+        "messages": n_messages,
+        "messages_per_second": n_messages / game_seconds if game_seconds else 0.0,
+        "hot_path": timers.snapshot(),
+    }
+    if trace_memory:
+        report["memory_growth_mb"] = growth / 2**20
+        report["memory_peak_mb"] = peak / 2**20
+    return report
+
+
+def _aggregate(games: list[dict], memory_game: dict) -> dict:
+    hot_path = defaultdict(lambda: {"calls": 0, "total_ms": 0.0})
+    for game in games:
+        for label, stat in game["hot_path"].items():
+            hot_path[label]["calls"] += stat["calls"]
+            hot_path[label]["total_ms"] += stat["total_ms"]
+    n = len(games)
+    return {
+        "games": n,
+        "finished_games": sum(g["winner"] is not None for g in games),
+        "moderator_steps": float(np.mean([g["moderator_steps"] for g in games])),
+        "role_steps": float(np.mean([g["role_steps"] for g in games])),
+        "game_seconds": float(np.mean([g["game_seconds"] for g in games])),
+        "wall_seconds": float(np.mean([g["wall_seconds"] for g in games])),
+        "step_ms_mean": float(np.mean([g["step_ms"]["mean"] for g in games])),
+        "step_ms_p95": float(np.mean([g["step_ms"]["p95"] for g in games])),
+        "messages_per_second": float(np.mean([g["messages_per_second"] for g in games])),
+        "memory_growth_mb": memory_game["memory_growth_mb"],
+        "memory_peak_mb": memory_game["memory_peak_mb"],
+        "hot_path": {
+            label: {
+                "calls_per_game": stat["calls"] / n,
+                "ms_per_game": stat["total_ms"] / n,
+                "mean_us": stat["total_ms"] * 1000 / stat["calls"] if stat["calls"] else 0.0,
+            }
+            for label, stat in sorted(hot_path.items())
+        },
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+async def run_suite_async(
+    players=(7, 12, 20),
+    games: int = 3,
+    n_round: int = 20,
+    seed: int = 0,
+    llm_latency: float = 0.0,
+    offline_embedder: bool = True,
+    event_driven: bool = False,
+    concurrent_roles: bool = False,
+    until_terminal: bool = False,
+) -> dict:
+    seed_everything(seed)
+    scheduling = dict(event_driven=event_driven, concurrent_roles=concurrent_roles, until_terminal=until_terminal)
+    ctx = offline_context(seed=seed, llm_latency=llm_latency, offline_embedder=offline_embedder)
+    results = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "settings": {
+            "games": games,
+            "n_round": n_round,
+            "seed": seed,
+            "llm_latency": llm_latency,
+            "offline_embedder": offline_embedder,
+            **scheduling,
+        },
+        "configs": {},
+    }
+    for n_players in players:
+        timed = [await bench_game(ctx, n_players, n_round, **scheduling) for _ in range(games)]
+        # tracemalloc slows everything down, memory is measured on a separate game
+        memory_game = await bench_game(ctx, n_players, n_round, trace_memory=True, **scheduling)
+        results["configs"][str(n_players)] = _aggregate(timed, memory_game)
+    return results
+
+
+def run(
+    players="7,12,20",
+    games: int = 3,
+    n_round: int = 20,
+    seed: int = 0,
+    llm_latency: float = 0.0,
+    offline_embedder: bool = True,
+    event_driven: bool = False,
+    concurrent_roles: bool = False,
+    until_terminal: bool = False,
+    output=None,
+):
+    """
+    Benchmark the engine and write the results as JSON (default: workspace/benchmarks/engine_<commit>.json).
+    offline_embedder: embed by hashing; pass --nooffline_embedder to time the real SentenceTransformer
+    event_driven, concurrent_roles: WerewolfEnv scheduling
+    until_terminal: end each game when its result is announced instead of after n_round * 25 ticks
+    """
+    import asyncio
+
+    define_log_level(print_level="WARNING", logfile_level="WARNING", name="benchmark")
+    if isinstance(players, int):
+        players = (players,)
+    elif isinstance(players, str):
+        players = tuple(int(p) for p in players.split(","))
+
+    results = asyncio.run(
+        run_suite_async(
+            players, games, n_round, seed, llm_latency, offline_embedder, event_driven, concurrent_roles, until_terminal
+        )
+    )
+
+    output = Path(output) if output else RESULTS_DIR / f"engine_{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(results["configs"], indent=2))
+    print(f"results written to {output}")
+
+
+def _flatten(d: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in d.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, candidate, threshold: float = 0.05):
+    """Print every metric whose relative change between two result files exceeds `threshold`"""
+    old = _flatten(json.loads(Path(baseline).read_text())["configs"])
+    new = _flatten(json.loads(Path(candidate).read_text())["configs"])
+    rows = []
+    for name in sorted(old.keys() & new.keys()):
+        change = (new[name] - old[name]) / old[name] if old[name] else 0.0
+        if abs(change) >= threshold:
+            rows.append((name, old[name], new[name], change))
+    for name, before, after, change in rows:
+        print(f"{name:60s} {before:12.3f} -> {after:12.3f} ({change:+.1%})")
+    if not rows:
+        print(f"no metric changed by more than {threshold:.0%}")
+
+
+if __name__ == "__main__":
+    fire.Fire({"run": run, "compare": compare})
@@ -0,0 +1,102 @@
+"""
+History benchmark: time and peak memory of keeping the environment history for long games and for many
+games in parallel, with the string concatenation it replaced (`history += f"\n{message}"`, which copies
+the whole history on every message) against HistoryLog, unbounded and with a bounded tail streamed to a file.
+
+    cd werewolf_game
+    python -m benchmarks.history_benchmark --messages 2000,10000,50000 --games 16 --output history.json
+"""
+import json
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import fire
+
+from camelgym.environment.history_log import HistoryLog
+
+from benchmarks.engine_benchmark import RESULTS_DIR, _git_commit
+
+
+class StringHistory:
+    """The previous history: one str, extended in place"""
+
+    def __init__(self):
+        self.history = ""
+
+    def append(self, entry: str):
+        self.history += f"\n{entry}"
+
+    def text(self) -> str:
+        return self.history
+
+
+def make_entries(n: int, length: int = 300) -> list[str]:
+    filler = "I think we should look carefully at who spoke last night. " * (length // 58 + 1)
+    return [f"Player{i % 20}: message {i} {filler}"[:length] for i in range(n)]
+
+
+def measure(make_history, entries: list[str], games: int = 1) -> dict:
+    """Append every entry to `games` histories, interleaved as parallel games would, then read them once"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    histories = [make_history(g) for g in range(games)]
+    for entry in entries:
+        for history in histories:
+            history.append(entry)
+    append_seconds = time.perf_counter() - start
+    text_chars = sum(len(history.text()) for history in histories)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for history in histories:
+        if isinstance(history, HistoryLog):
+            history.close()
+    return {
+        "append_us_per_message": append_seconds / (len(entries) * games) * 1e6,
+        "peak_mb": peak / 2**20,
+        "text_chars": text_chars,
+    }
+
+
+def main(messages="2000,10000,50000", games: int = 16, length: int = 300, tail: int = 500, output=None):
+    if isinstance(messages, int):
+        messages = (messages,)
+    elif isinstance(messages, str):
+        messages = tuple(int(s) for s in messages.split(","))
+
+    configs = {}
+    with tempfile.TemporaryDirectory() as sink_dir:
+
+        def variants(key: str) -> dict:
+            return {
+                "string": lambda g: StringHistory(),
+                "log": lambda g: HistoryLog(),
+                "log_tail_sink": lambda g: HistoryLog(max_lines=tail, sink=Path(sink_dir) / f"{key}_{g}.txt"),
+            }
+
+        for n in messages:
+            entries = make_entries(n, length)
+            configs[f"long_{n}"] = {name: measure(make, entries) for name, make in variants(f"long_{n}").items()}
+            parallel = make_entries(max(n // games, 1), length)
+            configs[f"parallel_{games}x{len(parallel)}"] = {
+                name: measure(make, parallel, games) for name, make in variants(f"parallel_{n}").items()
+            }
+
+    results = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "length": length,
+        "tail": tail,
+        "configs": configs,
+    }
+    output = Path(output) if output else RESULTS_DIR / f"history_{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(configs, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,91 @@
+"""
+Memory benchmark: per-message cost of Memory.add and Memory.find_news as the memory grows, against the
+linear-scan implementation they replaced. With the key index both stay flat; the scan grows linearly.
+
+    cd werewolf_game
+    python -m benchmarks.memory_benchmark --sizes 1000,5000,10000,20000 --output memory.json
+"""
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import fire
+
+from camelgym.const import IGNORED_MESSAGE_ID
+from camelgym.memory.memory import Memory
+from camelgym.schema import Message
+
+from benchmarks.engine_benchmark import RESULTS_DIR, _git_commit
+
+
+class ScanMemory(Memory):
+    """The previous de-duplication: `in` over the storage, pydantic __eq__ field by field"""
+
+    def add(self, message: Message):
+        if self.ignore_id:
+            message.id = IGNORED_MESSAGE_ID
+        if message in self.storage:
+            return
+        self.storage.append(message)
+        if message.cause_by:
+            self.index[message.cause_by].append(message)
+
+    def find_news(self, observed: list[Message], k=0) -> list[Message]:
+        already_observed = self.get(k)
+        return [i for i in observed if i not in already_observed]
+
+
+def make_messages(n: int, offset: int = 0) -> list[Message]:
+    return [
+        Message(content=f"Player{i % 20} says message {i}", role=f"Player{i % 20}", sent_from=f"Player{i % 20}")
+        for i in range(offset, offset + n)
+    ]
+
+
+def measure(memory_class, size: int, probe: int, ignore_id: bool = False) -> dict:
+    """Fill a memory up to size, then time adding / finding news among `probe` more messages"""
+    memory = memory_class(ignore_id=ignore_id)
+    for message in make_messages(size):
+        Memory.add(memory, message)  # filling is not measured, use the indexed add for both
+
+    probe_messages = make_messages(probe, offset=size)
+    start = time.perf_counter()
+    memory.find_news(probe_messages)
+    find_news_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for message in probe_messages:
+        memory.add(message)
+    add_seconds = time.perf_counter() - start
+    return {"add_us_per_message": add_seconds / probe * 1e6, "find_news_us_per_message": find_news_seconds / probe * 1e6}
+
+
+def main(sizes="1000,5000,10000,20000", probe: int = 200, ignore_id: bool = False, scan: bool = True, output=None):
+    if isinstance(sizes, int):
+        sizes = (sizes,)
+    elif isinstance(sizes, str):
+        sizes = tuple(int(s) for s in sizes.split(","))
+
+    configs = {}
+    for size in sizes:
+        configs[str(size)] = {"indexed": measure(Memory, size, probe, ignore_id)}
+        if scan:
+            configs[str(size)]["scan"] = measure(ScanMemory, size, probe, ignore_id)
+
+    results = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "probe": probe,
+        "ignore_id": ignore_id,
+        "configs": configs,
+    }
+    output = Path(output) if output else RESULTS_DIR / f"memory_{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(configs, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,80 @@
+"""
+Message benchmark: messages/sec for the shapes the game builds all the time (moderator instructions, parse
+results, player responses), through the validated constructor, through Message.trusted, and for the
+timestamp prefix WerewolfEnv.pub_mes assigns to every published message's content.
+
+    cd werewolf_game
+    python -m benchmarks.message_benchmark --n 50000 --output message.json
+"""
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import fire
+
+from camelgym.const import MESSAGE_ROUTE_TO_ALL
+from camelgym.schema import Message
+
+from actions import InstructSpeak, Speak
+from actions.moderator_actions import ParseSpeak
+from benchmarks.engine_benchmark import RESULTS_DIR, _git_commit
+
+SHAPES = [
+    dict(
+        content="Werewolves, please open your eyes!",
+        role="Moderator",
+        sent_from="Moderator",
+        cause_by=InstructSpeak,
+        send_to=["Werewolf", "yes"],
+    ),
+    dict(content="Player3 was killed last night!", role="Moderator", sent_from="Moderator", cause_by=ParseSpeak),
+    dict(
+        content="I am a villager and I think Player5 is lying.",
+        role="Villager",
+        sent_from="Player2",
+        cause_by=Speak,
+        send_to=MESSAGE_ROUTE_TO_ALL,
+    ),
+]
+
+
+def rate(build, n: int) -> float:
+    shapes = [SHAPES[i % len(SHAPES)] for i in range(n)]
+    start = time.perf_counter()
+    for shape in shapes:
+        build(**shape)
+    return n / (time.perf_counter() - start)
+
+
+def assign_rate(n: int) -> float:
+    messages = [Message(**SHAPES[i % len(SHAPES)]) for i in range(n)]
+    start = time.perf_counter()
+    for message in messages:
+        message.content = "Day 1 | " + message.content
+    return n / (time.perf_counter() - start)
+
+
+def main(n: int = 50000, trusted: bool = True, output=None):
+    configs = {"validated_per_sec": rate(Message, n), "content_assign_per_sec": assign_rate(n)}
+    if trusted:
+        configs["trusted_per_sec"] = rate(Message.trusted, n)
+        for shape in SHAPES:  # same JSON either way, ids aside
+            validated, fast = Message(**shape).model_dump(exclude={"id"}), Message.trusted(**shape)
+            assert Message.load(fast.dump()).model_dump(exclude={"id"}) == validated
+
+    results = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "n": n,
+        "configs": configs,
+    }
+    output = Path(output) if output else RESULTS_DIR / f"message_{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(configs, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
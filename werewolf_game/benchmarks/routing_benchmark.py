@@ -0,0 +1,105 @@
+"""
+Routing benchmark: per-message cost of Environment.publish_message as the number of roles grows, with the
+address index against the scan it replaced (is_send_to over every member's addresses). Recipients are bare
+inboxes, so only routing and delivery are measured.
+
+    cd werewolf_game
+    python -m benchmarks.routing_benchmark --roles 7,20,100 --messages 5000 --output routing.json
+"""
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import fire
+
+from camelgym.const import MESSAGE_ROUTE_TO_ALL
+from camelgym.environment.base_env import Environment
+from camelgym.logs import logger
+from camelgym.schema import Message
+from camelgym.utils.common import is_send_to
+
+from benchmarks.engine_benchmark import RESULTS_DIR, _git_commit
+
+
+class ScanEnvironment(Environment):
+    """The previous routing: every member's addresses checked against every message"""
+
+    def publish_message(self, message: Message, peekable: bool = True) -> bool:
+        found = False
+        for role, addrs in self.member_addrs.items():
+            if is_send_to(message, addrs):
+                role.put_message(message)
+                self._woken.add(role)
+                found = True
+        if not found:
+            logger.warning(f"Message no recipients: {message.dump()}")
+        self.history_log.append(str(message))
+        return True
+
+
+class Inbox:
+    def __init__(self):
+        self.received = 0
+
+    def put_message(self, message: Message):
+        self.received += 1
+
+
+def make_messages(n: int, n_roles: int, broadcast_every: int = 4) -> list[Message]:
+    """Moderator traffic: one broadcast in `broadcast_every`, the rest to one player or to the moderator"""
+    messages = []
+    for i in range(n):
+        if i % broadcast_every == 0:
+            send_to = {MESSAGE_ROUTE_TO_ALL}
+        elif i % 2:
+            send_to = {f"Player{i % n_roles}"}
+        else:
+            send_to = {"Moderator"}
+        messages.append(Message(content=f"message {i}", sent_from="Moderator", send_to=send_to))
+    return messages
+
+
+def measure(env_class, n_roles: int, messages: list[Message]) -> dict:
+    env = env_class()
+    inboxes = [Inbox() for _ in range(n_roles)]
+    env.set_addresses(inboxes[0], {"Moderator", "camelgym.roles.role.Role"})
+    for i, inbox in enumerate(inboxes[1:], start=1):
+        env.set_addresses(inbox, {f"Player{i}", "Villager", "camelgym.roles.role.Role"})
+
+    start = time.perf_counter()
+    for message in messages:
+        env.publish_message(message)
+    seconds = time.perf_counter() - start
+    return {"us_per_message": seconds / len(messages) * 1e6, "delivered": sum(i.received for i in inboxes)}
+
+
+def main(roles="7,20,100", messages: int = 5000, scan: bool = True, output=None):
+    if isinstance(roles, int):
+        roles = (roles,)
+    elif isinstance(roles, str):
+        roles = tuple(int(s) for s in roles.split(","))
+
+    logger.remove()  # the debug dump of every message would dominate
+    configs = {}
+    for n_roles in roles:
+        batch = make_messages(messages, n_roles)
+        configs[str(n_roles)] = {"indexed": measure(Environment, n_roles, batch)}
+        if scan:
+            configs[str(n_roles)]["scan"] = measure(ScanEnvironment, n_roles, batch)
+
+    results = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "messages": messages,
+        "configs": configs,
+    }
+    output = Path(output) if output else RESULTS_DIR / f"routing_{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(configs, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
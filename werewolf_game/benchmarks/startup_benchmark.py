@@ -0,0 +1,112 @@
+"""
+Startup benchmark: how long it takes to import the framework, construct a Context and set up a game
+(WerewolfEnv, players, Team) before the first move, and to load the shared embedder on first use.
+
+    cd werewolf_game
+    python -m benchmarks.startup_benchmark --output startup.json
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import fire
+import numpy as np
+
+from camelgym.context import Context
+from camelgym.environment.werewolf_env.werewolf_env import WerewolfEnv
+from camelgym.logs import define_log_level
+from camelgym.team import Team
+
+from benchmarks.engine_benchmark import PLAYER_CONFIGS, RESULTS_DIR, _git_commit
+from roles import Moderator
+from start_game import init_game_setup
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import camelgym.context; print(time.perf_counter() - t)"
+
+
+def time_import() -> float:
+    """Import time of camelgym.context in a fresh interpreter"""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+    out = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SNIPPET], text=True, stderr=subprocess.DEVNULL, env=env
+    )
+    return float(out.strip().splitlines()[-1])
+
+
+def time_context(repeat: int) -> list[float]:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Context()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def time_game_setup(n_players: int, repeat: int) -> list[float]:
+    """Everything a game start does before Team.run: env, players, addresses, team"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        env = WerewolfEnv(desc="werewolf game")
+        _, players = init_game_setup(role_classes=PLAYER_CONFIGS[n_players])
+        players = [Moderator()] + players
+        env.add_roles(players)
+        for p in players:
+            env.set_addresses(p, p.addresses)
+        Team(investment=3.0, env=env, roles=players, context=env.context)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def time_first_embed() -> dict:
+    """Loading the process-wide embedder happens once, on the first embed call"""
+    ctx = Context()
+    start = time.perf_counter()
+    try:
+        ctx.embedder.embed(["warm up"])
+    except Exception as e:
+        return {"error": str(e).splitlines()[0]}
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    Context().embedder.embed(["warm up"])
+    return {"first_embed_seconds": first, "second_context_embed_seconds": time.perf_counter() - start}
+
+
+def main(repeat: int = 20, players="7,12,20", embedder: bool = True, output=None):
+    define_log_level(print_level="WARNING", logfile_level="WARNING", name="benchmark")
+    if isinstance(players, int):
+        players = (players,)
+    elif isinstance(players, str):
+        players = tuple(int(p) for p in players.split(","))
+
+    context_seconds = time_context(repeat)
+    results = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "configs": {
+            "import_seconds": time_import(),
+            "context_us": {
+                "mean": float(np.mean(context_seconds)) * 1e6,
+                "p95": float(np.percentile(context_seconds, 95)) * 1e6,
+            },
+            "game_setup_ms": {
+                str(n): float(np.mean(time_game_setup(n, max(repeat // 4, 1)))) * 1000 for n in players
+            },
+        },
+    }
+    if embedder:
+        results["configs"]["embedder"] = time_first_embed()
+
+    output = Path(output) if output else RESULTS_DIR / f"startup_{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(results["configs"], indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
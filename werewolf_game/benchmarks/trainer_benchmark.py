@@ -0,0 +1,82 @@
+"""
+Trainer benchmark: RLTrainer.train (one forward pass per decision) against RLTrainer.train_batched
+(one forward pass per minibatch) on synthetic trajectories with a variable number of candidates.
+
+    cd werewolf_game
+    python -m benchmarks.trainer_benchmark --decisions 500,2000,8000 --output trainer.json
+"""
+import copy
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import fire
+import numpy as np
+import torch
+
+from camelgym.rl.policy import RLPolicy
+from camelgym.rl.trainer import RLTrainer
+
+from benchmarks.engine_benchmark import RESULTS_DIR, _git_commit
+
+
+def make_trajectories(n: int, k_min: int = 2, k_max: int = 5, dim: int = 384, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    return [
+        (rng.standard_normal((k, dim)).astype(np.float32).tolist(), int(rng.integers(k)), float(rng.choice([-1, 1])))
+        for k in rng.integers(k_min, k_max + 1, size=n)
+    ]
+
+
+def time_call(fn, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations))
+
+
+def main(decisions="500,2000,8000", minibatch_size=None, repeat: int = 3, seed: int = 0, output=None):
+    if isinstance(decisions, int):
+        decisions = (decisions,)
+    elif isinstance(decisions, str):
+        decisions = tuple(int(d) for d in decisions.split(","))
+
+    torch.manual_seed(seed)
+    policy = RLPolicy()
+    configs = {}
+    for n in decisions:
+        trajectories = make_trajectories(n, seed=seed)
+        loop_trainer = RLTrainer(copy.deepcopy(policy))
+        batched_trainer = RLTrainer(copy.deepcopy(policy))
+
+        loop_seconds = time_call(lambda: loop_trainer.train(trajectories), repeat)
+        batched_seconds = time_call(
+            lambda: batched_trainer.train_batched(trajectories, minibatch_size=minibatch_size), repeat
+        )
+        configs[str(n)] = {
+            "loop_seconds": loop_seconds,
+            "batched_seconds": batched_seconds,
+            "speedup": loop_seconds / batched_seconds if batched_seconds else 0.0,
+            "loop_decisions_per_second": n / loop_seconds,
+            "batched_decisions_per_second": n / batched_seconds,
+        }
+
+    results = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "minibatch_size": minibatch_size,
+        "torch_threads": torch.get_num_threads(),
+        "configs": configs,
+    }
+    output = Path(output) if output else RESULTS_DIR / f"trainer_{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(configs, indent=2))
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
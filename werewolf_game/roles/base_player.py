@@ -2,6 +2,9 @@ import re
 import sys
 sys.path.append("..")
 
+from pydantic import PrivateAttr
+
+from camelgym.memory import IncrementalTranscript
 from camelgym.roles import Role
 from camelgym.schema import Message
 from camelgym.logs import logger
@@ -9,9 +12,24 @@ from actions import ACTIONS, InstructSpeak, Speak, Reflect, NighttimeWhispers
 from actions.experience_operation import AddNewExperiences, RetrieveExperiences
 from schema import RoleExperience
 from camelgym.const import MESSAGE_ROUTE_TO_ALL
+from .day_summary import DaySummaryView
+from .memory_selection import MemorySelector
+
+
+STEP_NUMBER_PATTERN = re.compile(r"[0-9]+ \| ")
+
+
+def render_player_line(m: Message) -> str:
+    return f"{m.sent_from}: {STEP_NUMBER_PATTERN.sub('', m.content)}"
 
 
 class BasePlayer(Role):
+    _transcript: IncrementalTranscript = PrivateAttr(default_factory=lambda: IncrementalTranscript(render_player_line))
+    # high-water mark of the information in memory: (messages scanned, informative messages among them)
+    _information: tuple = PrivateAttr(default=(0, 0))
+    # (information mark, steps reused, reflection) of the last Reflect call
+    _last_reflection: tuple = PrivateAttr(default=None)
+
     def __init__(
         self,
         name="PlayerXYZ",
@@ -20,7 +38,15 @@ class BasePlayer(Role):
         use_reflection=True,
         use_experience=False,
         use_memory_selection=False,
+        use_day_summaries=False,
         new_experience_version="",
+        memory_token_budget=1500,
+        memory_recent_steps=3,
+        reuse_reflection=True,
+        reflection_max_staleness=None,
+        concurrent_candidates=True,
+        max_candidate_concurrency=None,
+        use_n_candidates=False,
         **kwargs,
     ):
         super().__init__(name=name, profile=profile, **kwargs)
@@ -37,6 +63,25 @@ class BasePlayer(Role):
         self.use_experience = use_reflection and use_experience
         self.new_experience_version = new_experience_version
         self.use_memory_selection = use_memory_selection
+        # history shown in prompts: everything, or a token-budgeted selection of it
+        self.memory_selector = (
+            MemorySelector(render_player_line, token_budget=memory_token_budget, recent_steps=memory_recent_steps)
+            if use_memory_selection
+            else None
+        )
+        # or everything, with finished days replaced by the moderator's summaries of them
+        self.day_summary_view = DaySummaryView() if use_day_summaries else None
+
+        # reflect again only when something new happened, or after reflection_max_staleness reused steps
+        self.reuse_reflection = reuse_reflection
+        self.reflection_max_staleness = reflection_max_staleness
+        self.reflect_calls = 0
+        self.reflect_reused = 0
+
+        # generation of the candidate actions the policy picks from, see ActionNode.generate_candidates
+        self.concurrent_candidates = concurrent_candidates
+        self.max_candidate_concurrency = max_candidate_concurrency
+        self.use_n_candidates = use_n_candidates
 
         self.experiences: list[RoleExperience] = []
 
@@ -75,15 +120,15 @@ class BasePlayer(Role):
         todo = self.rc.todo
         logger.info(f"{self._setting}: ready to {todo}")
 
-        memories = self.get_all_memories()
+        if self.memory_selector:
+            memories = self.get_selected_memories()
+        elif self.day_summary_view:
+            memories = self.get_summarized_memories()
+        else:
+            memories = self.get_all_memories()
         latest_instruction = self.get_latest_instruction()
 
-        reflection = await Reflect().run(
-            profile=self.profile,
-            name=self.name,
-            context=memories,
-            latest_instruction=latest_instruction,
-        ) if self.use_reflection else ""
+        reflection = await self._reflect(memories, latest_instruction) if self.use_reflection else ""
 
         experiences = RetrieveExperiences().run(
             query=reflection,
@@ -104,14 +149,20 @@ class BasePlayer(Role):
         node.set_context(self.rc.env.context)     # RL context must exist
         node.set_llm(self.rc.env.context.llm())   # LLM always required
 
-        await node.simple_fill(memory=memory_block, K=3)
+        await node.simple_fill(
+            memory=memory_block,
+            K=3,
+            concurrent=self.concurrent_candidates,
+            max_concurrency=self.max_candidate_concurrency,
+            use_n=self.use_n_candidates,
+        )
 
         rsp = node.content
         # ------------------------------------
 
         send_to = MESSAGE_ROUTE_TO_ALL if isinstance(todo, Speak) else "Moderator"
 
-        msg = Message(
+        msg = Message.trusted(
             content=rsp,
             role=self.profile,
             sent_from=self.name,
@@ -133,18 +184,55 @@ class BasePlayer(Role):
         logger.info(f"{self._setting}: {rsp}")
         return msg
 
+    def _information_mark(self) -> int:
+        """
+        Number of messages in memory that can change a reflection: everything other players and the moderator
+        said, except the moderator's requests for an action and its acknowledgements.
+        """
+        scanned, count = self._information
+        storage = self.rc.memory.storage
+        if len(storage) < scanned:
+            scanned, count = 0, 0
+        for m in storage[scanned:]:
+            count += m.sent_from != self.name and "yes" not in m.send_to and not m.content.endswith("Understood")
+        self._information = (len(storage), count)
+        return count
+
+    async def _reflect(self, memories: str, latest_instruction: str) -> str:
+        mark = self._information_mark()
+        if self.reuse_reflection and self._last_reflection is not None:
+            last_mark, reused, reflection = self._last_reflection
+            if last_mark == mark and (self.reflection_max_staleness is None or reused < self.reflection_max_staleness):
+                self._last_reflection = (mark, reused + 1, reflection)
+                self.reflect_reused += 1
+                return reflection
+
+        reflection = await Reflect(context=self.context).run(
+            profile=self.profile,
+            name=self.name,
+            context=memories,
+            latest_instruction=latest_instruction,
+        )
+        self.reflect_calls += 1
+        self._last_reflection = (mark, 0, reflection)
+        return reflection
+
     # -----------------------------------------------------------
     def get_all_memories(self) -> str:
-        memories = self.rc.memory.get()
+        return self._transcript.sync(self.rc.memory).text
 
-        cleaned = []
-        pattern = r"[0-9]+ \| "
+    def get_selected_memories(self) -> str:
+        """Recent steps verbatim, key facts, and as much older history as the token budget allows"""
+        return self.memory_selector.select(self.rc.memory.get())
 
-        for m in memories:
-            clean_msg = re.sub(pattern, "", m.content)
-            cleaned.append(f"{m.sent_from}: {clean_msg}")
+    def get_summarized_memories(self) -> str:
+        """Summaries of finished days, then the current day verbatim"""
+        lines = self._transcript.sync(self.rc.memory).lines
+        return self.day_summary_view.compose(self.rc.memory.get(), lines, self.rc.env.day_summaries)
 
-        return "\n".join(cleaned)
+    def get_recent_memories(self, max_lines: int = 50, max_chars: int = 0) -> str:
+        """Bounded tail of the transcript"""
+        return self._transcript.sync(self.rc.memory).tail(max_lines, max_chars)
 
 
     def get_latest_instruction(self) -> str:
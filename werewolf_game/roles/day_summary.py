@@ -0,0 +1,69 @@
+from camelgym.const import MESSAGE_ROUTE_TO_ALL
+from camelgym.schema import Message
+
+# the moderator's first instruction of every night, it opens a new day in the transcript
+NIGHT_START = "It’s dark, everyone close your eyes"
+
+
+class DaySummaryView:
+    """
+    A player's history with each finished day replaced by the moderator's summary of it
+    (env.day_summaries, keyed by day index, 0 = the first night and day):
+      - what was said to everyone that day is replaced by the summary
+      - what only this player saw (night instructions, its own night actions, seer results) stays verbatim
+      - the current day, and any day whose summary is not ready yet, is shown verbatim
+    The block of a summarized day is built once and reused by every later prompt.
+    """
+
+    def __init__(self):
+        self._day_starts: list[int] = []
+        self._scanned = 0
+        self._blocks: dict[int, str] = {}
+
+        self.compositions = 0
+        self.full_chars = 0
+        self.shown_chars = 0
+
+    def _scan(self, lines: list[str]):
+        if len(lines) < self._scanned:  # memory was cut, start over
+            self._day_starts, self._scanned, self._blocks = [], 0, {}
+        for i in range(self._scanned, len(lines)):
+            if NIGHT_START in lines[i]:
+                self._day_starts.append(i)
+        self._scanned = len(lines)
+
+    def _block(self, day: int, summary: str, messages: list[Message], lines: list[str]) -> str:
+        block = self._blocks.get(day)
+        if block is None:
+            private = [line for m, line in zip(messages, lines) if MESSAGE_ROUTE_TO_ALL not in m.send_to]
+            block = "\n".join([f"[Day {day + 1} summary] {summary}"] + private)
+            self._blocks[day] = block
+        return block
+
+    def compose(self, messages: list[Message], lines: list[str], summaries: dict[int, str]) -> str:
+        """messages and their rendered lines, in the same order"""
+        self._scan(lines)
+        starts = self._day_starts
+        parts = lines[: starts[0]] if starts else list(lines)
+        for day, start in enumerate(starts):
+            end = starts[day + 1] if day + 1 < len(starts) else len(lines)
+            if day + 1 < len(starts) and day in summaries:
+                parts.append(self._block(day, summaries[day], messages[start:end], lines[start:end]))
+            else:
+                parts.extend(lines[start:end])
+        text = "\n".join(parts)
+
+        self.compositions += 1
+        self.full_chars += sum(len(line) + 1 for line in lines)
+        self.shown_chars += len(text) + 1
+        return text
+
+    def stats(self) -> dict:
+        saved = self.full_chars - self.shown_chars
+        return {
+            "compositions": self.compositions,
+            "days_summarized": len(self._blocks),
+            "full_chars": self.full_chars,
+            "shown_chars": self.shown_chars,
+            "saved_ratio": saved / self.full_chars if self.full_chars else 0.0,
+        }
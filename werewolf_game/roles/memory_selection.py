@@ -0,0 +1,125 @@
+import re
+from typing import Callable, NamedTuple, Optional
+
+from camelgym.schema import Message
+from camelgym.utils.token_counter import count_text_tokens
+
+# facts that stay in the prompt for the whole game, whatever the budget
+DEATH_PATTERN = re.compile(r"was killed last night|was eliminated")
+CHECK_PATTERN = re.compile(r"Player[0-9]+ is a (werewolf|good guy)")
+VOTE_PATTERN = re.compile(r"I vote to eliminate Player[0-9]+")
+CLAIM_PATTERN = re.compile(r"\bI am (?:the |a )?(?:Seer|Witch|Guard|Villager|Werewolf)\b[^.!?]*[.!?]?", re.I)
+NIGHT_ACTIONS = ("Hunt", "Protect", "Verify", "Save", "Poison")
+# moderator acknowledgements, never worth budget
+FILLER_SUFFIX = ": Understood"
+
+
+class _Entry(NamedTuple):
+    line: str  # the message as rendered in the full transcript
+    tokens: int
+    fact: Optional[str]  # compact form of the facts it carries, None if it carries none
+    fact_tokens: int
+    step_start: bool  # a moderator instruction, i.e. the start of a game step
+
+
+class MemorySelector:
+    """
+    Fits a player's history into a token budget:
+      1. the last `recent_steps` moderator steps are kept verbatim
+      2. from older messages, structured facts (game setup, deaths, seer checks, votes, role claims,
+         the player's own night actions) are always kept, reduced to the sentence carrying them
+      3. the rest of the budget is filled with the newest remaining older messages
+    Messages are analysed once, so a selection costs a pass over cached entries.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[Message], str],
+        token_budget: int = 1500,
+        recent_steps: int = 3,
+        model: str = "gpt-3.5-turbo",
+    ):
+        self.render = render
+        self.token_budget = token_budget
+        self.recent_steps = recent_steps
+        self.model = model
+        self._entries: dict[str, _Entry] = {}
+
+        self.selections = 0
+        self.full_tokens = 0
+        self.selected_tokens = 0
+
+    def _entry(self, message: Message) -> _Entry:
+        entry = self._entries.get(message.id)
+        if entry is None:
+            line = self.render(message)
+            fact = self._fact(message, line)
+            entry = _Entry(
+                line=line,
+                tokens=count_text_tokens(line, self.model),
+                fact=fact,
+                fact_tokens=count_text_tokens(fact, self.model) if fact else 0,
+                step_start=message.sent_from == "Moderator" and message.cause_by.endswith("InstructSpeak"),
+            )
+            self._entries[message.id] = entry
+        return entry
+
+    @staticmethod
+    def _fact(message: Message, line: str) -> Optional[str]:
+        content = message.content
+        if message.role == "User" or DEATH_PATTERN.search(content) or CHECK_PATTERN.search(content):
+            return line
+        if message.cause_by.split(".")[-1] in NIGHT_ACTIONS:
+            return line
+        facts = [m.group(0) for m in VOTE_PATTERN.finditer(content)]
+        facts += [m.group(0).strip() for m in CLAIM_PATTERN.finditer(content)]
+        if facts:
+            return f"{message.sent_from}: {' '.join(facts)}"
+        return None
+
+    def select(self, messages: list[Message]) -> str:
+        entries = [self._entry(m) for m in messages]
+
+        # 1. recent steps, verbatim
+        start, steps = len(entries), 0
+        while start > 0 and steps < self.recent_steps:
+            start -= 1
+            steps += entries[start].step_start
+        recent = entries[start:]
+        older = entries[:start]
+
+        # 2. facts of older messages, always kept
+        chosen: dict[int, str] = {i: e.fact for i, e in enumerate(older) if e.fact}
+        used = sum(e.tokens for e in recent) + sum(e.fact_tokens for e in older if e.fact)
+
+        # 3. the newest remaining messages that fit the budget (a fact is upgraded to its full line)
+        for i in range(len(older) - 1, -1, -1):
+            entry = older[i]
+            if entry.line.endswith(FILLER_SUFFIX):
+                continue
+            extra = entry.tokens - entry.fact_tokens
+            if used + extra > self.token_budget:
+                break
+            chosen[i] = entry.line
+            used += extra
+
+        lines = [chosen[i] for i in sorted(chosen)]
+        omitted = len(older) - len(chosen)
+        if omitted:
+            lines.insert(0, f"({omitted} earlier messages omitted, key facts kept)")
+        lines += [e.line for e in recent]
+
+        self.selections += 1
+        self.full_tokens += sum(e.tokens for e in entries)
+        self.selected_tokens += used
+        return "\n".join(lines)
+
+    def stats(self) -> dict:
+        saved = self.full_tokens - self.selected_tokens
+        return {
+            "selections": self.selections,
+            "full_tokens": self.full_tokens,
+            "selected_tokens": self.selected_tokens,
+            "saved_tokens": saved,
+            "saved_ratio": saved / self.full_tokens if self.full_tokens else 0.0,
+        }
@@ -1,11 +1,16 @@
+import asyncio
 import re
 from collections import Counter
 from datetime import datetime
 import sys
+from typing import ClassVar
 
 sys.path.append("..")
 
+from pydantic import PrivateAttr
+
 from camelgym.const import DEFAULT_WORKSPACE_ROOT, MESSAGE_ROUTE_TO_ALL
+from camelgym.memory import IncrementalTranscript
 from camelgym.roles import Role
 from camelgym.schema import Message
 from camelgym.logs import logger
@@ -13,20 +18,35 @@ from actions.moderator_actions import (
     InstructSpeak,
     ParseSpeak,
     AnnounceGameResult,
+    SummarizeDay,
     STEP_INSTRUCTIONS,
 )
 from actions import Hunt, Protect, Verify, Save, Poison
 from camelgym.actions import UserRequirement
+from .base_player import render_player_line
+from .day_summary import NIGHT_START
+from .memory_selection import DEATH_PATTERN, VOTE_PATTERN
 
 
 class Moderator(Role):
+    # steps the game on every tick, news or not (see _observe), event-driven envs never skip it
+    always_ready: ClassVar[bool] = True
+    _transcript: IncrementalTranscript = PrivateAttr(
+        default_factory=lambda: IncrementalTranscript(lambda m: f"{m.sent_from}({m.role}): {m.content}")
+    )
+    # day index -> summary being written in the background
+    _summary_tasks: dict = PrivateAttr(default_factory=dict)
+
     def __init__(
         self,
         name: str = "Moderator",
         profile: str = "Moderator",
+        summarize_days: bool = False,
         **kwargs,
     ):
         super().__init__(name=name, profile=profile, **kwargs)
+        # write a summary of every finished day to env.day_summaries, for players' later prompts
+        self.summarize_days = summarize_days
         self._watch([UserRequirement, InstructSpeak, ParseSpeak])
         self.set_actions([InstructSpeak, ParseSpeak, AnnounceGameResult])
         self.step_idx = 0
@@ -64,7 +84,7 @@ class Moderator(Role):
         ]
         if not len(self.rc.news):
             self.rc.news = [
-                Message(
+                Message.trusted(
                     content="all the players are waiting",
                     role=self.profile,
                     sent_from=self.name,
@@ -94,10 +114,10 @@ class Moderator(Role):
         if not player_names:
             return
         roles_in_env = self.rc.env.get_roles()
-        for role_setting, role in roles_in_env.items():
-            for player_name in player_names:
-                if player_name in role_setting:
-                    role.set_status(new_status=1)
+        for role in roles_in_env.values():
+            # exact match, "Player1" is a substring of "Player12(Villager)"
+            if role.name in player_names:
+                role.set_status(new_status=1)
 
     def _record_all_experiences(self):
         roles_in_env = self.rc.env.get_roles()
@@ -183,7 +203,7 @@ class Moderator(Role):
             if self.night_index == 0:
                 if self.player_hunted:
                     self.rc.env.pub_mes(
-                        Message(
+                        Message.trusted(
                             role=self.profile,
                             sent_from=self.name,
                             content=f"METRIC_WEREWOLF_KILL {self.player_hunted}",
@@ -194,7 +214,7 @@ class Moderator(Role):
 
                 if self.player_protected:
                     self.rc.env.pub_mes(
-                        Message(
+                        Message.trusted(
                             role=self.profile,
                             sent_from=self.name,
                             content=f"METRIC_GUARD_SAVE {self.player_protected}",
@@ -244,7 +264,7 @@ class Moderator(Role):
 
                 # METRIC: one vote log per player
                 self.rc.env.pub_mes(
-                    Message(
+                    Message.trusted(
                         role=self.profile,
                         sent_from=self.name,
                         content=f"METRIC_VOTE {voter_name} {target_name}",
@@ -267,6 +287,9 @@ class Moderator(Role):
                 ]
                 self.update_player_status(self.player_current_dead)
 
+            if self.summarize_days:
+                self._schedule_day_summary(memories, eliminated=self.player_current_dead if voted_all else [])
+
         # game's termination condition
         living_werewolf = [p for p in self.werewolf_players if p in self.living_players]
         living_villagers = [p for p in self.villager_players if p in self.living_players]
@@ -284,8 +307,60 @@ class Moderator(Role):
             )
 
         if self.winner is not None:
+            self.rc.env.winner = self.winner
             self._record_all_experiences()
 
+    def _schedule_day_summary(self, memories, eliminated: list[str]):
+        """
+        Summarize the day that just ended in the background: the summary is ready a few steps into the
+        night, long before anyone is asked to speak again. Each day is summarized once, for all players.
+        """
+        day = self.step_idx // len(STEP_INSTRUCTIONS)
+        if day in self.rc.env.day_summaries or day in self._summary_tasks:
+            return
+
+        start = len(memories)
+        while start > 0 and NIGHT_START not in memories[start - 1].content:
+            start -= 1
+        public = [
+            m
+            for m in memories[max(start - 1, 0) :]
+            if MESSAGE_ROUTE_TO_ALL in m.send_to and not m.content.endswith("Understood")
+        ]
+        transcript = "\n".join(render_player_line(m) for m in public)
+        facts = self._day_facts(public, eliminated)
+        self._summary_tasks[day] = asyncio.create_task(self._summarize_day(day, transcript, facts))
+
+    @staticmethod
+    def _day_facts(public, eliminated: list[str]) -> list[str]:
+        """The hard facts of a day (deaths, votes, who was eliminated), kept as they are whatever the summary makes of them"""
+        facts = []
+        for m in public:
+            if DEATH_PATTERN.search(m.content):
+                facts.append(render_player_line(m).split(": ", 1)[1])
+            vote = VOTE_PATTERN.search(m.content)
+            if vote:
+                facts.append(f"{m.sent_from}: {vote.group(0)}.")
+        facts.append(f"{', '.join(eliminated) or 'No one'} was eliminated.")
+        return facts
+
+    async def _summarize_day(self, day: int, transcript: str, facts: list[str]):
+        try:
+            summary = await SummarizeDay(context=self.context).run(day=day, transcript=transcript)
+        except Exception as e:
+            logger.warning(f"day {day + 1} summary failed, keeping its facts only: {e}")
+            summary = ""
+        self.rc.env.day_summaries[day] = " ".join(facts + [summary]).strip()
+        self._summary_tasks.pop(day, None)
+
+    async def cancel_day_summaries(self):
+        """Summaries still being written when the game ends are not needed any more"""
+        tasks = list(self._summary_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._summary_tasks.clear()
+
     def _record_game_history(self):
         if self.step_idx % len(STEP_INSTRUCTIONS) == 0 or self.winner is not None:
             logger.info("a night and day cycle completed, examine all history")
@@ -323,7 +398,7 @@ class Moderator(Role):
             msg_content, need_res, msg_to_send_to = await self._instruct_speak()
             if need_res == "yes":
                 msg_to_send_to = [msg_to_send_to, need_res]
-            msg = Message(
+            msg = Message.trusted(
                 content=msg_content,
                 role=self.profile,
                 sent_from=self.name,
@@ -333,7 +408,7 @@ class Moderator(Role):
 
         elif isinstance(todo, ParseSpeak):
             msg_content, msg_to_send_to = await self._parse_speak(memories)
-            msg = Message(
+            msg = Message.trusted(
                 content=msg_content,
                 role=self.profile,
                 sent_from=self.name,
@@ -345,7 +420,8 @@ class Moderator(Role):
             msg_content = await AnnounceGameResult().run(
                 winner=self.winner, win_reason=self.win_reason
             )
-            msg = Message(
+            self.rc.env.game_result = msg_content
+            msg = Message.trusted(
                 content=msg_content,
                 role=self.profile,
                 sent_from=self.name,
@@ -357,8 +433,6 @@ class Moderator(Role):
         return msg
 
     def get_all_memories(self, mode: str = "str"):
-        memories = self.rc.memory.get()
         if mode == "str":
-            memories = [f"{m.sent_from}({m.role}): {m.content}" for m in memories]
-            memories = "\n".join(memories)
-        return memories
+            return self._transcript.sync(self.rc.memory).text
+        return self.rc.memory.get()
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from camelgym.context import Context
+from camelgym.logs import logger
+from camelgym.provider.client_pool import get_client_pool
+
+from start_game import run_one_game_async
+
+
+def duration_stats(durations: list[float], wall_time: float) -> dict:
+    """Throughput and latency summary of a batch of finished games."""
+    if not durations:
+        return {"games": 0, "games_per_hour": 0.0, "p50_game_seconds": 0.0, "p95_game_seconds": 0.0}
+    return {
+        "games": len(durations),
+        "games_per_hour": len(durations) / wall_time * 3600 if wall_time > 0 else 0.0,
+        "p50_game_seconds": float(np.percentile(durations, 50)),
+        "p95_game_seconds": float(np.percentile(durations, 95)),
+    }
+
+
+class ConcurrentSelfPlayRunner:
+    """
+    Keeps up to `max_games_in_flight` self-play games running on one event loop.
+
+    Every game gets its own WerewolfEnv / Context (own buffer, memories and cost manager),
+    while all games share:
+      - the pooled LLM HTTP client (see camelgym.provider.client_pool), so connections are reused
+      - one global limit on in-flight LLM requests (`max_llm_concurrency`)
+      - the embedder, the policy and the RLTrainer that finished trajectories are fed into
+      - with `context.scoring_batch_size` > 0, one ScoringBatcher that embeds and scores the candidates
+        of concurrent ActionNodes together
+    """
+
+    def __init__(
+        self,
+        n_games: int = 50,
+        max_games_in_flight: int = 4,
+        max_llm_concurrency: int = 16,
+        context: Context = None,
+        on_game_end: Optional[Callable[[dict], None]] = None,
+        **game_kwargs,
+    ):
+        """on_game_end: called with each game's result once it is trained on, e.g. for periodic checkpoints"""
+        self.n_games = n_games
+        self.max_games_in_flight = max_games_in_flight
+        self.max_llm_concurrency = max_llm_concurrency
+        self.on_game_end = on_game_end
+        self.game_kwargs = game_kwargs
+
+        # the template context owns the shared RL modules and config
+        self.context = context or Context()
+        self.trainer = self.context.trainer
+
+        self.results: list[dict] = []
+        self.durations: list[float] = []
+        self.losses: list[float] = []
+        self.wall_time: float = 0.0
+        self.scoring_batcher = None
+
+    def _new_game_context(self, llm_limiter) -> Context:
+        ctx = Context(config=self.context.config)
+        ctx.embedder = self.context.embedder
+        ctx.policy = self.context.policy
+        ctx.trainer = self.context.trainer
+        ctx.llm_limiter = llm_limiter
+        ctx.scoring_batch_size = self.context.scoring_batch_size
+        ctx.scoring_max_wait_ms = self.context.scoring_max_wait_ms
+        ctx.cache_friendly_prompts = self.context.cache_friendly_prompts
+        return ctx
+
+    async def _play(self, game_id: int, slots: asyncio.Semaphore, llm_limiter):
+        async with slots:
+            ctx = self._new_game_context(llm_limiter)
+            start = time.perf_counter()
+            result = await run_one_game_async(context=ctx, train=False, **self.game_kwargs)
+            duration = time.perf_counter() - start
+
+        # training is synchronous, so finished games are fed to the shared trainer one at a time
+        loss = None
+        if self.trainer is not None and result["trajectories"]:
+            loss = self.trainer.train_batched(result["trajectories"])
+            self.losses.append(loss)
+        result["loss"] = loss
+        result["game_id"] = game_id
+        result["duration"] = duration
+
+        self.results.append(result)
+        self.durations.append(duration)
+        logger.info(f"[SelfPlay] game {game_id} finished in {duration:.1f}s, winner: {result['winner']}, loss: {loss}")
+        if self.on_game_end is not None:
+            self.on_game_end(result)
+        return result
+
+    async def run(self) -> list[dict]:
+        """Play all games and return their results in completion order."""
+        slots = asyncio.Semaphore(self.max_games_in_flight)
+        llm_limiter = asyncio.Semaphore(self.max_llm_concurrency)
+        self.scoring_batcher = self.context.scoring_batcher
+
+        start = time.perf_counter()
+        await asyncio.gather(*[self._play(game_id, slots, llm_limiter) for game_id in range(1, self.n_games + 1)])
+        self.wall_time = time.perf_counter() - start
+
+        logger.info(f"[SelfPlay] {self.report()}")
+        return self.results
+
+    def report(self) -> dict:
+        report = duration_stats(self.durations, self.wall_time)
+        report["llm_connections"] = get_client_pool().metrics()
+        embedding_cache = getattr(self.context.embedder, "cache", None)
+        if embedding_cache is not None:
+            report["embedding_cache"] = embedding_cache.stats()
+        if self.scoring_batcher is not None:
+            report["scoring_batcher"] = self.scoring_batcher.stats()
+        return report
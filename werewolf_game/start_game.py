@@ -10,6 +10,10 @@ from roles import Moderator, Villager, Werewolf, Guard, Seer, Witch
 from roles.human_player import prepare_human_player
 
 from camelgym.actions import UserRequirement
+from camelgym.context import Context
+from camelgym.provider.llm_cache import configure_response_cache
+from camelgym.rl.checkpoint import PolicyCheckpointStore
+from camelgym.rl.registry import configure_embedding_cache, configure_replay_buffer
 from camelgym.schema import Message
 
 
@@ -19,9 +23,15 @@ def init_game_setup(
     use_reflection=True,
     use_experience=False,
     use_memory_selection=False,
-    new_experience_version=""
+    use_day_summaries=False,
+    new_experience_version="",
+    role_classes=None,
+    concurrent_candidates=True,
+    max_candidate_concurrency=None,
+    use_n_candidates=False,
 ):
-    roles = [Villager, Villager, Werewolf, Werewolf, Guard, Seer, Witch]
+    # role_classes: one entry per player, defaults to the standard 7-player game
+    roles = list(role_classes or [Villager, Villager, Werewolf, Werewolf, Guard, Seer, Witch])
 
     if shuffle:
         random.shuffle(roles)
@@ -37,7 +47,11 @@ def init_game_setup(
             use_reflection=use_reflection,
             use_experience=use_experience,
             use_memory_selection=use_memory_selection,
-            new_experience_version=new_experience_version
+            use_day_summaries=use_day_summaries,
+            new_experience_version=new_experience_version,
+            concurrent_candidates=concurrent_candidates,
+            max_candidate_concurrency=max_candidate_concurrency,
+            use_n_candidates=use_n_candidates,
         )
         for i, role in enumerate(roles)
     ]
@@ -56,48 +70,16 @@ def init_game_setup(
 
 
 # ----------------------------------------------------------------------
-async def start_game(
-    investment=3.0,
-    n_round=1,
-    shuffle=True,
-    add_human=False,
-    use_reflection=True,
-    use_experience=False,
-    use_memory_selection=False,
-    new_experience_version=""
-):
-    env = WerewolfEnv(desc="werewolf game")
-
-    game_setup, players = init_game_setup(
-        shuffle=shuffle,
-        add_human=add_human,
-        use_reflection=use_reflection,
-        use_experience=use_experience,
-        use_memory_selection=use_memory_selection,
-        new_experience_version=new_experience_version
-    )
+def seed_everything(seed: int):
+    """Make role shuffling and policy initialization reproducible."""
+    import torch
 
-    players = [Moderator()] + players
-    env.add_roles(players)
-
-    for p in players:
-        env.set_addresses(p, p.addresses)
-
-    env.pub_mes(
-        Message(
-            role="User",
-            content=game_setup,
-            cause_by=UserRequirement,
-            restricted_to="Moderator"
-        )
-    )
-
-    game = Team(investment=investment, env=env, roles=players)
-    await game.run(n_round=n_round)
+    random.seed(seed)
+    torch.manual_seed(seed)
 
 
 # ----------------------------------------------------------------------
-async def run_one_game_async(
+async def start_game(
     investment=3.0,
     n_round=1,
     shuffle=True,
@@ -105,13 +87,18 @@ async def run_one_game_async(
     use_reflection=True,
     use_experience=False,
     use_memory_selection=False,
-    new_experience_version=""
+    new_experience_version="",
+    seed=None,
+    use_day_summaries=False,
+    until_terminal=False,
+    concurrent_candidates=True,
+    max_candidate_concurrency=None,
+    use_n_candidates=False,
 ):
-    env = WerewolfEnv(desc="werewolf game")
+    if seed is not None:
+        seed_everything(seed)
 
-    # Track actions for diversity metric
-    ctx = env.context
-    ctx.action_history = []   # stores chosen action text
+    env = WerewolfEnv(desc="werewolf game")
 
     game_setup, players = init_game_setup(
         shuffle=shuffle,
@@ -119,10 +106,15 @@ async def run_one_game_async(
         use_reflection=use_reflection,
         use_experience=use_experience,
         use_memory_selection=use_memory_selection,
-        new_experience_version=new_experience_version
+        use_day_summaries=use_day_summaries,
+        new_experience_version=new_experience_version,
+        concurrent_candidates=concurrent_candidates,
+        max_candidate_concurrency=max_candidate_concurrency,
+        use_n_candidates=use_n_candidates,
     )
 
-    players = [Moderator()] + players
+    moderator = Moderator(summarize_days=use_day_summaries)
+    players = [moderator] + players
     env.add_roles(players)
 
     for p in players:
@@ -138,13 +130,13 @@ async def run_one_game_async(
     )
 
     game = Team(investment=investment, env=env, roles=players)
-    await game.run(n_round=n_round)
+    await game.run(n_round=n_round, until_terminal=until_terminal)
+    await moderator.cancel_day_summaries()
 
-    # ---------------------------------------------------------
-    # RL TRAINING SECTION
-    # ---------------------------------------------------------
-    ctx = env.context
 
+# ----------------------------------------------------------------------
+def shape_rewards(env, players, trajectories, action_history):
+    """Turn the game outcome into a shaped reward for every recorded decision."""
     # ------------- BASE REWARD -------------------
     if env.winner == "good guys":
         base_reward = +1
@@ -161,7 +153,7 @@ async def run_one_game_async(
                 return entry["is_alive"]
         return False
 
-    for (embeds, action_index, _) in ctx.buffer.trajectories:
+    for (embeds, action_index, _) in trajectories:
 
         shaped_reward = base_reward
 
@@ -179,26 +171,151 @@ async def run_one_game_async(
         # -----------------------------------------------------
         # 2️ Action diversity penalty → avoid repeating actions
         # -----------------------------------------------------
-        if len(ctx.action_history) > 1:
-            last_action = ctx.action_history[-1]
-            if last_action == ctx.action_history[-2]:
+        if len(action_history) > 1:
+            last_action = action_history[-1]
+            if last_action == action_history[-2]:
                 shaped_reward -= 0.10   # penalize repetition
             else:
                 shaped_reward += 0.05   # reward diversity
 
         shaped_trajectories.append((embeds, action_index, shaped_reward))
 
+    return shaped_trajectories
+
+
+# ----------------------------------------------------------------------
+async def run_one_game_async(
+    investment=3.0,
+    n_round=1,
+    shuffle=True,
+    add_human=False,
+    use_reflection=True,
+    use_experience=False,
+    use_memory_selection=False,
+    use_day_summaries=False,
+    new_experience_version="",
+    context: Context = None,
+    train=True,
+    role_classes=None,
+    event_driven=False,
+    concurrent_roles=False,
+    until_terminal=False,
+    max_steps=None,
+    max_seconds=None,
+    concurrent_candidates=True,
+    max_candidate_concurrency=None,
+    use_n_candidates=False,
+):
+    """
+    Play one game and return its outcome and RL data.
+
+    context: the game's own Context; runners playing several games at once pass one per game
+             so that games share the policy / LLM client but not their buffers and histories.
+    train:   train the context's policy on this game right away. Runners that batch the
+             training themselves pass False and consume result["trajectories"].
+    role_classes: player roles, see init_game_setup
+    use_day_summaries: players see finished days as the moderator's summaries of them
+    event_driven / concurrent_roles: scheduling of the env's ticks, see WerewolfEnv
+    until_terminal: step the game until its result is announced (or max_steps, by default n_round * 25, /
+                    max_seconds) instead of n_round rounds of 25 steps; result["run"] then reports the steps it took
+    concurrent_candidates / max_candidate_concurrency / use_n_candidates: generation of each decision's
+                    candidate actions, see ActionNode.generate_candidates
+    """
+    env_kwargs = dict(desc="werewolf game", event_driven=event_driven, concurrent_roles=concurrent_roles)
+    env = WerewolfEnv(context=context, **env_kwargs) if context else WerewolfEnv(**env_kwargs)
+
+    # Track actions for diversity metric
+    ctx = env.context
+    ctx.action_history = []   # stores chosen action text
+
+    game_setup, players = init_game_setup(
+        shuffle=shuffle,
+        add_human=add_human,
+        use_reflection=use_reflection,
+        use_experience=use_experience,
+        use_memory_selection=use_memory_selection,
+        use_day_summaries=use_day_summaries,
+        new_experience_version=new_experience_version,
+        role_classes=role_classes,
+        concurrent_candidates=concurrent_candidates,
+        max_candidate_concurrency=max_candidate_concurrency,
+        use_n_candidates=use_n_candidates,
+    )
+
+    moderator = Moderator(summarize_days=use_day_summaries)
+    players = [moderator] + players
+    env.add_roles(players)
+
+    for p in players:
+        env.set_addresses(p, p.addresses)
+
+    env.pub_mes(
+        Message(
+            role="User",
+            content=game_setup,
+            cause_by=UserRequirement,
+            restricted_to="Moderator"
+        )
+    )
+
+    game = Team(investment=investment, env=env, roles=players, context=ctx)
+    await game.run(n_round=n_round, until_terminal=until_terminal, max_steps=max_steps, max_seconds=max_seconds)
+    await moderator.cancel_day_summaries()
+
+    # ---------------------------------------------------------
+    # RL TRAINING SECTION
+    # ---------------------------------------------------------
+    shaped_trajectories = shape_rewards(env, players, ctx.buffer.trajectories, ctx.action_history)
+
     # -----------------------------------------------------
     # TRAIN THE POLICY (entropy regularization already inside trainer)
     # -----------------------------------------------------
     loss = None
-    if len(shaped_trajectories) > 0:
-        loss = ctx.trainer.train(shaped_trajectories)
+    if train and len(shaped_trajectories) > 0:
+        loss = ctx.trainer.train_batched(shaped_trajectories)
         print("[RL] Training Loss:", loss)
 
+    # keep the game's decisions for later training, beyond this game's buffer
+    if ctx.replay_buffer is not None and shaped_trajectories:
+        ctx.replay_buffer.extend(shaped_trajectories, game_id=ctx.replay_buffer.new_game_id())
+
     ctx.buffer.clear()
 
     history = env.log_messages
+    selectors = [p.memory_selector for p in players if getattr(p, "memory_selector", None)]
+    memory_selection = None
+    if selectors:
+        full = sum(s.full_tokens for s in selectors)
+        selected = sum(s.selected_tokens for s in selectors)
+        memory_selection = {
+            "prompts": sum(s.selections for s in selectors),
+            "full_tokens": full,
+            "selected_tokens": selected,
+            "saved_tokens": full - selected,
+            "saved_ratio": (full - selected) / full if full else 0.0,
+        }
+        logger.info(f"[MemorySelection] {memory_selection}")
+
+    views = [p.day_summary_view for p in players if getattr(p, "day_summary_view", None)]
+    day_summaries = None
+    if views:
+        full = sum(v.full_chars for v in views)
+        shown = sum(v.shown_chars for v in views)
+        day_summaries = {
+            "days_summarized": len(env.day_summaries),
+            "prompts": sum(v.compositions for v in views),
+            "full_chars": full,
+            "shown_chars": shown,
+            "saved_ratio": (full - shown) / full if full else 0.0,
+        }
+        logger.info(f"[DaySummaries] {day_summaries}")
+
+    reflection = None
+    if use_reflection:
+        calls = sum(getattr(p, "reflect_calls", 0) for p in players)
+        reused = sum(getattr(p, "reflect_reused", 0) for p in players)
+        reflection = {"calls": calls, "reused": reused, "saved_ratio": reused / (calls + reused) if calls + reused else 0.0}
+        logger.info(f"[Reflection] {reflection}")
 
     return {
         "winner": env.winner,
@@ -206,6 +323,11 @@ async def run_one_game_async(
         "players": players,
         "loss": loss,
         "actions": ctx.action_history,
+        "trajectories": shaped_trajectories,
+        "memory_selection": memory_selection,
+        "day_summaries": day_summaries,
+        "reflection": reflection,
+        "run": game.run_stats or None,
     }
 
 
@@ -218,7 +340,8 @@ def run_one_game(
     use_reflection=False,
     use_experience=False,
     use_memory_selection=False,
-    new_experience_version=""
+    new_experience_version="",
+    use_day_summaries=False,
 ):
     return asyncio.run(
         run_one_game_async(
@@ -229,6 +352,7 @@ def run_one_game(
             use_reflection=use_reflection,
             use_experience=use_experience,
             use_memory_selection=use_memory_selection,
+            use_day_summaries=use_day_summaries,
             new_experience_version=new_experience_version,
         )
     )
@@ -243,8 +367,42 @@ def main(
     use_reflection=False,
     use_experience=False,
     use_memory_selection=False,
-    new_experience_version=""
+    new_experience_version="",
+    seed=None,
+    llm_cache_mode=None,
+    llm_cache_path=None,
+    embedding_cache_dir=None,
+    replay_buffer_path=None,
+    checkpoint_dir=None,
+    checkpoint_version="best",
+    use_day_summaries=False,
+    until_terminal=False,
+    concurrent_candidates=True,
+    max_candidate_concurrency=None,
+    use_n_candidates=False,
 ):
+    """
+    seed:           seeds role shuffling and policy init, required to replay a recorded game
+    llm_cache_mode: record / replay / read_through, e.g. record a game with `--seed 1 --llm_cache_mode record`,
+                    then re-run it offline with `--seed 1 --llm_cache_mode replay`
+    embedding_cache_dir: keep candidate embeddings on disk there, to reuse them in later games
+    replay_buffer_path:  append the game's decisions to the memory-mapped replay buffer there
+    checkpoint_dir:      play with a trained policy from this checkpoint store ("best", "latest" or a version)
+    use_day_summaries:   show players summaries of finished days instead of their full transcript
+    until_terminal:      stop as soon as the result is announced, n_round then only caps the game length
+    concurrent_candidates:     request a decision's candidate actions together, `--noconcurrent_candidates` for
+                               one streamed request after another
+    max_candidate_concurrency: cap on those requests in flight per decision
+    use_n_candidates:          ask for all candidates in a single request with n choices
+    """
+    cache = configure_response_cache(llm_cache_mode, llm_cache_path)
+    if embedding_cache_dir:
+        configure_embedding_cache(disk_dir=embedding_cache_dir)
+    replay_buffer = configure_replay_buffer(path=replay_buffer_path) if replay_buffer_path else None
+    if checkpoint_dir:
+        # loaded into the session's policy, which the game's default Context uses
+        PolicyCheckpointStore(checkpoint_dir).load_into(Context(), checkpoint_version, load_optimizer=False)
+
     asyncio.run(
         start_game(
             investment,
@@ -254,10 +412,22 @@ def main(
             use_reflection,
             use_experience,
             use_memory_selection,
-            new_experience_version
+            new_experience_version,
+            seed,
+            use_day_summaries=use_day_summaries,
+            until_terminal=until_terminal,
+            concurrent_candidates=concurrent_candidates,
+            max_candidate_concurrency=max_candidate_concurrency,
+            use_n_candidates=use_n_candidates,
         )
     )
 
+    if cache:
+        logger.info(f"LLM response cache: {cache.stats()}")
+    if replay_buffer is not None:
+        replay_buffer.flush()
+        logger.info(f"Replay buffer {replay_buffer_path}: {len(replay_buffer)} decisions")
+
 
 if __name__ == "__main__":
     fire.Fire(main)
@@ -0,0 +1,57 @@
+import asyncio
+
+from camelgym.actions.action_node import ActionNode
+from camelgym.provider.base_llm import BaseLLM
+
+
+class SlowLLM(BaseLLM):
+    """Counts requests and how many of them are in flight at once"""
+
+    def __init__(self, config=None):
+        self.model = "test-model"
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def acompletion(self, messages: list[dict], timeout=3):
+        pass
+
+    async def acompletion_text(self, messages: list[dict], stream=False, timeout=3) -> str:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return f"candidate {self.requests}"
+
+    async def acompletion_texts(self, messages: list[dict], n: int, timeout=3) -> list[str]:
+        self.requests += 1
+        return [f"choice {i}" for i in range(n)]
+
+
+def node_with(llm) -> ActionNode:
+    node = ActionNode(key="Action")
+    node.set_llm(llm)
+    return node
+
+
+def test_max_concurrency_caps_requests_in_flight():
+    llm = SlowLLM()
+    candidates = asyncio.run(node_with(llm).generate_candidates("prompt", K=6, concurrent=True, max_concurrency=2))
+    assert len(candidates) == 6 and llm.requests == 6
+    assert llm.max_in_flight == 2
+
+    unbounded = SlowLLM()
+    asyncio.run(node_with(unbounded).generate_candidates("prompt", K=6, concurrent=True))
+    assert unbounded.max_in_flight == 6
+
+    serial = SlowLLM()
+    asyncio.run(node_with(serial).generate_candidates("prompt", K=3, concurrent=False))
+    assert serial.max_in_flight == 1
+
+
+def test_use_n_sends_a_single_request():
+    llm = SlowLLM()
+    candidates = asyncio.run(node_with(llm).generate_candidates("prompt", K=4, use_n=True))
+    assert candidates == ["choice 0", "choice 1", "choice 2", "choice 3"]
+    assert llm.requests == 1
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+from camelgym.context import Context
+from camelgym.provider.base_llm import BaseLLM
+from actions import Hunt, Reflect, Speak
+
+
+class CapturingLLM(BaseLLM):
+    def __init__(self, config=None):
+        self.model = "test-model"
+        self.requests = []
+
+    async def acompletion(self, messages: list[dict], timeout=3):
+        pass
+
+    async def acompletion_text(self, messages: list[dict], stream=False, timeout=3) -> str:
+        self.requests.append(messages)
+        return json.dumps({"RESPONSE": "Player2", "REFLECTION": {}})
+
+
+def test_static_block_shared_then_transcript_then_turn():
+    context = Context()
+    context.cache_friendly_prompts = True
+    llm = CapturingLLM()
+    history = "Moderator: It’s dark, everyone close your eyes.\nPlayer2: I am the Seer."
+
+    async def play():
+        for profile, name in [("Seer", "Player1"), ("Werewolf", "Player3")]:
+            await Reflect(context=context, llm=llm).run(profile, name, history, "Now vote")
+            await Speak(context=context, llm=llm).run(profile, name, history, "Now vote", reflection=f"{name} thinks")
+            await Hunt(context=context, llm=llm).run(history, profile, name, reflection=f"{name} thinks")
+
+    asyncio.run(play())
+
+    reflect, speak, hunt = llm.requests[:3]
+    for first, second in zip(llm.requests[:3], llm.requests[3:]):
+        assert first[0]["role"] == "system" and first[0]["content"] == second[0]["content"]  # same for every player
+    assert '"GAME_STATES"' in reflect[0]["content"] and "__" not in reflect[0]["content"]
+    assert "Choose one living player to" in hunt[0]["content"] and "__" not in hunt[0]["content"]
+
+    user = speak[-1]["content"]
+    assert user.startswith("ROLE: Seer\nPLAYER_NAME: Player1\n\nHISTORY:\n" + history)
+    assert user.index(history) < user.index("Player1 thinks") < user.index('"MODERATOR_INSTRUCTION": "Now vote"')
+
+
+def test_default_layout_unchanged():
+    llm = CapturingLLM()
+    asyncio.run(Reflect(context=Context(), llm=llm).run("Seer", "Player1", "some history", "Now vote"))
+
+    (request,) = llm.requests
+    assert request[0]["content"] == llm.system_prompt
+    assert "some history" in request[1]["content"] and "You are Seer" in request[1]["content"]
@@ -0,0 +1,42 @@
+from camelgym.const import MESSAGE_ROUTE_TO_ALL
+from camelgym.environment.base_env import Environment
+from camelgym.schema import Message
+
+
+class Inbox:
+    def __init__(self):
+        self.messages = []
+
+    def put_message(self, message):
+        self.messages.append(message.content)
+
+
+def test_routing_by_address_index():
+    env = Environment()
+    moderator, player1, player2 = Inbox(), Inbox(), Inbox()
+    env.set_addresses(moderator, {"Moderator"})
+    env.set_addresses(player1, {"Player1", "Werewolf"})
+    env.set_addresses(player2, {"Player2", "Werewolf"})
+
+    env.publish_message(Message(content="all", send_to={MESSAGE_ROUTE_TO_ALL}))
+    env.publish_message(Message(content="wolves", send_to={"Werewolf", "Player1"}))
+    env.publish_message(Message(content="p2", send_to={"Player2"}))
+    env.publish_message(Message(content="nobody", send_to={"Player9"}))
+
+    assert moderator.messages == ["all"]
+    assert player1.messages == ["all", "wolves"]
+    assert player2.messages == ["all", "wolves", "p2"]
+    assert env._woken == {moderator, player1, player2}
+
+
+def test_set_addresses_replaces_subscriptions():
+    env = Environment()
+    player = Inbox()
+    env.set_addresses(player, {"Player1", "Werewolf"})
+    env.set_addresses(player, {"Player1"})  # e.g. a role that changed sides
+
+    env.publish_message(Message(content="wolves", send_to={"Werewolf"}))
+    env.publish_message(Message(content="p1", send_to={"Player1"}))
+
+    assert player.messages == ["p1"]
+    assert "Werewolf" not in env._subscribers
@@ -0,0 +1,69 @@
+import asyncio
+from typing import ClassVar
+
+from camelgym.environment import WerewolfEnv
+from camelgym.roles import Role
+from camelgym.schema import Message
+
+steps = []
+
+
+class Relay(Role):
+    """Passes every message it gets on to `forward_to`"""
+
+    forward_to: str = ""
+
+    async def run(self, with_message=None):
+        news = self.rc.msg_buffer.pop_all()
+        steps.append((self.name, [m.content for m in news]))
+        if news and self.forward_to:
+            self.rc.env.publish_message(Message(content=f"from {self.name}", sent_from=self.name, send_to=self.forward_to))
+
+
+class Driver(Relay):
+    always_ready: ClassVar[bool] = True
+
+
+def make_env(**kwargs):
+    env = WerewolfEnv(**kwargs)
+    roles = [
+        Driver(name="Driver", profile="Moderator", forward_to="B"),
+        Relay(name="A", profile="Villager"),
+        Relay(name="B", profile="Villager", forward_to="A"),
+        Relay(name="C", profile="Villager"),
+    ]
+    env.add_roles(roles)
+    for role in roles:
+        env.set_addresses(role, {role.name})
+    return env
+
+
+def test_only_woken_roles_are_stepped_in_roster_order():
+    steps.clear()
+    env = make_env(event_driven=True)
+    env.publish_message(Message(content="start", send_to="Driver"))
+
+    asyncio.run(env.run(k=2))
+
+    # B is woken by the driver (before it) in the same tick, A by B (after it) only in the next one
+    assert steps == [
+        ("Driver", ["start"]),
+        ("B", ["from Driver"]),
+        ("Driver", []),
+        ("A", ["from B"]),
+    ]
+    assert env.role_steps == 4  # a sequential tick steps all 4 roles
+    assert [role.name for role in env._always_ready] == ["Driver"]  # found once, when the roles were added
+
+
+def test_concurrent_roles_run_woken_players_together():
+    steps.clear()
+    env = make_env(event_driven=True, concurrent_roles=True)
+    for name in ["A", "B", "C"]:
+        env.publish_message(Message(content="go", send_to=name))
+
+    asyncio.run(env.run())
+
+    assert steps[0] == ("Driver", [])
+    assert sorted(name for name, _ in steps[1:]) == ["A", "B", "C"]
+    assert env.role_steps == 4
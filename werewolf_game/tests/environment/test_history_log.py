@@ -0,0 +1,28 @@
+from camelgym.environment import HistoryLog, WerewolfEnv
+from camelgym.schema import Message
+
+
+def test_history_matches_concatenation():
+    env = WerewolfEnv()
+    expected = ""
+    for i in range(600):
+        message = Message(content=f"message {i}", sent_from="Moderator", send_to={"Player1"})
+        env.publish_message(message)
+        expected += f"\n{message}"
+    assert env.history == expected
+    assert len(env.history_log) == 600
+
+
+def test_bounded_tail_keeps_recent_lines_and_sink_keeps_all(tmp_path):
+    sink = tmp_path / "history.txt"
+    log = HistoryLog(max_lines=10, sink=sink, chunk_size=4)
+    for i in range(50):
+        log.append(f"line {i}")
+    log.flush()
+
+    kept = log.text().split("\n")[1:]
+    assert kept[-1] == "line 49"
+    assert 10 <= len(kept) < 10 + 2 * 4  # trimmed by whole chunks
+    assert log.dropped_lines == 50 - len(kept)
+    assert sink.read_text() == "".join(f"\nline {i}" for i in range(50))
+    log.close()
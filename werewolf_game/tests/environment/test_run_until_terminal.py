@@ -0,0 +1,56 @@
+import asyncio
+from typing import ClassVar
+
+from camelgym.context import Context
+from camelgym.environment import Environment, WerewolfEnv
+from camelgym.roles import Role
+from camelgym.team import Team
+
+
+class Countdown(Role):
+    """Announces a result after `steps` runs, like the Moderator does when the game is won"""
+
+    always_ready: ClassVar[bool] = True
+    steps: int = 3
+    runs: int = 0
+
+    async def run(self, with_message=None):
+        self.runs += 1
+        if self.runs == self.steps:
+            self.rc.env.game_result = "Game over!"
+
+
+def play(steps, **run_kwargs):
+    env = WerewolfEnv()
+    role = Countdown(name="Moderator", profile="Moderator", steps=steps)
+    team = Team(env=env, roles=[role], context=Context())
+    asyncio.run(team.run(until_terminal=True, **run_kwargs))
+    return team, role
+
+
+def test_stops_right_after_terminal():
+    team, role = play(steps=3, max_steps=100)
+
+    assert role.runs == 3
+    assert team.run_stats["steps"] == 3 and team.run_stats["stop_reason"] == "terminal"
+
+
+def test_step_cap():
+    team, role = play(steps=50, max_steps=10)
+
+    assert role.runs == 10
+    assert team.run_stats["stop_reason"] == "max_steps"
+
+
+def test_default_step_cap_is_n_round_rounds():
+    team, role = play(steps=100, n_round=2)
+
+    assert role.runs == 50
+    assert team.run_stats["stop_reason"] == "max_steps"
+
+
+def test_stops_when_every_role_is_idle():
+    team = Team(env=Environment(), roles=[Role(name="Alice")], context=Context())
+    asyncio.run(team.run(until_terminal=True))
+
+    assert team.run_stats["steps"] == 0 and team.run_stats["stop_reason"] == "idle"
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+from camelgym.actions import UserRequirement
+from camelgym.schema import Message
+
+from actions import InstructSpeak
+
+
+def test_trusted_message_matches_validated():
+    kwargs = dict(role="Moderator", sent_from="Moderator", cause_by=InstructSpeak, send_to=["Werewolf", "yes"])
+    validated, trusted = Message("Werewolves, open your eyes", **kwargs), Message.trusted("Werewolves, open your eyes", **kwargs)
+
+    assert trusted.model_dump(exclude={"id"}) == validated.model_dump(exclude={"id"})
+    assert trusted.send_to == {"Werewolf", "yes"}
+    assert Message.load(trusted.dump()) == trusted
+    assert Message.trusted("hi").cause_by == Message(content="hi").cause_by == "camelgym.actions.add_requirement.UserRequirement"
+    assert Message.trusted("hi", cause_by=UserRequirement).send_to == {"<all>"}
+
+
+def test_message_ids_are_unique_and_ordered():
+    ids = [Message.trusted("a").id for _ in range(100)] + [Message(content="b").id for _ in range(100)]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+    assert all(len(i) == 32 for i in ids)
+
+
+def test_content_assignment_keeps_conversions_for_routing_fields():
+    message = Message.trusted("hi")
+    message.content = "Day 1 | " + message.content
+    message.send_to = "Player1"
+    assert message.content == "Day 1 | hi"
+    assert message.send_to == {"Player1"}
@@ -0,0 +1,32 @@
+from camelgym.memory.memory import Memory
+from camelgym.schema import Message
+
+
+def test_duplicates_are_skipped_by_id_and_index_follows_deletes():
+    memory = Memory()
+    first, second = Message(content="hello", role="Player1"), Message(content="hello", role="Player1")
+    memory.add_batch([first, first, second])
+    assert memory.count() == 2  # same content, different ids
+
+    assert memory.find_news([first, Message(content="new")])[0].content == "new"
+    memory.delete(first)
+    assert not memory.contains(first)
+    memory.add(first)
+    assert memory.delete_newest() is first and not memory.contains(first)
+    memory.clear()
+    assert memory.find_news([second]) == [second]
+
+
+def test_ignore_id_deduplicates_by_content():
+    memory = Memory(ignore_id=True)
+    memory.add(Message(content="vote Player3", role="Player1", send_to={"Player2", "Moderator"}))
+    memory.add(Message(content="vote Player3", role="Player1", send_to={"Moderator", "Player2"}))
+    memory.add(Message(content="vote Player4", role="Player1"))
+    assert memory.count() == 2
+
+
+def test_find_news_within_the_last_k_and_rebuilt_index():
+    messages = [Message(content=str(i)) for i in range(5)]
+    memory = Memory(storage=messages)
+    assert memory.find_news(messages) == []
+    assert memory.find_news(messages, k=2) == messages[:3]
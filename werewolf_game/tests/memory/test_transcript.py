@@ -0,0 +1,35 @@
+from camelgym.memory import IncrementalTranscript, Memory
+from camelgym.schema import Message
+
+
+def test_transcript_renders_new_messages_once_and_rebuilds_after_deletion():
+    rendered = []
+
+    def render(m):
+        rendered.append(m.content)
+        return f"{m.role}: {m.content}"
+
+    memory, transcript = Memory(), IncrementalTranscript(render)
+    memory.add_batch([Message(content="a", role="P1"), Message(content="b", role="P2")])
+    assert transcript.sync(memory).text == "P1: a\nP2: b"
+
+    memory.add(Message(content="c", role="P3"))
+    assert transcript.sync(memory).text == "P1: a\nP2: b\nP3: c"
+    assert transcript.sync(memory).tail(max_lines=2) == "P2: b\nP3: c"
+    assert transcript.tail(max_lines=1, max_chars=3) == ": c"
+    assert rendered == ["a", "b", "c"]
+
+    memory.delete_newest()
+    assert transcript.sync(memory).text == "P1: a\nP2: b"
+    memory.clear()
+    assert transcript.sync(memory).text == ""
+
+
+def test_transcript_rebuilds_for_a_swapped_memory():
+    transcript = IncrementalTranscript(lambda m: m.content)
+    old, new = Memory(), Memory()
+    old.add(Message(content="old"))
+    new.add_batch([Message(content="new1"), Message(content="new2")])
+
+    assert transcript.sync(old).text == "old"
+    assert transcript.sync(new).text == "new1\nnew2"
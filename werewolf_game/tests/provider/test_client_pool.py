@@ -0,0 +1,33 @@
+import asyncio
+
+import httpx
+
+from camelgym.configs.llm_config import LLMConfig
+from camelgym.provider.client_pool import LLMClientPool
+
+CONFIG = LLMConfig(api_key="sk-test", model="gpt-3.5-turbo")
+
+
+def test_clients_are_shared_within_a_loop_only():
+    pool = LLMClientPool()
+
+    async def two_clients():
+        return pool.get_client(CONFIG, api_key="sk-test"), pool.get_client(CONFIG, api_key="sk-test")
+
+    first, second = asyncio.run(two_clients()), asyncio.run(two_clients())
+    assert first[0] is first[1] and second[0] is second[1]
+    assert first[0] is not second[0]  # a later asyncio.run gets a client of its own loop
+
+
+def test_clients_requested_outside_a_loop_are_not_cached():
+    pool = LLMClientPool()
+    assert pool.get_client(CONFIG, api_key="sk-test") is not pool.get_client(CONFIG, api_key="sk-test")
+    assert pool.metrics()["clients_created"] == 2
+
+
+def test_http_client_uses_the_configured_proxy_and_limits():
+    config = LLMConfig(api_key="sk-test", model="gpt-3.5-turbo", proxy="http://127.0.0.1:8080", max_connections=7)
+    http_client = LLMClientPool()._make_http_client(config)
+    transport = http_client._transport_for_url(httpx.URL("https://api.openai.com/v1"))
+    assert transport._pool._proxy_url.host == b"127.0.0.1"
+    assert transport._pool._max_connections == 7
@@ -0,0 +1,53 @@
+import pytest
+
+from camelgym.provider.base_llm import BaseLLM
+from camelgym.provider.llm_cache import LLMCacheMissError, LLMResponseCache
+
+
+class CountingLLM(BaseLLM):
+    def __init__(self, config=None):
+        self.model = "test-model"
+        self.calls = 0
+
+    async def acompletion(self, messages: list[dict], timeout=3):
+        pass
+
+    async def acompletion_text(self, messages: list[dict], stream=False, timeout=3) -> str:
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+class TestLLMResponseCache:
+    @pytest.mark.asyncio
+    async def test_record_then_replay(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        llm = CountingLLM()
+        llm.response_cache = LLMResponseCache(path, mode="record")
+        recorded = [await llm.aask("same prompt") for _ in range(3)]
+        assert recorded == ["answer 1", "answer 2", "answer 3"]
+
+        # repeated identical requests replay in the recorded order, without calling the provider
+        offline = CountingLLM()
+        offline.response_cache = LLMResponseCache(path, mode="replay")
+        assert [await offline.aask("same prompt") for _ in range(3)] == recorded
+        assert offline.calls == 0
+        assert offline.response_cache.stats()["hits"] == 3
+
+        with pytest.raises(LLMCacheMissError):
+            await offline.aask("never recorded")
+
+    @pytest.mark.asyncio
+    async def test_read_through_and_lru_eviction(self, tmp_path):
+        llm = CountingLLM()
+        llm.response_cache = LLMResponseCache(tmp_path / "cache.sqlite", mode="read_through", max_entries=2)
+        for prompt in ["a", "b", "c"]:
+            await llm.aask(prompt)
+        assert llm.calls == 3
+        assert len(llm.response_cache) == 2
+        assert llm.response_cache.stats()["evictions"] == 1
+
+        llm.response_cache.reset_occurrences()
+        assert await llm.aask("c") == "answer 3"
+        assert llm.calls == 3
+        await llm.aask("a")  # evicted, fetched again
+        assert llm.calls == 4
@@ -0,0 +1,71 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+from camelgym.configs.llm_config import LLMConfig
+from camelgym.context import Context
+from camelgym.provider.llm_provider_registry import create_llm_instance
+from camelgym.provider.mock_llm import MockLLM
+from actions import Hunt, Save
+
+VOTE_PROMPT = """
+Moderator: Now vote and tell me who you think is the werewolf. Don’t mention your role.
+                    You only choose one from the following living options please:
+                    ['Player1', 'Player3', 'Player4']. Say ONLY: I vote to eliminate ...
+"""
+
+
+def mock_llm(seed=0) -> MockLLM:
+    return create_llm_instance(LLMConfig(api_type="mock", api_key="mock", mock_seed=seed))
+
+
+class TestMockLLM:
+    @pytest.mark.asyncio
+    async def test_vote_targets_a_living_player(self):
+        llm = mock_llm()
+        assert isinstance(llm, MockLLM)
+        for _ in range(10):
+            rsp = await llm.aask(VOTE_PROMPT)
+            assert rsp.startswith("I vote to eliminate ")
+            assert rsp.split()[-1] in {"Player1", "Player3", "Player4"}
+
+    @pytest.mark.asyncio
+    async def test_same_seed_same_answers(self):
+        answers = [[await llm.aask(VOTE_PROMPT) for _ in range(5)] for llm in (mock_llm(1), mock_llm(1))]
+        assert answers[0] == answers[1]
+
+    def test_speak_answer_is_json_with_response(self):
+        prompt = '{"MODERATOR_INSTRUCTION": "' + VOTE_PROMPT.replace("\n", " ") + '"}'
+        rsp = json.loads(mock_llm().answer(prompt))
+        assert rsp["RESPONSE"].startswith("I vote to eliminate ")
+
+
+NIGHT_HISTORY = """Moderator: It’s dark, everyone close your eyes.
+Moderator: Witch, Player3 was killed last night, the living players are ['Player1', 'Player3', 'Player4']."""
+
+
+def recording_mock_llm(seed: int, answers: list) -> MockLLM:
+    llm = mock_llm(seed)
+    answer = llm.answer
+    llm.answer = lambda prompt, system="": answers.append(answer(prompt, system)) or answers[-1]
+    return llm
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cache_friendly", [False, True])
+async def test_night_actions_answer_in_their_shape(cache_friendly):
+    context = Context()
+    context.cache_friendly_prompts = cache_friendly
+    for seed in range(5):
+        answers = []  # raw answers: a malformed one would be turned into PASS by NighttimeWhispers
+        llm = recording_mock_llm(seed, answers)
+        save = await Save(context=context, llm=llm).run(NIGHT_HISTORY, "Witch", "Player5")
+        assert json.loads(answers[-1])["RESPONSE"] == save and save in {"SAVE", "PASS"}
+
+        hunt = await Hunt(context=context, llm=llm).run(NIGHT_HISTORY, "Werewolf", "Player2")
+        target = json.loads(answers[-1])["RESPONSE"]
+        assert hunt.split()[-1] == target and target in {"Player1", "Player3", "Player4"}
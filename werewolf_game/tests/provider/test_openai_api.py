@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import APIConnectionError
+from openai.types import CompletionUsage
+from pydantic import BaseModel
+from tenacity import wait_none
+
+from camelgym.configs.llm_config import LLMConfig
+from camelgym.provider.openai_api import OpenAILLM
+from camelgym.utils.cost_manager import CostManager
+
+
+def make_llm(**config) -> OpenAILLM:
+    llm = OpenAILLM(LLMConfig(api_key="sk-test", model="gpt-3.5-turbo", pool_client=False, **config))
+    llm.cost_manager = CostManager()
+    return llm
+
+
+class PromptTokensDetails(BaseModel):
+    cached_tokens: int
+
+
+def test_update_costs_records_cached_tokens_from_object_and_dict():
+    llm = make_llm()
+    details = PromptTokensDetails(cached_tokens=64)
+    llm._update_costs(SimpleNamespace(prompt_tokens=100, completion_tokens=10, prompt_tokens_details=details))
+    # openai versions without the field keep it as a plain dict
+    usage = CompletionUsage(prompt_tokens=50, completion_tokens=5, total_tokens=55)
+    usage.prompt_tokens_details = {"cached_tokens": 32}
+    llm._update_costs(usage)
+    llm._update_costs(CompletionUsage(prompt_tokens=20, completion_tokens=2, total_tokens=22))
+
+    assert llm.cost_manager.total_prompt_tokens == 170
+    assert llm.cost_manager.total_cached_tokens == 96
+
+
+class EmptyStream:
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream_usage", [False, True])
+async def test_stream_options_only_sent_when_enabled(stream_usage):
+    llm = make_llm(stream_usage=stream_usage)
+    sent = {}
+
+    async def create(**kwargs):
+        sent.update(kwargs)
+        return EmptyStream()
+
+    llm.aclient = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    assert [chunk async for chunk in llm._achat_completion_stream([{"role": "user", "content": "hi"}])] == []
+    assert sent["stream"] is True
+    assert ("extra_body" in sent) == stream_usage
+
+
+@pytest.mark.asyncio
+async def test_n_choices_request_is_retried_on_connection_errors(monkeypatch):
+    monkeypatch.setattr(OpenAILLM.acompletion_texts.retry, "wait", wait_none())
+    llm = make_llm()
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs["n"])
+        if len(calls) == 1:
+            raise APIConnectionError(request=httpx.Request("POST", "https://api.test/v1/chat/completions"))
+        message = SimpleNamespace(content="Player2")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)] * kwargs["n"], usage=None)
+
+    llm.aclient = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    assert await llm.acompletion_texts([{"role": "user", "content": "hi"}], n=3) == ["Player2"] * 3
+    assert calls == [3, 3]
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+import torch
+
+from camelgym.context import Context
+from camelgym.rl.checkpoint import PolicyCheckpointStore
+from camelgym.rl.policy import RLPolicy
+from camelgym.rl.trainer import RLTrainer
+
+
+def test_index_tracks_latest_and_best_and_prunes(tmp_path):
+    store = PolicyCheckpointStore(tmp_path, keep_last=2)
+    policy = RLPolicy()
+    for games, win_rate in [(10, 0.4), (20, 0.7), (30, 0.5), (40, 0.6)]:
+        store.save(policy, games_played=games, win_rate=win_rate)
+
+    reopened = PolicyCheckpointStore(tmp_path, keep_last=2)
+    assert reopened.latest_version == 3
+    assert reopened.best_version == 1
+    assert sorted(reopened.index["versions"]) == ["1", "2", "3"]  # best kept beyond keep_last
+    assert not (tmp_path / "ckpt_v000000.pt").exists()
+    assert reopened.load("best")["metadata"]["games_played"] == 20
+
+
+def test_load_into_context_restores_policy_and_optimizer(tmp_path):
+    store = PolicyCheckpointStore(tmp_path)
+    trained = RLPolicy()
+    trainer = RLTrainer(trained)
+    trainer.train_batched([(torch.randn(3, 384).numpy(), 0, 1.0)])
+    store.save(trained, trainer.optimizer, games_played=1, win_rate=1.0)
+
+    ctx = Context()
+    ctx.policy = RLPolicy()
+    ctx.trainer = RLTrainer(ctx.policy)
+    metadata = store.load_into(ctx, "latest")
+
+    assert metadata["games_played"] == 1
+    assert torch.equal(ctx.policy.fc2.weight, trained.fc2.weight)
+    assert ctx.trainer.optimizer.state_dict()["state"][0]["step"] == 1
+
+
+def test_concurrent_training_saves_periodically(tmp_path, monkeypatch):
+    import asyncio
+
+    import train
+
+    class FakeRunner:
+        def __init__(self, n_games, on_game_end, **kwargs):
+            self.n_games, self.on_game_end = n_games, on_game_end
+
+        async def run(self):
+            for _ in range(self.n_games):
+                self.on_game_end({"winner": "good guys", "loss": None, "actions": []})
+
+        def report(self):
+            return {"games": self.n_games, "games_per_hour": 0.0, "p50_game_seconds": 0.0, "p95_game_seconds": 0.0}
+
+    saved = []
+    monkeypatch.setattr(train, "ConcurrentSelfPlayRunner", FakeRunner)
+    monkeypatch.setattr(train, "save_checkpoint", lambda store, wins, *args, **kwargs: saved.append(len(wins)))
+
+    asyncio.run(train.train_self_play_concurrent(n_games=7, checkpoint_dir=tmp_path, save_every=3))
+    assert saved == [3, 6, 7]
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from camelgym.rl.embedder import LocalEmbedder
+from camelgym.rl.embedding_cache import EmbeddingCache
+
+
+class CountingEncoder:
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.encoded: list[str] = []
+
+    def __call__(self, texts):
+        self.encoded.extend(texts)
+        return np.stack([np.full(self.dim, len(text), dtype=np.float32) for text in texts])
+
+
+class TestEmbeddingCache:
+    def test_repeated_texts_skip_the_encoder(self):
+        encode = CountingEncoder()
+        cache = EmbeddingCache(dim=8)
+        texts = ["I vote to eliminate Player3", "Pass", "Pass"]
+        first = cache.embed(texts, encode)
+        second = cache.embed(["Pass", "I vote to eliminate Player3"], encode)
+
+        assert encode.encoded == ["I vote to eliminate Player3", "Pass"]
+        assert first.shape == (3, 8)
+        np.testing.assert_array_equal(second[0], first[1])
+        assert cache.stats()["hits"] == 2
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(dim=8, max_entries=2)
+        cache.embed(["a", "b", "c"], CountingEncoder())
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_disk_store_is_reopened(self, tmp_path):
+        cache = EmbeddingCache(dim=8, disk_path=tmp_path / "minilm", disk_capacity=16)
+        cache.embed(["Save", "Pass"], CountingEncoder())
+        cache.close()
+
+        encode = CountingEncoder()
+        reopened = EmbeddingCache(dim=8, disk_path=tmp_path / "minilm", disk_capacity=16)
+        vectors = reopened.embed(["Pass", "Save"], encode)
+        assert encode.encoded == []
+        assert reopened.stats()["disk_hits"] == 2
+        assert vectors.dtype == np.float32
+        np.testing.assert_array_equal(vectors[:, 0], [4, 4])
+
+    def test_reopening_with_another_capacity_keeps_the_store(self, tmp_path):
+        cache = EmbeddingCache(dim=8, disk_path=tmp_path / "minilm", disk_capacity=2)
+        cache.embed(["Save", "Pass", "Poison"], CountingEncoder())  # the third does not fit
+        cache.close()
+
+        grown = EmbeddingCache(dim=8, disk_path=tmp_path / "minilm", disk_capacity=4)
+        grown.embed(["Pass", "Poison"], CountingEncoder())
+        assert grown.stats()["disk_hits"] == 1 and grown.stats()["disk_entries"] == 3
+        grown.close()
+
+        smaller = EmbeddingCache(dim=8, disk_path=tmp_path / "minilm", disk_capacity=1)
+        assert smaller.disk_capacity == 4
+        assert smaller.get(EmbeddingCache.key("Poison")) is not None
+        smaller.close()
+
+        with pytest.raises(ValueError, match="6-dim"):
+            EmbeddingCache(dim=6, disk_path=tmp_path / "minilm")
+
+    def test_local_embedder_uses_cache(self):
+        encode = CountingEncoder()
+        embedder = LocalEmbedder(cache=EmbeddingCache(dim=8))
+        embedder.encode = encode
+        assert embedder.embed(["Pass", "Pass"]) == embedder.embed(["Pass", "Pass"])
+        assert encode.encoded == ["Pass"]
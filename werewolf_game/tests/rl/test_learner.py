@@ -0,0 +1,65 @@
+import queue
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+import numpy as np
+import pytest
+import torch
+
+from camelgym.rl.buffer import pack_trajectories
+from camelgym.rl.learner import PolicyPublisher, PolicySubscriber, learner_main
+from camelgym.rl.policy import RLPolicy
+
+
+def packed_game(n=10, seed=0):
+    rng = np.random.default_rng(seed)
+    return pack_trajectories([(rng.standard_normal((3, 384)).astype(np.float32), 1, 1.0) for _ in range(n)])
+
+
+def test_subscriber_hot_reloads_newer_versions_only(tmp_path):
+    publisher, subscriber = PolicyPublisher(tmp_path, keep_last=2), PolicySubscriber(tmp_path)
+    source, target = RLPolicy(), RLPolicy()
+
+    publisher.publish(source.state_dict(), 0)
+    assert subscriber.maybe_reload(target) == 0
+    assert torch.equal(target.fc1.weight, source.fc1.weight)
+
+    assert subscriber.maybe_reload(target) == 0 and subscriber.reloads == 1
+    for version in (1, 2, 3):
+        publisher.publish(source.state_dict(), version)
+    assert subscriber.maybe_reload(target) == 3
+    assert not (tmp_path / "policy_v000001.pt").exists()
+
+
+def test_learner_trains_publishes_and_drops_stale_batches(tmp_path):
+    trajectories, stats = queue.Queue(), queue.Queue()
+    trajectories.put((0, packed_game(seed=0)))
+    trajectories.put((0, packed_game(seed=1)))
+    trajectories.put((0, packed_game(seed=2)))  # two versions behind by now
+    trajectories.put(None)
+
+    learner_main(trajectories, stats, str(tmp_path), max_staleness=1, min_batch_decisions=10)
+
+    result = stats.get_nowait()
+    assert result["updates"] == 2 and result["final_version"] == 2
+    assert result["batches_dropped_stale"] == 1
+    assert PolicySubscriber(tmp_path).latest_version() == 2
+
+
+def test_runner_reports_a_dead_learner_instead_of_hanging():
+    from actor_learner import ActorLearnerRunner
+
+    class DeadLearner:
+        exitcode = -9
+
+        def is_alive(self):
+            return False
+
+    with pytest.raises(RuntimeError, match="exit code -9"):
+        ActorLearnerRunner._learner_stats(DeadLearner(), queue.Queue(), poll_seconds=0.01)
+
+    stats = queue.Queue()
+    stats.put({"batches": 1})
+    assert ActorLearnerRunner._learner_stats(DeadLearner(), stats, poll_seconds=0.01) == {"batches": 1}
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from camelgym.rl.buffer import ExperienceBuffer, ReplayBuffer, pack_trajectories, unpack_trajectories
+
+
+def decision(k, value, dim=4):
+    return np.full((k, dim), value, dtype=np.float32)
+
+
+def test_ring_overwrites_oldest_and_packs_like_trajectories():
+    buffer = ReplayBuffer(capacity=3, k_max=4, embed_dim=4, dtype="float32")
+    for i, k in enumerate([2, 3, 1, 4]):
+        buffer.add(decision(k, i), action_index=k - 1, reward=float(i), game_id=7)
+
+    assert len(buffer) == 3
+    batch = buffer.get([0, 1, 2])  # slot 0 now holds the 4th decision
+    expected = pack_trajectories([(decision(4, 3), 3, 3.0), (decision(3, 1), 2, 1.0), (decision(1, 2), 0, 2.0)])
+    for key in ("embeds", "offsets", "action_index", "reward"):
+        assert np.array_equal(batch[key], expected[key])
+    assert set(batch["game_id"]) == {7}
+
+    with pytest.raises(ValueError):
+        buffer.add(decision(5, 0), 0)
+
+
+def test_pack_unpack_round_trip():
+    trajectories = [(decision(2, 0.5), 1, 1.0), (decision(3, -1.0), 0, -1.0), (decision(1, 2.0), 0, 0.5)]
+    packed = pack_trajectories(trajectories)
+    assert packed["offsets"].tolist() == [0, 2, 5, 6]
+
+    for (embeds, action, reward), (expected_embeds, expected_action, expected_reward) in zip(
+        unpack_trajectories(packed), trajectories
+    ):
+        assert np.array_equal(embeds, expected_embeds)
+        assert (action, reward) == (expected_action, expected_reward)
+    assert unpack_trajectories(pack_trajectories([])) == []
+
+
+def test_prioritized_sampling_follows_priorities():
+    buffer = ReplayBuffer(capacity=10, k_max=2, embed_dim=4)
+    slots = buffer.extend([(decision(2, i), 0, 1.0) for i in range(4)])
+    buffer.update_priorities(slots, [0.0, 0.0, 0.0, 10.0])
+
+    batch = buffer.sample(200, prioritized=True, rng=np.random.default_rng(0))
+    assert np.mean(batch["slots"] == 3) > 0.9
+    assert batch["weights"].max() == pytest.approx(1.0)
+    assert len(buffer.sample(5)["action_index"]) == 5
+
+
+def test_memmap_buffer_survives_reopen(tmp_path):
+    path = tmp_path / "replay"
+    buffer = ReplayBuffer(capacity=5, k_max=3, embed_dim=4, path=path)
+    game_id = buffer.new_game_id()
+    experience = ExperienceBuffer()
+    experience.add(decision(3, 0.5).tolist(), 1)
+    buffer.extend(experience.get(), game_id=game_id)
+    buffer.flush()
+    del buffer
+
+    reopened = ReplayBuffer(capacity=5, k_max=3, embed_dim=4, path=path)
+    assert len(reopened) == 1
+    assert reopened.new_game_id() == game_id + 1
+    assert np.allclose(reopened.get([0])["embeds"], 0.5)
+
+    with pytest.raises(ValueError):
+        ReplayBuffer(capacity=6, k_max=3, embed_dim=4, path=path)
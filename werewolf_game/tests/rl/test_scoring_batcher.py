@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+import torch
+
+from camelgym.rl.batcher import ScoringBatcher, get_scoring_batcher
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class SumPolicy(torch.nn.Module):
+    def forward(self, x):
+        return x.sum(dim=-1, keepdim=True)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch():
+    embedder = CountingEmbedder()
+    batcher = ScoringBatcher(embedder, SumPolicy(), max_batch_size=64, max_wait_ms=5)
+
+    results = await asyncio.gather(batcher.score(["a", "bb"]), batcher.score(["ccc"]), batcher.score(["dddd", "e"]))
+
+    assert embedder.calls == [["a", "bb", "ccc", "dddd", "e"]]
+    assert [scores for _, scores in results] == [[2.0, 3.0], [4.0], [5.0, 2.0]]
+    assert results[1][0] == [[3.0, 1.0]]
+    assert batcher.stats()["requests_per_batch"] == 3
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting():
+    embedder = CountingEmbedder()
+    batcher = ScoringBatcher(embedder, SumPolicy(), max_batch_size=3, max_wait_ms=10_000)
+
+    results = await asyncio.wait_for(asyncio.gather(batcher.score(["a", "b"]), batcher.score(["c"])), timeout=1)
+
+    assert len(embedder.calls) == 1
+    assert [len(scores) for _, scores in results] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_batchers_are_shared():
+    class FailingEmbedder:
+        def embed(self, texts):
+            raise ValueError("encoder down")
+
+    embedder, policy = FailingEmbedder(), SumPolicy()
+    batcher = get_scoring_batcher(embedder, policy, max_wait_ms=1)
+    assert get_scoring_batcher(embedder, policy) is batcher
+
+    results = await asyncio.gather(batcher.score(["a"]), batcher.score(["b"]), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
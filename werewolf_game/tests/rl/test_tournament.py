@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+from camelgym.context import Context
+
+import tournament
+from tournament import ProcessPoolTournament
+
+
+def test_zero_games_starts_no_task(monkeypatch):
+    monkeypatch.setattr(tournament, "ProcessPoolExecutor", None)  # would fail if a pool were started
+    report = ProcessPoolTournament(n_workers=1, games_per_task=4).run(0)
+    assert report["games"] == 0
+
+
+def test_every_game_of_a_task_gets_its_own_budget(monkeypatch):
+    worker_ctx = Context()
+    worker_ctx.embedder, worker_ctx.policy = object(), object()
+    monkeypatch.setattr(tournament, "_WORKER_CONTEXT", worker_ctx)
+    contexts = []
+
+    async def play_game(context, train, investment):
+        # each game spends most of its budget, as Team.run would with NoMoneyException past it
+        contexts.append(context)
+        context.cost_manager.max_budget = investment
+        context.cost_manager.total_cost += 2.0
+        winner = "good guys" if context.cost_manager.total_cost < context.cost_manager.max_budget else None
+        return {"winner": winner, "trajectories": []}
+
+    monkeypatch.setattr(tournament, "run_one_game_async", play_game)
+    result = tournament._run_task(3, None, {"investment": 3.0})
+
+    assert result["winners"] == ["good guys"] * 3
+    assert len({id(ctx.cost_manager) for ctx in contexts}) == 3
+    assert all(ctx.embedder is worker_ctx.embedder and ctx.policy is worker_ctx.policy for ctx in contexts)
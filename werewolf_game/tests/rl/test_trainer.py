@@ -0,0 +1,66 @@
+import copy
+
+import numpy as np
+import torch
+
+from camelgym.rl.buffer import pack_trajectories
+from camelgym.rl.policy import RLPolicy
+from camelgym.rl.trainer import RLTrainer
+
+
+def make_trajectories(n=40, dim=384, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        (rng.standard_normal((k, dim)).astype(np.float32), int(rng.integers(k)), float(rng.choice([-1.0, 1.0])))
+        for k in rng.integers(2, 6, size=n)
+    ]
+
+
+def gradients_after(step, policy):
+    trainer = RLTrainer(policy)
+    trainer.optimizer.step = lambda: None  # keep the gradients, skip the update
+    loss = step(trainer)
+    return loss, [p.grad.clone() for p in policy.parameters()]
+
+
+def test_batched_loss_and_gradients_match_the_loop():
+    torch.manual_seed(0)
+    trajectories = make_trajectories()
+    policy = RLPolicy()
+
+    loop_loss, loop_grads = gradients_after(lambda t: t.train(trajectories), copy.deepcopy(policy))
+    batched_loss, batched_grads = gradients_after(lambda t: t.train_batched(trajectories), copy.deepcopy(policy))
+
+    assert abs(loop_loss - batched_loss) < 1e-4
+    for loop_grad, batched_grad in zip(loop_grads, batched_grads):
+        assert torch.allclose(loop_grad, batched_grad, atol=1e-5)
+
+
+def test_minibatches_and_epochs_accept_packed_input():
+    trajectories = make_trajectories(n=25) + [(np.ones((1, 384), dtype=np.float32), 0, 1.0)]
+    trainer = RLTrainer(RLPolicy())
+    before = [p.detach().clone() for p in trainer.policy.parameters()]
+
+    loss = trainer.train_batched(pack_trajectories(trajectories), minibatch_size=8, epochs=2)
+
+    assert np.isfinite(loss)
+    assert any(not torch.equal(b, p) for b, p in zip(before, trainer.policy.parameters()))
+    assert trainer.train_batched([]) == 0.0
+
+
+def test_importance_weights_scale_each_decision_loss():
+    torch.manual_seed(0)
+    trajectories = make_trajectories(n=6)
+    policy = RLPolicy()
+    weighted = pack_trajectories(trajectories)
+    weighted["weights"] = np.array([1.0, 0.0, 0.5, 1.0, 0.0, 1.0], dtype=np.float32)
+    # weight 1 decisions count fully, weight 0 ones not at all, the 0.5 one for half
+    kept = pack_trajectories([trajectories[i] for i in (0, 3, 5)])
+
+    weighted_loss, weighted_grads = gradients_after(lambda t: t.train_batched(weighted), copy.deepcopy(policy))
+    kept_loss, kept_grads = gradients_after(lambda t: t.train_batched(kept), copy.deepcopy(policy))
+    half_loss, half_grads = gradients_after(lambda t: t.train_batched([trajectories[2]]), copy.deepcopy(policy))
+
+    assert abs(weighted_loss - (kept_loss + 0.5 * half_loss)) < 1e-4
+    for weighted_grad, kept_grad, half_grad in zip(weighted_grads, kept_grads, half_grads):
+        assert torch.allclose(weighted_grad, kept_grad + 0.5 * half_grad, atol=1e-5)
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+from camelgym.actions.action_node import ActionNode
+from camelgym.configs.llm_config import LLMConfig
+from camelgym.context import Context
+from camelgym.environment import WerewolfEnv
+from camelgym.schema import Message
+from actions import InstructSpeak, Speak
+from start_game import init_game_setup
+
+
+@pytest.mark.asyncio
+async def test_candidate_options_reach_simple_fill(monkeypatch):
+    fills = []
+
+    async def simple_fill(self, memory="", **kwargs):
+        fills.append(kwargs)
+        self.content = "I vote Player3."
+        return self
+
+    monkeypatch.setattr(ActionNode, "simple_fill", simple_fill)
+    ctx = Context()
+    ctx.config.llm = LLMConfig(api_type="mock", api_key="mock")
+    _, players = init_game_setup(shuffle=False, use_reflection=False, max_candidate_concurrency=2, use_n_candidates=True)
+    player = players[0]
+    WerewolfEnv(context=ctx).add_roles([player])
+    player.rc.memory.add(Message(content="Now vote.", role="Moderator", sent_from="Moderator", cause_by=InstructSpeak))
+    player.rc.todo = Speak()
+
+    await player._act()
+
+    assert fills == [dict(K=3, concurrent=True, max_concurrency=2, use_n=True)]
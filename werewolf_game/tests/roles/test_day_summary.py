@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+from camelgym.const import MESSAGE_ROUTE_TO_ALL
+from camelgym.schema import Message
+from roles.day_summary import NIGHT_START, DaySummaryView
+from roles.moderator import Moderator
+
+
+def moderator(content, send_to=MESSAGE_ROUTE_TO_ALL):
+    return Message(content=content, role="Moderator", sent_from="Moderator", send_to=send_to)
+
+
+def player(name, content, send_to=MESSAGE_ROUTE_TO_ALL):
+    return Message(content=content, role="Seer", sent_from=name, send_to=send_to)
+
+
+def day(n):
+    return [
+        moderator(f"{NIGHT_START}. I will talk with you/your team secretly at night."),
+        moderator("Seer, you can check one player's identity.", send_to="Seer"),
+        player("Player1", f"Verify Player{n + 2}", send_to="Moderator"),
+        moderator(f"Player{n + 2} is a good guy", send_to="Seer"),
+        player("Player2", f"Day {n}: a long public speech"),
+        player("Player3", "I vote to eliminate Player2"),
+    ]
+
+
+def render(m):
+    return f"{m.sent_from}: {m.content}"
+
+
+def test_finished_days_summarized_private_messages_and_current_day_verbatim():
+    messages = [Message(content="Game setup:", role="User")] + day(0) + day(1) + day(2)
+    lines = [render(m) for m in messages]
+    view = DaySummaryView()
+
+    text = view.compose(messages, lines, {0: "day one summary", 2: "not finished yet"})
+
+    assert "[Day 1 summary] day one summary" in text
+    assert "Day 0: a long public speech" not in text
+    assert "Player1: Verify Player2" in text and "Moderator: Player2 is a good guy" in text  # private, kept
+    assert "Day 1: a long public speech" in text  # no summary yet
+    assert "Day 2: a long public speech" in text and "not finished yet" not in text  # current day
+    assert text.startswith(": Game setup:")
+    assert view.stats()["days_summarized"] == 1
+
+
+def test_no_summaries_is_the_full_transcript():
+    messages = day(0) + day(1)
+    lines = [render(m) for m in messages]
+
+    assert DaySummaryView().compose(messages, lines, {}) == "\n".join(lines)
+
+
+def test_day_facts_name_the_eliminated_players():
+    public = [moderator("Player5 was killed last night!"), player("Player3", "I vote to eliminate Player2")]
+    facts = Moderator._day_facts(public, ["Player2"])
+    assert facts[1:] == ["Player3: I vote to eliminate Player2.", "Player2 was eliminated."]
+    assert "Player5" in facts[0]
+    assert Moderator._day_facts([], [])[-1] == "No one was eliminated."
+    assert Moderator._day_facts([], ["Player2", "Player4"])[-1] == "Player2, Player4 was eliminated."
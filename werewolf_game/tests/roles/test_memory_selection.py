@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+from camelgym.schema import Message
+from roles.memory_selection import MemorySelector
+
+
+def moderator(content):
+    return Message(content=content, role="Moderator", sent_from="Moderator", cause_by="actions.moderator_actions.InstructSpeak")
+
+
+def player(name, content):
+    return Message(content=content, role="Villager", sent_from=name, cause_by="actions.common_actions.Speak")
+
+
+def game_history(days=5):
+    messages = [Message(content="Game setup:\nPlayer1: Seer,\nPlayer2: Werewolf", role="User")]
+    for day in range(days):
+        messages.append(moderator("It's daytime. Everyone woke up except those who had been killed."))
+        messages.append(moderator(f"Player{day + 3} was killed last night!"))
+        messages.append(moderator("Living players: ..., now freely talk about the current situation."))
+        for p in range(1, 6):
+            messages.append(player(f"Player{p}", f"Day {day}: a long speech about suspicions " * 10 + ("I am the Seer." if p == 1 else "")))
+        messages.append(moderator("Now vote and tell me who you think is the werewolf."))
+        messages += [player(f"Player{p}", f"I vote to eliminate Player{p + 1}") for p in range(1, 6)]
+    return messages
+
+
+def test_recent_steps_verbatim_facts_kept_and_budget_respected():
+    messages = game_history()
+    selector = MemorySelector(lambda m: f"{m.sent_from}: {m.content}", token_budget=300, recent_steps=2)
+
+    selected = selector.select(messages)
+
+    assert selected.endswith("Player5: I vote to eliminate Player6")
+    assert "Day 4: a long speech" in selected  # the last talk step is recent
+    assert "Player3 was killed last night!" in selected and "Game setup" in selected
+    assert "Player1: I am the Seer." in selected  # claim kept from an old speech
+    assert "Day 0: a long speech" not in selected
+    assert selected.startswith("(")
+
+    stats = selector.stats()
+    assert stats["selections"] == 1 and 0 < stats["saved_ratio"] < 1
+
+
+def test_everything_is_kept_when_it_fits():
+    messages = game_history(days=1)
+    selector = MemorySelector(lambda m: f"{m.sent_from}: {m.content}", token_budget=100_000)
+    assert selector.select(messages) == "\n".join(f"{m.sent_from}: {m.content}" for m in messages)
+    assert selector.stats()["saved_tokens"] == 0
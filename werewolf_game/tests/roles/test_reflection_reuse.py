@@ -0,0 +1,49 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))  # werewolf_game, as when running the game
+
+from camelgym.const import MESSAGE_ROUTE_TO_ALL
+from camelgym.schema import Message
+from roles import Witch
+import roles.base_player as base_player
+
+
+def instruction(content, send_to="Witch"):
+    return Message(content=content, role="Moderator", sent_from="Moderator", send_to=[send_to, "yes"])
+
+
+def test_reflection_reused_until_new_information(monkeypatch):
+    calls = []
+
+    async def fake_run(self, profile, name, context, latest_instruction):
+        calls.append(latest_instruction)
+        return f"reflection {len(calls)}"
+
+    monkeypatch.setattr(base_player.Reflect, "run", fake_run)
+    witch = Witch(name="Player1", reflection_max_staleness=2)
+    memory = witch.rc.memory
+
+    async def step(*messages):
+        memory.add_batch(messages)
+        return await witch._reflect("", messages[-1].content)
+
+    async def play():
+        first = await step(instruction("Witch, tonight Player3 has been killed. Save?"))
+        # own answer, the acknowledgement and the next request carry nothing new
+        memory.add(Message(content="Save", role="Witch", sent_from="Player1", send_to="Moderator"))
+        memory.add(Message(content="3 | Understood", role="Moderator", sent_from="Moderator", send_to=MESSAGE_ROUTE_TO_ALL))
+        second = await step(instruction("Witch, would you like to poison?"))
+        third = await step(instruction("Witch, again?"))
+        fourth = await step(instruction("Witch, and again?"))  # stale after 2 reuses
+        fifth = await step(Message(content="Player3 was killed last night!", role="Moderator", sent_from="Moderator"),
+                           instruction("Now talk", send_to=MESSAGE_ROUTE_TO_ALL))
+        return first, second, third, fourth, fifth
+
+    first, second, third, fourth, fifth = asyncio.run(play())
+
+    assert first == second == third == "reflection 1"
+    assert fourth == "reflection 2"
+    assert fifth == "reflection 3"
+    assert (witch.reflect_calls, witch.reflect_reused) == (3, 2)
@@ -0,0 +1,182 @@
+import asyncio
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import fire
+
+from camelgym.context import Context
+from camelgym.logs import logger
+from camelgym.rl.buffer import pack_trajectories
+
+from self_play import duration_stats
+from start_game import run_one_game_async
+
+# built once per worker process by _init_worker, its embedder / policy are shared by every game the worker plays
+_WORKER_CONTEXT: Context = None
+
+
+def policy_state_to_arrays(policy) -> dict:
+    """Policy weights as numpy arrays, cheaper to ship to workers than tensors."""
+    return {k: v.detach().cpu().numpy() for k, v in policy.state_dict().items()}
+
+
+def load_policy_arrays(policy, arrays: dict):
+    import torch
+
+    policy.load_state_dict({k: torch.from_numpy(v) for k, v in arrays.items()})
+
+
+def _init_worker(torch_threads: int = 1):
+    """Process initializer: build the worker's Context (embedder, policy) once."""
+    global _WORKER_CONTEXT
+    import torch
+
+    # one core per worker, otherwise N workers x M intra-op threads oversubscribe the box
+    torch.set_num_threads(torch_threads)
+    _WORKER_CONTEXT = Context()
+    logger.info(f"[Tournament] worker {os.getpid()} ready")
+
+
+def _new_game_context(worker_ctx: Context) -> Context:
+    """A game's own Context (cost manager, buffer, history) sharing the worker's embedder and policy;
+    the LLM client is shared through camelgym.provider.client_pool."""
+    ctx = Context(config=worker_ctx.config)
+    ctx.embedder = worker_ctx.embedder
+    ctx.policy = worker_ctx.policy
+    return ctx
+
+
+async def _play_games(worker_ctx: Context, n_games: int, game_kwargs: dict) -> list[dict]:
+    results = []
+    for _ in range(n_games):
+        start = time.perf_counter()
+        # a fresh budget per game, a shared cost manager would run out after a few games
+        ctx = _new_game_context(worker_ctx)
+        result = await run_one_game_async(context=ctx, train=False, **game_kwargs)
+        results.append(
+            {
+                "winner": result["winner"],
+                "duration": time.perf_counter() - start,
+                "trajectories": result["trajectories"],
+            }
+        )
+    return results
+
+
+def _run_task(n_games: int, policy_arrays: dict, game_kwargs: dict) -> dict:
+    """Worker entry: play n_games with the given policy weights, return compact arrays."""
+    ctx = _WORKER_CONTEXT
+    if policy_arrays is not None and ctx.policy is not None:
+        load_policy_arrays(ctx.policy, policy_arrays)
+
+    results = asyncio.run(_play_games(ctx, n_games, game_kwargs))
+
+    trajectories = [t for r in results for t in r["trajectories"]]
+    return {
+        "winners": [r["winner"] for r in results],
+        "durations": [r["duration"] for r in results],
+        "trajectories": pack_trajectories(trajectories),
+    }
+
+
+class ProcessPoolTournament:
+    """
+    Spreads games over a pool of worker processes, each one building its Context once and
+    playing `games_per_task` games per task. Workers send back winners, durations and packed
+    trajectories (numpy arrays, no pydantic objects); the central learner in this process trains
+    the policy on them and ships the latest weights with every new task.
+    """
+
+    def __init__(
+        self,
+        n_workers: int = None,
+        games_per_task: int = 4,
+        torch_threads: int = 1,
+        context: Context = None,
+        **game_kwargs,
+    ):
+        self.n_workers = n_workers or os.cpu_count()
+        self.games_per_task = games_per_task
+        self.torch_threads = torch_threads
+        self.game_kwargs = game_kwargs
+
+        # central learner
+        self.context = context or Context()
+        self.trainer = self.context.trainer
+
+        self.winners: list[str] = []
+        self.durations: list[float] = []
+        self.losses: list[float] = []
+        self.wall_time: float = 0.0
+
+    def _policy_arrays(self):
+        return policy_state_to_arrays(self.context.policy) if self.context.policy is not None else None
+
+    def _consume(self, task_result: dict):
+        self.winners.extend(task_result["winners"])
+        self.durations.extend(task_result["durations"])
+
+        # already packed by the worker, fed to the batched trainer as is
+        trajectories = task_result["trajectories"]
+        if self.context.replay_buffer is not None and len(trajectories["action_index"]):
+            # packed arrays do not keep game boundaries, the task's games share one id
+            self.context.replay_buffer.extend(trajectories, game_id=self.context.replay_buffer.new_game_id())
+        if self.trainer is not None and len(trajectories["action_index"]):
+            self.losses.append(self.trainer.train_batched(trajectories))
+
+    def run(self, n_games: int) -> dict:
+        """Play n_games across the pool, training centrally as results arrive."""
+        if n_games <= 0:
+            return self.report()
+        per_task = self.games_per_task
+        task_sizes = [min(per_task, n_games - i) for i in range(0, n_games, per_task)]
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.torch_threads,),
+        ) as pool:
+            pending = set()
+            # keep every worker busy plus one queued task each, so weights stay fresh
+            while task_sizes or pending:
+                while task_sizes and len(pending) < 2 * self.n_workers:
+                    pending.add(pool.submit(_run_task, task_sizes.pop(0), self._policy_arrays(), self.game_kwargs))
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._consume(future.result())
+                logger.info(f"[Tournament] {len(self.winners)}/{n_games} games finished")
+        self.wall_time = time.perf_counter() - start
+
+        report = self.report()
+        logger.info(f"[Tournament] {report}")
+        return report
+
+    def report(self) -> dict:
+        report = duration_stats(self.durations, self.wall_time)
+        report["good_guys_win_rate"] = (
+            sum(w == "good guys" for w in self.winners) / len(self.winners) if self.winners else 0.0
+        )
+        report["n_workers"] = self.n_workers
+        return report
+
+
+def main(n_games=32, n_workers=None, games_per_task=4, use_reflection=True):
+    tournament = ProcessPoolTournament(
+        n_workers=n_workers,
+        games_per_task=games_per_task,
+        investment=3.0,
+        n_round=1,
+        shuffle=True,
+        add_human=False,
+        use_reflection=use_reflection,
+        use_experience=False,
+    )
+    print(tournament.run(n_games))
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
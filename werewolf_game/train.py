@@ -1,8 +1,14 @@
 import asyncio
+
+import fire
 import matplotlib.pyplot as plt
 import numpy as np
 
+from camelgym.context import Context
+from camelgym.rl.checkpoint import PolicyCheckpointStore
+
 from start_game import run_one_game_async
+from self_play import ConcurrentSelfPlayRunner
 
 # Global trackers for innovation metrics
 ACTION_HISTORY = []     # Stores all chosen actions across all games
@@ -12,9 +18,14 @@ LOSS_HISTORY = []       # RL loss per game
 # -----------------------------------------------------------------------------
 # TRAINING FUNCTION
 # -----------------------------------------------------------------------------
-async def train_self_play(n_games=50, log_every=5):
+async def train_self_play(n_games=50, log_every=5, checkpoint_dir=None, save_every=50, resume=None):
+    """
+    checkpoint_dir: save the policy and optimizer there every `save_every` games and at the end
+    resume:         checkpoint to start from ("latest", "best" or a version), e.g. after a crash
+    """
 
     wins = []   # 1 = villagers win, 0 = werewolves win
+    store, games_before = open_checkpoints(checkpoint_dir, resume)
 
     for game_id in range(1, n_games + 1):
         print(f"\n=== Running Game {game_id}/{n_games} ===")
@@ -59,6 +70,86 @@ async def train_self_play(n_games=50, log_every=5):
         if game_id % log_every == 0:
             print(f"Progress: {sum(wins)} wins / {game_id} games")
 
+        if store and (game_id % save_every == 0 or game_id == n_games):
+            save_checkpoint(store, wins, games_before, window=save_every)
+
+    return wins
+
+
+def open_checkpoints(checkpoint_dir, resume):
+    """Checkpoint store (or None) and the number of games the resumed policy was trained on"""
+    if not checkpoint_dir:
+        return None, 0
+    store = PolicyCheckpointStore(checkpoint_dir)
+    if resume is None or store.resolve(resume) is None:
+        return store, 0
+    # the default Context shares its policy / trainer with every game of the session
+    metadata = store.load_into(Context(), resume)
+    return store, metadata.get("games_played", 0)
+
+
+def save_checkpoint(store, wins, games_before, window=50):
+    ctx = Context()
+    recent = wins[-window:]
+    store.save(
+        ctx.policy,
+        ctx.trainer.optimizer,
+        games_played=games_before + len(wins),
+        win_rate=sum(recent) / len(recent),
+    )
+
+
+# -----------------------------------------------------------------------------
+# CONCURRENT TRAINING FUNCTION
+# -----------------------------------------------------------------------------
+async def train_self_play_concurrent(
+    n_games=50,
+    max_games_in_flight=4,
+    max_llm_concurrency=16,
+    scoring_batch_size=64,
+    scoring_max_wait_ms=2.0,
+    checkpoint_dir=None,
+    save_every=50,
+    resume=None,
+):
+    """Same as train_self_play, but keeps several games in flight on one event loop, with the
+    candidate embedding + scoring of concurrent games batched together (scoring_batch_size=0 disables it).
+    The policy is checkpointed every `save_every` finished games and after the last one."""
+    store, games_before = open_checkpoints(checkpoint_dir, resume)
+    wins = []
+
+    def record(result):
+        wins.append(1 if result["winner"] == "good guys" else 0)
+        if result["loss"] is not None:
+            LOSS_HISTORY.append(result["loss"])
+        ACTION_HISTORY.extend(result["actions"])
+        if store and len(wins) % save_every == 0:
+            save_checkpoint(store, wins, games_before, window=save_every)
+
+    runner = ConcurrentSelfPlayRunner(
+        n_games=n_games,
+        max_games_in_flight=max_games_in_flight,
+        max_llm_concurrency=max_llm_concurrency,
+        context=Context(scoring_batch_size=scoring_batch_size, scoring_max_wait_ms=scoring_max_wait_ms),
+        on_game_end=record,
+        investment=3.0,
+        n_round=1,
+        shuffle=True,
+        add_human=False,
+        use_reflection=True,
+        use_experience=False,
+    )
+    await runner.run()
+
+    if store and wins and len(wins) % save_every:
+        save_checkpoint(store, wins, games_before, window=save_every)
+
+    report = runner.report()
+    print(
+        f"Played {report['games']} games: {report['games_per_hour']:.1f} games/hour, "
+        f"p50 {report['p50_game_seconds']:.1f}s, p95 {report['p95_game_seconds']:.1f}s per game"
+    )
+
     return wins
 
 
@@ -134,10 +225,21 @@ def plot_all(wins):
 # -----------------------------------------------------------------------------
 # MAIN
 # -----------------------------------------------------------------------------
-def main():
+def main(checkpoint_dir=None, save_every: int = 50, resume=None):
+    """
+    checkpoint_dir: where to checkpoint the policy, every `save_every` games and at the end
+    resume:         checkpoint to continue from ("latest", "best" or a version)
+    """
     n_games = int(input("How many self-play games to train? (e.g., 50): "))
+    max_games_in_flight = int(input("How many games to run concurrently? (1 = one after another): ") or 1)
 
-    wins = asyncio.run(train_self_play(n_games))
+    checkpoints = dict(checkpoint_dir=checkpoint_dir, save_every=save_every, resume=resume)
+    if max_games_in_flight > 1:
+        wins = asyncio.run(
+            train_self_play_concurrent(n_games, max_games_in_flight=max_games_in_flight, **checkpoints)
+        )
+    else:
+        wins = asyncio.run(train_self_play(n_games, **checkpoints))
 
     # Final win rate
     win_rate = sum(wins) / len(wins)
@@ -148,4 +250,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    fire.Fire(main)
@@ -15,7 +15,7 @@ class WerewolfEnvironment(Environment):
         if add_timestamp:
             message.content = f"{self.timestamp} | " + message.content
         self.memory.add(message)
-        self.history += f"\n{message}"
+        self.history_log.append(str(message))
 
     async def run(self, k=1):
         """